@@ -0,0 +1,210 @@
+from array import array
+from bisect import bisect_right
+from datetime import date as date_type
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.common.converters import minutes_to_time
+from src.common.metrics import timed
+from src.index import ScheduleStore
+from src.models import Day
+from src.vectorized import ScheduleArrays, np
+
+MINUTES_PER_DAY: int = 1440
+# Границы корзин распределения длин свободных промежутков, в минутах
+GAP_BINS: Tuple[int, ...] = (15, 30, 60, 120, 240, 480)
+REPORTS: Tuple[str, ...] = ('day', 'week', 'heatmap', 'hours', 'gaps')
+
+
+def _utilization_row(row: Dict[str, Any], busy: int, working: int) -> Dict[str, Any]:
+    row.update(busy_minutes=busy, working_minutes=working, utilization=round(busy / working, 4) if working else 0.0)
+
+    return row
+
+
+class ScheduleAnalytics:
+    @timed('analytics_build')
+    def __init__(
+            self,
+            store: ScheduleStore,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            use_numpy: Optional[bool] = None
+    ):
+        self._arrays: ScheduleArrays = ScheduleArrays(store, date_from=date_from, date_to=date_to, use_numpy=use_numpy)
+        self.use_numpy: bool = self._arrays.use_numpy
+        self.days: List[Day] = self._arrays.days
+        self._positions: Dict[str, int] = {day.date: position for position, day in enumerate(self.days)}
+        # prefix[день][m] — занятые минуты рабочего дня до минуты m: сумма по любому промежутку за O(1)
+        self._prefix: Any = self._build_numpy_prefix() if self.use_numpy else self._build_prefix()
+
+    def _build_prefix(self) -> List[array]:
+        prefixes: List[array] = []
+
+        for position, day in enumerate(self.days):
+            occupancy: bytearray = bytearray(MINUTES_PER_DAY)
+
+            # Пересечения слотов не нужно склеивать: минута просто помечается занятой
+            for slot in range(self._arrays.offsets[position], self._arrays.offsets[position + 1]):
+                start: int = max(self._arrays.slot_starts[slot], day.start_minutes)
+                end: int = min(self._arrays.slot_ends[slot], day.end_minutes)
+
+                if start < end:
+                    occupancy[start:end] = b'\x01' * (end - start)
+
+            prefixes.append(array('H', accumulate(occupancy, initial=0)))
+
+        return prefixes
+
+    def _build_numpy_prefix(self) -> Any:
+        assert np is not None
+
+        day_starts = np.asarray([day.start_minutes for day in self.days], dtype=np.int64)
+        day_ends = np.asarray([day.end_minutes for day in self.days], dtype=np.int64)
+        groups = np.repeat(np.arange(len(self.days)), np.diff(self._arrays.offsets))
+        starts = np.maximum(np.asarray(self._arrays.slot_starts, dtype=np.int64), day_starts[groups])
+        ends = np.minimum(np.asarray(self._arrays.slot_ends, dtype=np.int64), day_ends[groups])
+        inside = starts < ends
+
+        # Разностный массив по всем дням сразу: +1 в начале слота, -1 в конце, накопленная сумма > 0 — занято
+        changes = np.zeros((len(self.days), MINUTES_PER_DAY + 1), dtype=np.int32)
+        np.add.at(changes, (groups[inside], starts[inside]), 1)
+        np.add.at(changes, (groups[inside], ends[inside]), -1)
+        occupied = np.cumsum(changes[:, :MINUTES_PER_DAY], axis=1) > 0
+
+        prefix = np.zeros((len(self.days), MINUTES_PER_DAY + 1), dtype=np.int32)
+        np.cumsum(occupied, axis=1, out=prefix[:, 1:])
+
+        return prefix
+
+    def busy_minutes(self, date: str, start: int = 0, end: int = MINUTES_PER_DAY) -> int:
+        position: Optional[int] = self._positions.get(date)
+
+        if position is None:
+            raise ValueError(f"Дата {date} не найдена в расписании.")
+        if not 0 <= start <= end <= MINUTES_PER_DAY:
+            raise ValueError("Некорректный промежуток, ожидаются минуты от 0 до 1440 и начало не больше конца")
+
+        return int(self._prefix[position][end] - self._prefix[position][start])
+
+    def utilization_by_day(self) -> List[Dict[str, Any]]:
+        report: List[Dict[str, Any]] = []
+
+        for position, day in enumerate(self.days):
+            busy: int = int(self._prefix[position][day.end_minutes] - self._prefix[position][day.start_minutes])
+            report.append(_utilization_row({'date': day.date}, busy, day.end_minutes - day.start_minutes))
+
+        return report
+
+    def utilization_by_week(self) -> List[Dict[str, Any]]:
+        totals: Dict[str, List[int]] = {}
+
+        for row in self.utilization_by_day():
+            year, week, _ = date_type.fromisoformat(row['date']).isocalendar()
+            week_totals: List[int] = totals.setdefault(f'{year}-W{week:02d}', [0, 0])
+            week_totals[0] += row['busy_minutes']
+            week_totals[1] += row['working_minutes']
+
+        return [_utilization_row({'week': week}, busy, working) for week, (busy, working) in totals.items()]
+
+    def _cell_totals(self, bucket_minutes: int) -> Tuple[List[List[int]], List[List[int]]]:
+        if not 1 <= bucket_minutes <= MINUTES_PER_DAY:
+            raise ValueError("Размер ячейки должен быть от 1 до 1440 минут")
+
+        edges: List[int] = [*range(0, MINUTES_PER_DAY, bucket_minutes), MINUTES_PER_DAY]
+        weekdays: List[int] = [date_type.fromisoformat(day.date).weekday() for day in self.days]
+
+        if self.use_numpy:
+            assert np is not None
+
+            edge_array = np.asarray(edges)
+            day_starts = np.asarray([day.start_minutes for day in self.days])[:, None]
+            day_ends = np.asarray([day.end_minutes for day in self.days])[:, None]
+            # Занятость каждой ячейки — разность двух столбцов префиксных сумм, без цикла по дням
+            busy_cells = self._prefix[:, edge_array[1:]] - self._prefix[:, edge_array[:-1]]
+            working_cells = np.clip(
+                np.minimum(day_ends, edge_array[1:]) - np.maximum(day_starts, edge_array[:-1]),
+                0,
+                None
+            )
+
+            busy = np.zeros((7, len(edges) - 1), dtype=np.int64)
+            working = np.zeros((7, len(edges) - 1), dtype=np.int64)
+            np.add.at(busy, np.asarray(weekdays, dtype=np.int64), busy_cells)
+            np.add.at(working, np.asarray(weekdays, dtype=np.int64), working_cells)
+
+            return busy.tolist(), working.tolist()
+
+        busy_rows: List[List[int]] = [[0] * (len(edges) - 1) for _ in range(7)]
+        working_rows: List[List[int]] = [[0] * (len(edges) - 1) for _ in range(7)]
+
+        for position, day in enumerate(self.days):
+            prefix: array = self._prefix[position]
+
+            for cell, (lo, hi) in enumerate(zip(edges, edges[1:])):
+                busy_rows[weekdays[position]][cell] += prefix[hi] - prefix[lo]
+                working_rows[weekdays[position]][cell] += max(0, min(day.end_minutes, hi) - max(day.start_minutes, lo))
+
+        return busy_rows, working_rows
+
+    def heatmap(self, bucket_minutes: int = 60) -> Dict[str, Any]:
+        # Строки — дни недели (0 — понедельник), столбцы — ячейки суток; значение — доля занятых рабочих минут
+        busy, working = self._cell_totals(bucket_minutes)
+
+        return {
+            'buckets': [minutes_to_time(start) for start in range(0, MINUTES_PER_DAY, bucket_minutes)],
+            'weekdays': [
+                [round(cell_busy / cell_working, 4) if cell_working else 0.0 for cell_busy, cell_working in zip(*row)]
+                for row in zip(busy, working)
+            ]
+        }
+
+    def busiest_hours(self, top: int = 5) -> List[Dict[str, Any]]:
+        busy, working = self._cell_totals(60)
+        hours: List[Dict[str, Any]] = [
+            _utilization_row({'hour': minutes_to_time(hour * 60)}, sum(column[0]), sum(column[1]))
+            for hour, column in enumerate(zip(zip(*busy), zip(*working)))
+            if sum(column[1])
+        ]
+
+        return sorted(hours, key=lambda row: (-row['utilization'], -row['busy_minutes']))[:top]
+
+    def gap_histogram(self, bins: Sequence[int] = GAP_BINS) -> List[Dict[str, Any]]:
+        lengths: List[int] = [
+            end - start for intervals in self._arrays.free_intervals().values() for start, end in intervals
+        ]
+
+        if self.use_numpy:
+            assert np is not None
+
+            counts: List[int] = np.bincount(
+                np.searchsorted(np.asarray(bins), np.asarray(lengths, dtype=np.int64), side='right'),
+                minlength=len(bins) + 1
+            ).tolist()
+        else:
+            counts = [0] * (len(bins) + 1)
+            for length in lengths:
+                counts[bisect_right(bins, length)] += 1
+
+        # Корзина i — промежутки длиной от bins[i - 1] включительно до bins[i]
+        edges: List[Optional[int]] = [0, *bins, None]
+
+        return [
+            {'from_minutes': lo, 'to_minutes': hi, 'count': count}
+            for lo, hi, count in zip(edges, edges[1:], counts)
+        ]
+
+    def report(self, kind: str, bucket_minutes: int = 60, top: int = 5) -> Any:
+        match kind:
+            case 'day':
+                return self.utilization_by_day()
+            case 'week':
+                return self.utilization_by_week()
+            case 'heatmap':
+                return self.heatmap(bucket_minutes=bucket_minutes)
+            case 'hours':
+                return self.busiest_hours(top=top)
+            case 'gaps':
+                return self.gap_histogram()
+            case _:
+                raise ValueError(f"Неизвестный вид отчёта {kind}")
@@ -0,0 +1,95 @@
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.models import Day
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    # Ожидает промежутки, отсортированные по началу; пересекающиеся и смежные склеиваются
+    merged: List[Tuple[int, int]] = []
+
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def compute_free_intervals(day: Day, busy_intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    free_intervals: List[Tuple[int, int]] = []
+    current_start: int = day.start_minutes  # Начало рабочего дня
+
+    for slot_start, slot_end in busy_intervals:
+        # Занятость после конца рабочего дня не должна порождать свободные промежутки за его пределами
+        if slot_start >= day.end_minutes:
+            break
+
+        if current_start < slot_start:
+            free_intervals.append((current_start, slot_start))
+
+        current_start = max(current_start, slot_end)
+
+    if current_start < day.end_minutes:
+        free_intervals.append((current_start, day.end_minutes))
+
+    return free_intervals
+
+
+class DayAvailability:
+    __slots__ = ('start_minutes', 'end_minutes', 'busy_starts', 'busy_ends')
+
+    def __init__(self, day: Day, busy_intervals: Iterable[Tuple[int, int]]):
+        self.start_minutes: int = day.start_minutes
+        self.end_minutes: int = day.end_minutes
+        self.busy_starts: array = array('H')
+        self.busy_ends: array = array('H')
+
+        for start, end in merge_intervals(busy_intervals):
+            self.busy_starts.append(start)
+            self.busy_ends.append(end)
+
+    def is_available(self, start: int, end: int) -> bool:
+        if start < self.start_minutes or end > self.end_minutes:
+            return False
+
+        # Занятые промежутки не пересекаются, поэтому их концы тоже отсортированы:
+        # достаточно проверить первый промежуток, который заканчивается позже начала запрошенного
+        position: int = bisect_right(self.busy_ends, start)
+
+        return position == len(self.busy_ends) or self.busy_starts[position] >= end
+
+    def are_available(self, intervals: Sequence[Tuple[int, int]], use_numpy: Optional[bool] = None) -> List[bool]:
+        # NumPy импортируется при первом пакетном запросе, а не при старте CLI
+        from src.vectorized import HAS_NUMPY
+
+        if use_numpy and not HAS_NUMPY:
+            raise ValueError("Для векторных вычислений необходимо установить numpy")
+
+        if not (HAS_NUMPY if use_numpy is None else use_numpy):
+            return [self.is_available(start, end) for start, end in intervals]
+
+        return self._are_available_numpy(intervals)
+
+    def _are_available_numpy(self, intervals: Sequence[Tuple[int, int]]) -> List[bool]:
+        from src.vectorized import np
+        assert np is not None
+
+        queries = np.array(intervals, dtype=np.int32).reshape(-1, 2)
+        starts = np.frombuffer(self.busy_starts, dtype=np.uint16)
+        ends = np.frombuffer(self.busy_ends, dtype=np.uint16)
+
+        within_day = (queries[:, 0] >= self.start_minutes) & (queries[:, 1] <= self.end_minutes)
+        if not len(ends):
+            return within_day.tolist()
+
+        # Тот же поиск, что в is_available, сразу для всех промежутков: первый занятый промежуток,
+        # заканчивающийся позже начала запрошенного, должен начинаться не раньше его конца
+        positions = np.searchsorted(ends, queries[:, 0], side='right')
+        next_starts = starts[np.minimum(positions, len(starts) - 1)]
+        free = (positions == len(ends)) | (next_starts >= queries[:, 1])
+
+        return (within_day & free).tolist()
@@ -0,0 +1,112 @@
+from json import JSONDecodeError, dumps, loads
+from typing import Any, Callable, Dict, Iterable, Optional, TextIO, Tuple
+
+from src.common.metrics import METRICS
+from src.common.validator import ArgsValidator
+from src.processor import ScheduleProcessor
+
+QUERY_STRING_FIELDS: Tuple[str, ...] = ('date', 'date_from', 'date_to', 'start', 'end')
+# Числа в пакете могут прийти и строкой, как в параметрах HTTP-запроса
+QUERY_NUMBER_FIELDS: Tuple[str, ...] = ('duration', 'limit')
+
+
+def execute_range_query(processor: ScheduleProcessor, query: Dict[str, Any]) -> Any:
+    limit: Optional[int] = ArgsValidator.validate_limit(str(query['limit'])) if 'limit' in query else None
+
+    match query.get('action'):
+        case 1:
+            timeslots = processor.iter_busy_timeslots_range(date_from=query['date_from'], date_to=query['date_to'])
+        case 2:
+            timeslots = processor.iter_free_timeslots_range(date_from=query['date_from'], date_to=query['date_to'])
+        case 4:
+            timeslots = processor.iter_timeslots_for_duration_range(
+                date_from=query['date_from'],
+                date_to=query['date_to'],
+                duration=query['duration']
+            )
+        case _:
+            raise ValueError("Действие не поддерживает запрос по диапазону дат")
+
+    return processor.take(timeslots=timeslots, limit=limit)
+
+
+def execute_query(processor: ScheduleProcessor, query: Dict[str, Any]) -> Any:
+    METRICS.increment('queries')
+
+    with METRICS.timer(f"action_{query.get('action')}"):
+        return _execute_query(processor=processor, query=query)
+
+
+def _execute_query(processor: ScheduleProcessor, query: Dict[str, Any]) -> Any:
+    if 'date_from' in query or 'date_to' in query:
+        return execute_range_query(processor=processor, query=query)
+
+    match query.get('action'):
+        case 1:
+            return processor.get_busy_timeslots(date=query['date'])
+        case 2:
+            return processor.get_free_timeslots(date=query['date'])
+        case 3:
+            return processor.is_interval_available(date=query['date'], start=query['start'], end=query['end'])
+        case 4:
+            return processor.search_timeslots_for_duration(date=query['date'], duration=query['duration'])
+        case _:
+            raise ValueError("Неизвестный запрос действия!")
+
+
+def _parse_query(line: str) -> Dict[str, Any]:
+    try:
+        query: Any = loads(line)
+
+    except JSONDecodeError:
+        raise ValueError("Некорректный JSON запроса")
+
+    if not isinstance(query, dict):
+        raise ValueError("Запрос должен быть JSON-объектом")
+
+    return query
+
+
+def _validate_query(query: Dict[str, Any]) -> None:
+    # Поля неверного типа иначе доходят до регулярок и методов процессора и возвращаются текстом ошибок Python
+    for name in QUERY_STRING_FIELDS:
+        if name in query and not isinstance(query[name], str):
+            raise ValueError(f"Поле {name} должно быть строкой")
+
+    for name in QUERY_NUMBER_FIELDS:
+        if name in query and (isinstance(query[name], bool) or not isinstance(query[name], (int, str))):
+            raise ValueError(f"Поле {name} должно быть целым числом")
+
+
+def answer_query(line: str, resolve: Callable[[Dict[str, Any]], ScheduleProcessor]) -> Dict[str, Any]:
+    answer: Dict[str, Any] = {'id': None, 'result': None, 'error': None}
+
+    try:
+        query: Dict[str, Any] = _parse_query(line)
+        answer['id'] = query.get('id')
+        _validate_query(query)
+        answer['result'] = execute_query(processor=resolve(query), query=query)
+
+    except KeyError as error:
+        answer['error'] = f"В запросе отсутствует поле {error}"
+
+    except Exception as error:
+        answer['error'] = str(error)
+
+    if answer['error'] is not None:
+        METRICS.increment('query_errors')
+
+    return answer
+
+
+def run_batch(processor: ScheduleProcessor, queries: Iterable[str], output: TextIO) -> int:
+    processed: int = 0
+
+    for line in queries:
+        if not line.strip():
+            continue
+
+        output.write(dumps(answer_query(line=line, resolve=lambda _: processor), ensure_ascii=False) + '\n')
+        processed += 1
+
+    return processed
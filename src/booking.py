@@ -0,0 +1,189 @@
+import asyncio
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.availability import compute_free_intervals
+from src.common.metrics import METRICS
+from src.common.validator import ArgsValidator
+from src.constants import BOOKING_RETRIES
+from src.dto import Booking, EmploymentScheduleDTO
+from src.index import ScheduleIndex
+from src.models import Day
+from src.parsers import minutes_to_time
+
+STRATEGIES: Tuple[str, ...] = ('earliest', 'best_fit')
+
+
+class BookingConflict(Exception):
+    pass
+
+
+class BookingEngine:
+    def __init__(
+            self,
+            schedule: Union[EmploymentScheduleDTO, ScheduleIndex],
+            retries: int = BOOKING_RETRIES
+    ):
+        if isinstance(schedule, EmploymentScheduleDTO):
+            schedule = ScheduleIndex(schedule)
+
+        self.retries: int = retries
+        self._index: ScheduleIndex = schedule
+        # Блокировка на каждый день: бронирования разных дней не ждут друг друга
+        self._day_locks: Dict[int, Lock] = {}
+        self._day_locks_guard: Lock = Lock()
+
+    def get_day_version(self, date: str) -> int:
+        return self._index.get_day_version(self._find_day(date).id)
+
+    def reserve(
+            self,
+            date: str,
+            duration: int,
+            strategy: str = 'earliest',
+            expected_version: Optional[int] = None
+    ) -> Optional[Booking]:
+        minutes: int = self._validate(duration=duration, strategy=strategy)
+
+        return self._reserve_in_day(
+            day=self._find_day(date),
+            minutes=minutes,
+            strategy=strategy,
+            expected_version=expected_version
+        )
+
+    def reserve_earliest(
+            self,
+            duration: int,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            strategy: str = 'earliest'
+    ) -> Optional[Booking]:
+        minutes: int = self._validate(duration=duration, strategy=strategy)
+
+        for date in (date_from, date_to):
+            if date is not None:
+                ArgsValidator.validate_date(date)
+
+        # Дни перебираются по порядку: стратегия выбирает окно внутри первого дня, где оно нашлось
+        for day in self._index.get_days(date_from=date_from, date_to=date_to):
+            booking: Optional[Booking] = self._reserve_in_day(day=day, minutes=minutes, strategy=strategy)
+
+            if booking is not None:
+                return booking
+
+        return None
+
+    def release(self, booking: Booking) -> None:
+        with self._day_lock(booking.day_id):
+            self._index.remove_timeslot(day_id=booking.day_id, slot_id=booking.slot_id)
+
+    async def reserve_async(
+            self,
+            date: str,
+            duration: int,
+            strategy: str = 'earliest',
+            expected_version: Optional[int] = None
+    ) -> Optional[Booking]:
+        # Ожидание блокировки дня уходит в поток, чтобы не останавливать цикл событий
+        return await asyncio.to_thread(self.reserve, date, duration, strategy, expected_version)
+
+    async def reserve_earliest_async(
+            self,
+            duration: int,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            strategy: str = 'earliest'
+    ) -> Optional[Booking]:
+        return await asyncio.to_thread(self.reserve_earliest, duration, date_from, date_to, strategy)
+
+    @staticmethod
+    def _validate(duration: int, strategy: str) -> int:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия бронирования {strategy}")
+
+        return ArgsValidator.validate_available_timeslots_duration(duration=str(duration))
+
+    def _find_day(self, date: str) -> Day:
+        ArgsValidator.validate_date(date)
+
+        found_day: Optional[Day] = self._index.get_day(date)
+        if found_day is None:
+            raise ValueError(f"Дата {date} не найдена в расписании.")
+
+        return found_day
+
+    def _day_lock(self, day_id: int) -> Lock:
+        lock: Optional[Lock] = self._day_locks.get(day_id)
+
+        if lock is None:
+            with self._day_locks_guard:
+                lock = self._day_locks.setdefault(day_id, Lock())
+
+        return lock
+
+    def _choose_window(self, day: Day, minutes: int, strategy: str) -> Optional[Tuple[int, int]]:
+        busy_intervals: List[Tuple[int, int]] = self._index.get_intervals(day.id)
+        fitting: List[Tuple[int, int]] = [
+            (start, end) for start, end in compute_free_intervals(day, busy_intervals) if end - start >= minutes
+        ]
+
+        if not fitting:
+            return None
+
+        # best_fit занимает самое короткое подходящее окно, оставляя длинные под длинные заявки
+        start, _ = fitting[0] if strategy == 'earliest' else min(fitting, key=lambda gap: gap[1] - gap[0])
+
+        return start, start + minutes
+
+    def _reserve_in_day(
+            self,
+            day: Day,
+            minutes: int,
+            strategy: str,
+            expected_version: Optional[int] = None
+    ) -> Optional[Booking]:
+        for _ in range(self.retries + 1):
+            version: int = self._index.get_day_version(day.id)
+            # День перечитывается на каждой попытке: modify_day мог сменить рабочие часы после прошлой
+            current: Optional[Day] = self._index.get_day_by_id(day.id)
+            if current is None:
+                raise ValueError(f"Дата {day.date} не найдена в расписании.")
+            day = current
+
+            if expected_version is not None and version != expected_version:
+                raise BookingConflict(f"День {day.date} изменён: версия {version}, ожидалась {expected_version}")
+
+            # Окно ищется без блокировки; под блокировкой только проверяется, что день не менялся, и пишется слот
+            window: Optional[Tuple[int, int]] = self._choose_window(day=day, minutes=minutes, strategy=strategy)
+            if window is None:
+                return None
+
+            with self._day_lock(day.id):
+                if self._index.get_day_version(day.id) == version:
+                    # id выдаёт индекс: он знает и слоты, добавленные мимо движка (apply_diff, add_timeslot)
+                    slot_id: int = self._index.next_timeslot_id()
+                    self._index.add_timeslot(
+                        slot_id=slot_id,
+                        day_id=day.id,
+                        start_minutes=window[0],
+                        end_minutes=window[1]
+                    )
+                    METRICS.increment('bookings')
+
+                    return Booking(
+                        slot_id=slot_id,
+                        day_id=day.id,
+                        date=day.date,
+                        start=minutes_to_time(window[0]),
+                        end=minutes_to_time(window[1]),
+                        version=self._index.get_day_version(day.id)
+                    )
+
+            METRICS.increment('booking_retries')
+
+            # Явно переданная версия уже устарела — повтор ничего не даст
+            if expected_version is not None:
+                break
+
+        raise BookingConflict(f"Не удалось забронировать окно на {day.date}: день постоянно изменяется")
@@ -0,0 +1,10 @@
+def time_to_minutes(time_str: str) -> int:
+    hours, minutes = map(int, time_str.split(':'))
+
+    return hours * 60 + minutes
+
+
+def minutes_to_time(minutes: int) -> str:
+    hours, mins = divmod(minutes, 60)
+
+    return f"{hours:02d}:{mins:02d}"
@@ -0,0 +1,127 @@
+from codecs import getincrementaldecoder
+from json import JSONDecoder, JSONDecodeError
+from re import compile as re_compile, Pattern
+from typing import Any, Collection, Iterator, Protocol, Tuple, Union
+
+WHITESPACE_PATTERN: Pattern[str] = re_compile(r"[ \t\n\r]*")
+# Символы, которыми может продолжаться число: "1." или "1e" на конце буфера — ещё не всё число
+NUMBER_TAIL_PATTERN: Pattern[str] = re_compile(r"[0-9.eE+-]*")
+
+
+class ReadableStream(Protocol):
+    def read(self, size: int, /) -> Any:
+        pass
+
+
+class _JSONStreamReader:
+    def __init__(self, stream: ReadableStream, chunk_size: int):
+        self._stream: ReadableStream = stream
+        self._chunk_size: int = chunk_size
+        self._decoder: JSONDecoder = JSONDecoder()
+        self._text_decoder = getincrementaldecoder('utf-8')()
+        self._buffer: str = ''
+        self._position: int = 0
+        self._eof: bool = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk: Union[bytes, str] = self._stream.read(self._chunk_size)
+
+        if not chunk:
+            self._eof = True
+            return False
+
+        if isinstance(chunk, bytes):
+            chunk = self._text_decoder.decode(chunk)
+
+        # В буфере держим только ещё не разобранный хвост
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._position = WHITESPACE_PATTERN.match(self._buffer, self._position).end()  # type: ignore[union-attr]
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        char: str = self.peek()
+
+        if not char or char not in chars:
+            raise ValueError(f"Некорректный JSON: ожидался один из символов '{chars}', получено '{char}'")
+
+        self._position += 1
+
+        return char
+
+    def _is_cut_number(self, value: Any, end: int) -> bool:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+
+        return NUMBER_TAIL_PATTERN.match(self._buffer, end).end() == len(self._buffer)  # type: ignore[union-attr]
+
+    def expect_end(self) -> None:
+        if self.peek():
+            raise ValueError("Некорректный JSON: лишние данные после конца документа")
+
+    def decode_value(self) -> Any:
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+
+                # Значение, упёршееся в конец буфера, может быть обрезано (например, число)
+                if self._eof or (end < len(self._buffer) and not self._is_cut_number(value, end)):
+                    self._position = end
+                    return value
+
+            except JSONDecodeError:
+                if self._eof:
+                    raise
+
+            self._fill()
+
+
+def iter_json_arrays(
+        stream: ReadableStream,
+        keys: Collection[str],
+        chunk_size: int = 64 * 1024
+) -> Iterator[Tuple[str, Any]]:
+    reader: _JSONStreamReader = _JSONStreamReader(stream=stream, chunk_size=chunk_size)
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        reader.expect_end()
+        return
+
+    while True:
+        key: Any = reader.decode_value()
+        reader.expect(':')
+
+        if key in keys and reader.peek() == '[':
+            reader.expect('[')
+
+            if reader.peek() == ']':
+                reader.expect(']')
+            else:
+                while True:
+                    yield key, reader.decode_value()
+
+                    if reader.expect(',]') == ']':
+                        break
+        else:
+            reader.decode_value()
+
+        if reader.expect(',}') == '}':
+            reader.expect_end()
+            return
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Generic, Hashable, TypeVar
+
+from src.common.metrics import METRICS
+
+Value = TypeVar('Value')
+
+
+class LRUCache(Generic[Value]):
+    def __init__(self, max_size: int):
+        if max_size < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._items: OrderedDict[Hashable, Value] = OrderedDict()
+        # Кэш общий для потоков запросов и подписчиков индекса, которые сбрасывают его из потоков бронирования.
+        # Значение считается вне блокировки, чтобы долгий расчёт не останавливал остальные потоки
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Value]) -> Value:
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                METRICS.increment('cache_hits')
+                self._items.move_to_end(key)
+
+                return self._items[key]
+
+            self.misses += 1
+        METRICS.increment('cache_misses')
+        value: Value = compute()
+
+        if self.max_size:
+            with self._lock:
+                self._items[key] = value
+
+                # Вытесняем давно не использованные записи, чтобы кэш не рос вместе с количеством дат
+                if len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            stale_keys = [key for key in self._items if predicate(key)]
+
+            for key in stale_keys:
+                del self._items[key]
+
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._items), 'max_size': self.max_size}
@@ -0,0 +1,178 @@
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from json import dumps
+from os import replace
+from threading import Lock
+from time import perf_counter, time
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, TextIO, Tuple, TypeVar
+
+from src.constants import SCHEDULE_METRICS_ENABLED
+
+Function = TypeVar('Function', bound=Callable[..., Any])
+MetricsSink = Callable[[Dict[str, Any]], None]
+
+# Границы корзин гистограммы длительностей этапов, в секундах
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_NULL_CONTEXT: ContextManager[None] = nullcontext()
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets: Tuple[float, ...] = buckets
+        # Последняя ячейка — значения больше верхней границы (+Inf)
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False):
+        self.enabled: bool = enabled
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._sinks: List[MetricsSink] = []
+        self._lock: Lock = Lock()
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: MetricsSink) -> None:
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def collect(self) -> Tuple[Dict[str, float], Dict[str, Histogram]]:
+        # Копия под блокировкой: экспорт не видит наполовину обновлённую гистограмму
+        with self._lock:
+            histograms: Dict[str, Histogram] = {}
+
+            for stage, histogram in self.histograms.items():
+                copy: Histogram = Histogram(histogram.buckets)
+                copy.counts, copy.sum, copy.count = list(histogram.counts), histogram.sum, histogram.count
+                histograms[stage] = copy
+
+            return dict(self.counters), histograms
+
+    def increment(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            histogram: Optional[Histogram] = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+
+            histogram.observe(seconds)
+
+        self.emit({'event': 'stage', 'stage': stage, 'duration_ms': round(seconds * 1000, 3)})
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        if not self.enabled or not self._sinks:
+            return
+
+        record: Dict[str, Any] = {'timestamp': round(time(), 3), **event}
+        for sink in self._sinks:
+            sink(record)
+
+    def timer(self, stage: str) -> ContextManager[None]:
+        # Выключенный реестр отдаёт общий пустой контекст: ни замеров, ни аллокаций
+        if not self.enabled:
+            return _NULL_CONTEXT
+
+        return self._timer(stage)
+
+    @contextmanager
+    def _timer(self, stage: str) -> Iterator[None]:
+        started: float = perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.observe(stage, perf_counter() - started)
+
+
+# Общий реестр процесса; по умолчанию выключен и почти ничего не стоит на горячем пути
+METRICS: MetricsRegistry = MetricsRegistry(enabled=SCHEDULE_METRICS_ENABLED)
+
+
+def timed(stage: str) -> Callable[[Function], Function]:
+    def decorator(func: Function) -> Function:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+
+            with METRICS.timer(stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def json_log_sink(stream: TextIO) -> MetricsSink:
+    def write(record: Dict[str, Any]) -> None:
+        stream.write(dumps(record, ensure_ascii=False) + '\n')
+        stream.flush()
+
+    return write
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render_prometheus(registry: MetricsRegistry = METRICS, prefix: str = 'schedule') -> str:
+    lines: List[str] = []
+    counters, histograms = registry.collect()
+
+    for name, value in sorted(counters.items()):
+        lines.append(f'# TYPE {prefix}_{name}_total counter')
+        lines.append(f'{prefix}_{name}_total {_format_value(value)}')
+
+    if histograms:
+        lines.append(f'# TYPE {prefix}_stage_seconds histogram')
+
+    for stage, histogram in sorted(histograms.items()):
+        cumulative: int = 0
+
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+
+        lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram.sum!r}')
+        lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def write_prometheus_file(file_path: str, registry: MetricsRegistry = METRICS) -> None:
+    # Формат textfile-коллектора node_exporter: файл подменяется целиком, чтобы не читался наполовину
+    with open(f'{file_path}.tmp', 'w', encoding='utf-8') as metrics_file:
+        metrics_file.write(render_prometheus(registry))
+
+    replace(f'{file_path}.tmp', file_path)
@@ -1,5 +1,8 @@
+from argparse import ArgumentParser, Namespace
 from sys import exit as sys_exit
-from src.constants import EMPLOYMENT_SCHEDULE_URL
+from typing import List, Optional
+
+from src.constants import EMPLOYMENT_SCHEDULE_URL, SERVER_HOST, SERVER_PORT, SERVER_REFRESH_INTERVAL
 from src.common.validator import ArgsValidator
 
 
@@ -30,3 +33,103 @@ def get_action() -> int:
 
         except Exception as error:
             print(error)
+
+
+def parse_cli_args(argv: Optional[List[str]] = None) -> Namespace:
+    parser: ArgumentParser = ArgumentParser(
+        description="Обработка графика занятости работника. Без аргументов запускается в интерактивном режиме."
+    )
+    parser.add_argument(
+        '--batch',
+        metavar='PATH',
+        default=None,
+        help="JSONL-файл с запросами ('-' для stdin), по одному запросу на строку"
+    )
+    parser.add_argument(
+        '--output',
+        metavar='PATH',
+        default='-',
+        help="Файл для результатов пакетного режима, выгрузки или отчёта ('-' для stdout)"
+    )
+    parser.add_argument(
+        '--snapshot',
+        metavar='PATH',
+        default=None,
+        help="Брать расписание из бинарного снимка вместо запроса к эндпоинту"
+    )
+    parser.add_argument(
+        '--save-snapshot',
+        metavar='PATH',
+        default=None,
+        help="Загрузить расписание, сохранить его бинарный снимок и выйти"
+    )
+    parser.add_argument(
+        '--export',
+        choices=('busy', 'free', 'utilization'),
+        default=None,
+        help="Выгрузить занятые, свободные промежутки или загрузку по дням в --output и выйти"
+    )
+    parser.add_argument(
+        '--export-format',
+        choices=('csv', 'jsonl', 'parquet'),
+        default=None,
+        help="Формат выгрузки; по умолчанию определяется по расширению --output (CSV для stdout)"
+    )
+    parser.add_argument(
+        '--report',
+        choices=('day', 'week', 'heatmap', 'hours', 'gaps'),
+        default=None,
+        help="Записать в --output JSON-отчёт: загрузка по дням, неделям, тепловая карта, самые загруженные часы "
+             "или распределение длин свободных промежутков"
+    )
+    parser.add_argument(
+        '--bucket-minutes',
+        type=int,
+        default=60,
+        help="Размер ячейки тепловой карты в минутах"
+    )
+    parser.add_argument(
+        '--date-from',
+        metavar='ГГГГ-ММ-ДД',
+        default=None,
+        help="Начало диапазона дат выгрузки или отчёта"
+    )
+    parser.add_argument('--date-to', metavar='ГГГГ-ММ-ДД', default=None, help="Конец диапазона дат выгрузки или отчёта")
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help="Запустить HTTP-сервис с расписанием в памяти"
+    )
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help="Собирать метрики этапов (время, счётчики); HTTP-сервис отдаёт их по адресу /metrics"
+    )
+    parser.add_argument(
+        '--metrics-file',
+        metavar='PATH',
+        default=None,
+        help="Записать метрики в текстовом формате Prometheus при завершении"
+    )
+    parser.add_argument(
+        '--metrics-log',
+        metavar='PATH',
+        default=None,
+        help="Писать замеры этапов и ошибки JSON-строками в файл ('-' для stderr)"
+    )
+    parser.add_argument('--host', default=SERVER_HOST, help="Адрес HTTP-сервиса")
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help="Порт HTTP-сервиса")
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="Количество процессов-воркеров, разделяющих снимок расписания (HTTP-сервис и пакетный режим)"
+    )
+    parser.add_argument(
+        '--refresh-interval',
+        type=float,
+        default=SERVER_REFRESH_INTERVAL,
+        help="Период фонового обновления расписания в секундах (0 — не обновлять)"
+    )
+
+    return parser.parse_args(argv)
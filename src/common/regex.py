@@ -1,2 +1,9 @@
-VALIDATE_ACTION_PATTERN: str = r"^[1-5]$"
-VALIDATE_TIMESLOTS_DURATION_PATTERN: str = r"^(?!0\d)([1-9]\d{0,2}|1[0-3]\d{2}|1440)$"
+from re import compile as re_compile, Pattern
+
+# Шаблоны компилируются один раз при импорте, а не при каждой проверке
+VALIDATE_ACTION_PATTERN: Pattern[str] = re_compile(r"^[1-5]$")
+VALIDATE_TIMESLOTS_DURATION_PATTERN: Pattern[str] = re_compile(r"^(?!0\d)([1-9]\d{0,2}|1[0-3]\d{2}|1440)$")
+VALIDATE_LIMIT_PATTERN: Pattern[str] = re_compile(r"^[1-9]\d{0,8}$")
+# Та же форма, что принимает strptime для %Y-%m-%d и %H:%M; диапазоны значений проверяет date/time
+VALIDATE_DATE_PATTERN: Pattern[str] = re_compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+VALIDATE_TIME_PATTERN: Pattern[str] = re_compile(r"(\d{1,2}):(\d{1,2})")
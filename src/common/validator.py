@@ -1,8 +1,11 @@
-from re import fullmatch, Match
+from re import Match
 from typing import Optional
-from datetime import datetime
+from datetime import date as date_type, time as time_type
 
-from src.common.regex import VALIDATE_ACTION_PATTERN, VALIDATE_TIMESLOTS_DURATION_PATTERN
+from src.common.regex import (
+    VALIDATE_ACTION_PATTERN, VALIDATE_DATE_PATTERN, VALIDATE_LIMIT_PATTERN, VALIDATE_TIME_PATTERN,
+    VALIDATE_TIMESLOTS_DURATION_PATTERN
+)
 from src.parsers import time_to_minutes
 
 
@@ -10,7 +13,7 @@ class ArgsValidator:
 
     @staticmethod
     def validate_action(action: str) -> int:
-        match: Optional[Match[str]] = fullmatch(pattern=VALIDATE_ACTION_PATTERN, string=action)
+        match: Optional[Match[str]] = VALIDATE_ACTION_PATTERN.fullmatch(action)
 
         if not match:
             raise ValueError("Некорректный выбор действия, введите цифру от 1 до 4")
@@ -19,19 +22,29 @@ class ArgsValidator:
 
     @staticmethod
     def validate_date(date: str) -> None:
+        # Регулярка и конструктор date вместо strptime: в разы быстрее и не тянет импорт _strptime
+        match: Optional[Match[str]] = VALIDATE_DATE_PATTERN.fullmatch(date)
+
         try:
-            datetime.strptime(date, "%Y-%m-%d")
+            if not match:
+                raise ValueError(date)
+
+            date_type(int(match[1]), int(match[2]), int(match[3]))
 
-        except Exception:
+        except ValueError:
             raise ValueError("Некорректный формат даты")
 
     @staticmethod
     def validate_timeslots_intervals(start: str, end: str):
         try:
-            datetime.strptime(start, "%H:%M")
-            datetime.strptime(end, "%H:%M")
+            for value in (start, end):
+                match: Optional[Match[str]] = VALIDATE_TIME_PATTERN.fullmatch(value)
+                if not match:
+                    raise ValueError(value)
 
-        except Exception:
+                time_type(int(match[1]), int(match[2]))
+
+        except ValueError:
             raise ValueError("Некорректный формат интервала")
 
         if time_to_minutes(start) >= time_to_minutes(end):
@@ -39,7 +52,7 @@ class ArgsValidator:
 
     @staticmethod
     def validate_available_timeslots_duration(duration: str) -> int:
-        match: Optional[Match[str]] = fullmatch(pattern=VALIDATE_TIMESLOTS_DURATION_PATTERN, string=duration)
+        match: Optional[Match[str]] = VALIDATE_TIMESLOTS_DURATION_PATTERN.fullmatch(duration)
 
         if not match:
             raise ValueError(
@@ -48,3 +61,12 @@ class ArgsValidator:
             )
 
         return int(duration)
+
+    @staticmethod
+    def validate_limit(limit: str) -> int:
+        match: Optional[Match[str]] = VALIDATE_LIMIT_PATTERN.fullmatch(limit)
+
+        if not match:
+            raise ValueError("Некорректное ограничение количества результатов, ожидается целое число больше нуля")
+
+        return int(limit)
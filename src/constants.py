@@ -1 +1,36 @@
+from os import environ, path
+
 EMPLOYMENT_SCHEDULE_URL: str = 'https://ofc-test-01.tspb.su/test-task/'
+
+REQUEST_TIMEOUT: float = 10.0
+
+EMPLOYMENT_SCHEDULE_CACHE_DIR: str = environ.get(
+    'EMPLOYMENT_SCHEDULE_CACHE_DIR',
+    path.join(path.expanduser('~'), '.cache', 'trajectory_test_task')
+)
+EMPLOYMENT_SCHEDULE_CACHE_TTL: int = int(environ.get('EMPLOYMENT_SCHEDULE_CACHE_TTL', '300'))
+
+# Загрузка расписаний, разбитых на шарды (по месяцам, по сотрудникам)
+INGEST_CONCURRENCY: int = 8
+INGEST_RETRIES: int = 3
+INGEST_BACKOFF: float = 0.5
+
+# Сколько раз бронирование перечитывает день, если его успели изменить между поиском окна и записью
+BOOKING_RETRIES: int = 8
+
+# Количество закэшированных расчётов по дням (занятые, свободные промежутки, индекс доступности)
+SCHEDULE_CACHE_SIZE: int = int(environ.get('SCHEDULE_CACHE_SIZE', '256'))
+
+# Сколько развёрнутых дней повторяющегося расписания держать в памяти
+RECURRENCE_CACHE_SIZE: int = 64
+
+# Сбор метрик этапов (время, счётчики); выключенный сбор почти ничего не стоит
+SCHEDULE_METRICS_ENABLED: bool = environ.get('SCHEDULE_METRICS', '').lower() in ('1', 'true')
+
+# Выгрузка: дней в одной порции расчёта и размер буфера записи файла
+EXPORT_CHUNK_DAYS: int = 256
+EXPORT_BUFFER_SIZE: int = 1 << 20
+
+SERVER_HOST: str = '127.0.0.1'
+SERVER_PORT: int = 8080
+SERVER_REFRESH_INTERVAL: float = 300.0
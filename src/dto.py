@@ -1,7 +1,7 @@
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Union
 
-from src.models import Day, Timeslot
+from src.models import Day, Timeslot, ColumnarTimeslots, RecurringBlock, ScheduleException, WorkingHours
 
 
 @dataclass
@@ -13,7 +13,47 @@ class APIResponse:
 @dataclass
 class EmploymentScheduleDTO:
     days: Optional[List[Day]] = None
-    timeslots: Optional[List[Timeslot]] = None
+    timeslots: Optional[Union[List[Timeslot], ColumnarTimeslots]] = None
+
+
+@dataclass
+class RecurringScheduleDTO:
+    date_from: str
+    date_to: str
+    hours: List[WorkingHours] = field(default_factory=list)
+    blocks: List[RecurringBlock] = field(default_factory=list)
+    exceptions: List[ScheduleException] = field(default_factory=list)
+
+
+@dataclass
+class ScheduleConflict:
+    kind: str
+    day_id: int
+    slot_ids: List[int]
+
+
+@dataclass
+class NormalizationReport:
+    input_slots: int = 0
+    output_slots: int = 0
+    conflicts: List[ScheduleConflict] = field(default_factory=list)
+
+
+@dataclass
+class ScheduleResponse:
+    result: Optional[EmploymentScheduleDTO] = None
+    error: Optional[str] = None
+    normalization: Optional[NormalizationReport] = None
+
+
+@dataclass
+class Booking:
+    slot_id: int
+    day_id: int
+    date: str
+    start: str
+    end: str
+    version: int
 
 
 @dataclass
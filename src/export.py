@@ -0,0 +1,201 @@
+import sys
+from csv import writer as csv_writer
+from importlib import import_module
+from json import dumps
+from os import path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from src.common.converters import minutes_to_time
+from src.common.metrics import METRICS, timed
+from src.common.validator import ArgsValidator
+from src.constants import EXPORT_BUFFER_SIZE, EXPORT_CHUNK_DAYS
+from src.index import ScheduleStore
+from src.models import Day
+from src.vectorized import ScheduleArrays
+
+Row = Tuple[Any, ...]
+
+# Колонки выгрузки по видам: занятые и свободные промежутки построчно, загрузка — одна строка на день
+EXPORT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'busy': ('date', 'start', 'end'),
+    'free': ('date', 'start', 'end'),
+    'utilization': ('date', 'busy_minutes', 'utilization')
+}
+EXPORT_FORMATS: Tuple[str, ...] = ('csv', 'jsonl', 'parquet')
+
+
+def _import_pyarrow() -> Optional[Any]:
+    # pyarrow — необязательная зависимость: нужна только для выгрузки в Parquet
+    try:
+        return import_module('pyarrow.parquet')
+
+    except ImportError:
+        return None
+
+
+def _interval_rows(days: List[Day], intervals: Dict[int, List[Tuple[int, int]]]) -> List[Row]:
+    return [
+        (day.date, minutes_to_time(start), minutes_to_time(end))
+        for day in days
+        for start, end in intervals[day.id]
+    ]
+
+
+def _utilization_rows(arrays: ScheduleArrays) -> List[Row]:
+    shares: Dict[int, float] = arrays.utilization()
+
+    return [
+        (day.date, round(shares[day.id] * (day.end_minutes - day.start_minutes)), round(shares[day.id], 4))
+        for day in arrays.days
+    ]
+
+
+def iter_export_chunks(
+        store: ScheduleStore,
+        kind: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        chunk_days: int = EXPORT_CHUNK_DAYS
+) -> Iterator[List[Row]]:
+    if kind not in EXPORT_COLUMNS:
+        raise ValueError(f"Неизвестный вид выгрузки {kind}")
+    if chunk_days < 1:
+        raise ValueError("Размер порции выгрузки должен быть положительным")
+
+    days: List[Day] = store.get_days(date_from=date_from, date_to=date_to)
+
+    # Дни обрабатываются порциями: в памяти одновременно только колонки одной порции, а не всего года
+    for position in range(0, len(days), chunk_days):
+        chunk: List[Day] = days[position:position + chunk_days]
+        arrays: ScheduleArrays = ScheduleArrays(store, date_from=chunk[0].date, date_to=chunk[-1].date)
+
+        match kind:
+            case 'busy':
+                yield _interval_rows(arrays.days, arrays.merged_busy_intervals())
+            case 'free':
+                yield _interval_rows(arrays.days, arrays.free_intervals())
+            case _:
+                yield _utilization_rows(arrays)
+
+
+def _write_csv(chunks: Iterator[List[Row]], columns: Tuple[str, ...], output: TextIO) -> int:
+    writer = csv_writer(output, lineterminator='\n')
+    writer.writerow(columns)
+    written: int = 0
+
+    for rows in chunks:
+        writer.writerows(rows)
+        written += len(rows)
+
+    return written
+
+
+def _write_jsonl(chunks: Iterator[List[Row]], columns: Tuple[str, ...], output: TextIO) -> int:
+    written: int = 0
+
+    for rows in chunks:
+        # Порция сериализуется целиком и уходит в буфер одной записью
+        output.write(''.join(f'{dumps(dict(zip(columns, row)), ensure_ascii=False)}\n' for row in rows))
+        written += len(rows)
+
+    return written
+
+
+def _write_parquet(chunks: Iterator[List[Row]], columns: Tuple[str, ...], output_path: str) -> int:
+    parquet: Optional[Any] = _import_pyarrow()
+    if parquet is None:
+        raise ValueError("Для выгрузки в Parquet необходимо установить pyarrow")
+
+    pyarrow: Any = import_module('pyarrow')
+    writer: Optional[Any] = None
+    written: int = 0
+
+    try:
+        for rows in chunks:
+            # Каждая порция дней становится отдельной группой строк Parquet-файла
+            if not rows:
+                continue
+
+            table: Any = pyarrow.table({name: list(values) for name, values in zip(columns, zip(*rows))})
+
+            if writer is None:
+                writer = parquet.ParquetWriter(output_path, table.schema)
+
+            writer.write_table(table)
+            written += len(rows)
+
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return written
+
+
+def detect_export_format(output_path: str) -> str:
+    extension: str = path.splitext(output_path)[1].lstrip('.').lower()
+
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Не удалось определить формат выгрузки по пути {output_path}, укажите его явно")
+
+    return extension
+
+
+@timed('export')
+def export_schedule(
+        store: ScheduleStore,
+        kind: str,
+        output_path: str,
+        export_format: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        chunk_days: int = EXPORT_CHUNK_DAYS
+) -> int:
+    export_format = export_format or ('csv' if output_path == '-' else detect_export_format(output_path))
+
+    # Аргументы проверяются до открытия файла, чтобы ошибка не оставляла после себя пустую выгрузку
+    if kind not in EXPORT_COLUMNS:
+        raise ValueError(f"Неизвестный вид выгрузки {kind}")
+    for date in (date_from, date_to):
+        if date is not None:
+            ArgsValidator.validate_date(date)
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки {export_format}")
+    if export_format == 'parquet' and output_path == '-':
+        raise ValueError("Выгрузка в Parquet возможна только в файл")
+
+    columns: Tuple[str, ...] = EXPORT_COLUMNS[kind]
+    chunks: Iterator[List[Row]] = iter_export_chunks(
+        store,
+        kind=kind,
+        date_from=date_from,
+        date_to=date_to,
+        chunk_days=chunk_days
+    )
+
+    if export_format == 'parquet':
+        written: int = _write_parquet(chunks, columns, output_path)
+    else:
+        write: Callable[[Iterator[List[Row]], Tuple[str, ...], TextIO], int] = (
+            _write_csv if export_format == 'csv' else _write_jsonl
+        )
+        # sys.stdout берётся в момент вызова: его могут подменить после импорта модуля
+        output: TextIO = sys.stdout if output_path == '-' else open(
+            output_path,
+            'w',
+            encoding='utf-8',
+            newline='',
+            buffering=EXPORT_BUFFER_SIZE
+        )
+
+        try:
+            written = write(chunks, columns, output)
+
+        finally:
+            if output is sys.stdout:
+                output.flush()
+            else:
+                output.close()
+
+    METRICS.increment('rows_exported', written)
+
+    return written
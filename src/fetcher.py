@@ -0,0 +1,252 @@
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from json import dump, load
+from os import makedirs, path, replace
+from pickle import dump as pickle_dump, load as pickle_load, HIGHEST_PROTOCOL
+from time import perf_counter, time
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from src.common.json_stream import ReadableStream
+from src.common.metrics import METRICS
+from src.constants import EMPLOYMENT_SCHEDULE_CACHE_DIR, EMPLOYMENT_SCHEDULE_CACHE_TTL, REQUEST_TIMEOUT
+from src.dto import EmploymentScheduleDTO, NormalizationReport, ScheduleResponse
+from src.models import ColumnarTimeslots
+from src.normalization import normalize_schedule
+from src.parsers import stream_employment_schedule_parser
+
+# Версия формата кэша: увеличивается при изменении моделей, старые записи перестают совпадать по ключу
+CACHE_FORMAT_VERSION: int = 2
+
+
+class _TimedStream:
+    # Копит время ожидания сети внутри потокового разбора: разбор за вычетом сети — стоимость декодирования
+    def __init__(self, stream: ReadableStream):
+        self._stream: ReadableStream = stream
+        self.seconds: float = 0.0
+
+    def read(self, size: int, /) -> Any:
+        started: float = perf_counter()
+        chunk: Any = self._stream.read(size)
+        self.seconds += perf_counter() - started
+
+        return chunk
+
+
+class ScheduleFetcher:
+    def __init__(
+            self,
+            url: str,
+            cache_dir: Optional[str] = EMPLOYMENT_SCHEDULE_CACHE_DIR,
+            ttl: int = EMPLOYMENT_SCHEDULE_CACHE_TTL,
+            timeout: float = REQUEST_TIMEOUT,
+            columnar: bool = True,
+            normalize: bool = True,
+            session: Optional[Session] = None
+    ):
+        self.url: str = url
+        self.ttl: int = ttl
+        self.timeout: float = timeout
+        self.columnar: bool = columnar
+        self.normalize: bool = normalize
+        self._session: Session = session if session is not None else self._create_session()
+
+        self._meta_path: Optional[str] = None
+        self._data_path: Optional[str] = None
+
+        if cache_dir is not None:
+            # Версия формата, представление и нормализация входят в ключ: чужой кэш не подхватывается
+            key: str = sha256(
+                f'{CACHE_FORMAT_VERSION}|{url}|{int(columnar)}|{int(normalize)}'.encode()
+            ).hexdigest()[:16]
+            self._meta_path = path.join(cache_dir, f'{key}.json')
+            self._data_path = path.join(cache_dir, f'{key}.pickle')
+
+    @staticmethod
+    def _create_session() -> Session:
+        # Пул соединений переиспользует TCP/TLS-соединение между запросами
+        session: Session = Session()
+        adapter: HTTPAdapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept-Encoding'] = 'gzip, deflate'
+
+        return session
+
+    def fetch(self) -> ScheduleResponse:
+        with METRICS.timer('fetch'):
+            return self._fetch()
+
+    def _fetch(self) -> ScheduleResponse:
+        result: ScheduleResponse = ScheduleResponse()
+
+        try:
+            meta: Optional[Dict[str, Any]] = self._read_meta()
+
+            if meta is not None and time() - meta['fetched_at'] < self.ttl:
+                result.result = self._read_schedule()
+
+                if result.result is not None:
+                    METRICS.increment('fetch_cache_hits')
+                    return result
+
+            result.result, result.normalization = self._download(meta=meta)
+
+        except Exception as error:
+            METRICS.increment('fetch_errors')
+            result.error = str(error)
+
+        return result
+
+    def _download(
+            self,
+            meta: Optional[Dict[str, Any]]
+    ) -> Tuple[EmploymentScheduleDTO, Optional[NormalizationReport]]:
+        headers: Dict[str, str] = {}
+
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        with self._session.get(url=self.url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and meta is not None:
+                cached_schedule: Optional[EmploymentScheduleDTO] = self._read_schedule()
+
+                if cached_schedule is not None:
+                    METRICS.increment('fetch_not_modified')
+                    meta['fetched_at'] = time()
+                    self._write_meta(meta)
+
+                    return cached_schedule, None
+
+                # Кэш потерян между проверкой и ответом: повторяем запрос без условий
+                return self._download(meta=None)
+
+            if not response.ok:
+                raise RequestException(f"Возникла проблема при запросе к URL, код ответа -> {response.status_code}.")
+
+            response.raw.decode_content = True
+            stream: Union[ReadableStream, _TimedStream] = (
+                _TimedStream(response.raw) if METRICS.enabled else response.raw
+            )
+            schedule: EmploymentScheduleDTO = stream_employment_schedule_parser(
+                stream=stream,
+                columnar=self.columnar
+            )
+
+            if isinstance(stream, _TimedStream):
+                METRICS.observe('network', stream.seconds)
+
+            report: Optional[NormalizationReport] = None
+            if self.normalize:
+                # В кэш попадает уже нормализованное расписание, повторно при чтении кэша его не обрабатываем
+                schedule, report = normalize_schedule(schedule=schedule, columnar=self.columnar)
+
+            self._write_cache(
+                schedule=schedule,
+                meta={
+                    'url': self.url,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'fetched_at': time(),
+                    'version': CACHE_FORMAT_VERSION
+                }
+            )
+
+        return schedule, report
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        if self._meta_path is None or not path.exists(self._meta_path):
+            return None
+
+        try:
+            with open(self._meta_path, encoding='utf-8') as meta_file:
+                meta: Any = load(meta_file)
+
+        except (OSError, ValueError):
+            return None
+
+        # Неполная или записанная другой версией запись — промах кэша, а не ошибка получения расписания
+        if (
+            not isinstance(meta, dict)
+            or meta.get('version') != CACHE_FORMAT_VERSION
+            or not isinstance(meta.get('fetched_at'), (int, float))
+        ):
+            return None
+
+        return meta
+
+    def _read_schedule(self) -> Optional[EmploymentScheduleDTO]:
+        if self._data_path is None or not path.exists(self._data_path):
+            return None
+
+        try:
+            with open(self._data_path, 'rb') as data_file:
+                schedule: Any = pickle_load(data_file)
+
+        except Exception:
+            return None
+
+        timeslots_type: type = ColumnarTimeslots if self.columnar else list
+        if (
+            not isinstance(schedule, EmploymentScheduleDTO)
+            or not isinstance(schedule.days, list)
+            or not isinstance(schedule.timeslots, timeslots_type)
+        ):
+            return None
+
+        return schedule
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        assert self._meta_path is not None
+
+        try:
+            with open(f'{self._meta_path}.tmp', 'w', encoding='utf-8') as meta_file:
+                dump(meta, meta_file)
+
+            replace(f'{self._meta_path}.tmp', self._meta_path)
+
+        except OSError:
+            pass
+
+    def _write_cache(self, schedule: EmploymentScheduleDTO, meta: Dict[str, Any]) -> None:
+        if self._meta_path is None or self._data_path is None:
+            return
+
+        try:
+            makedirs(path.dirname(self._data_path), exist_ok=True)
+
+            # Запись через временный файл, чтобы параллельный запуск не прочитал половину кэша
+            with open(f'{self._data_path}.tmp', 'wb') as data_file:
+                pickle_dump(schedule, data_file, protocol=HIGHEST_PROTOCOL)
+
+            replace(f'{self._data_path}.tmp', self._data_path)
+            self._write_meta(meta)
+
+        except OSError:
+            # Кэш — только ускорение, ошибка записи не должна ломать получение расписания
+            pass
+
+
+def fetch_employee_schedules(
+        urls: Mapping[str, str],
+        max_workers: int = 8,
+        cache_dir: Optional[str] = EMPLOYMENT_SCHEDULE_CACHE_DIR
+) -> Dict[str, ScheduleResponse]:
+    # Расписания сотрудников скачиваются параллельно через общий пул соединений,
+    # кэш и условные запросы у каждого сотрудника свои
+    session: Session = ScheduleFetcher._create_session()
+    fetchers: Dict[str, ScheduleFetcher] = {
+        employee_id: ScheduleFetcher(url=url, cache_dir=cache_dir, session=session)
+        for employee_id, url in urls.items()
+    }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {employee_id: executor.submit(fetcher.fetch) for employee_id, fetcher in fetchers.items()}
+
+        return {employee_id: future.result() for employee_id, future in futures.items()}
@@ -0,0 +1,192 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.availability import compute_free_intervals
+from src.index import ScheduleIndex, ScheduleStore
+from src.models import Day
+
+
+class DayGaps:
+    __slots__ = ('starts', 'ends', 'prefix_max', 'sorted_lengths')
+
+    def __init__(self, free_intervals: List[Tuple[int, int]]):
+        self.starts: array = array('H')
+        self.ends: array = array('H')
+        # prefix_max[i] — наибольший свободный промежуток среди первых i + 1: массив не убывает,
+        # поэтому первый промежуток длиной >= D находится бинарным поиском
+        self.prefix_max: array = array('H')
+        self.sorted_lengths: array = array('H', sorted(end - start for start, end in free_intervals))
+
+        longest: int = 0
+        for start, end in free_intervals:
+            longest = max(longest, end - start)
+            self.starts.append(start)
+            self.ends.append(end)
+            self.prefix_max.append(longest)
+
+    @property
+    def max_gap(self) -> int:
+        return self.prefix_max[-1] if self.prefix_max else 0
+
+    def count_fitting(self, duration: int) -> int:
+        return len(self.sorted_lengths) - bisect_left(self.sorted_lengths, duration)
+
+    def earliest(self, duration: int) -> Optional[Tuple[int, int]]:
+        position: int = bisect_left(self.prefix_max, duration)
+
+        if position == len(self.prefix_max):
+            return None
+
+        return self.starts[position], self.ends[position]
+
+    def fitting(self, duration: int) -> List[Tuple[int, int]]:
+        if self.max_gap < duration:
+            return []
+
+        return [(start, end) for start, end in zip(self.starts, self.ends) if end - start >= duration]
+
+
+class MaxSegmentTree:
+    def __init__(self, values: List[int]):
+        self._size: int = 1
+        while self._size < max(len(values), 1):
+            self._size *= 2
+
+        self._tree: List[int] = [-1] * (2 * self._size)
+        self._tree[self._size:self._size + len(values)] = values
+
+        for node in range(self._size - 1, 0, -1):
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def update(self, position: int, value: int) -> None:
+        node: int = position + self._size
+        self._tree[node] = value
+
+        while node > 1:
+            node //= 2
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def first_at_least(self, value: int, lo: int = 0, hi: Optional[int] = None) -> Optional[int]:
+        # Первая позиция в [lo, hi) со значением >= value: спуск по дереву, поддеревья с меньшим максимумом
+        # и вне диапазона пропускаются целиком
+        hi = self._size if hi is None else hi
+
+        def search(node: int, node_lo: int, node_hi: int) -> Optional[int]:
+            if node_hi <= lo or hi <= node_lo or self._tree[node] < value:
+                return None
+
+            if node >= self._size:
+                return node - self._size
+
+            middle: int = (node_lo + node_hi) // 2
+
+            found: Optional[int] = search(2 * node, node_lo, middle)
+            return found if found is not None else search(2 * node + 1, middle, node_hi)
+
+        return search(1, 0, self._size)
+
+
+class GapIndex:
+    def __init__(self, store: ScheduleStore):
+        self._store: ScheduleStore = store
+        # Подписчик вызывается из потоков бронирования разных дней одновременно с запросами: обновления и чтения
+        # дерева идут под одной блокировкой, а перестроение подменяет состояние целиком
+        self._lock: Lock = Lock()
+        with self._lock:
+            self._build()
+
+        if isinstance(store, ScheduleIndex):
+            store.add_listener(self.refresh_day)
+
+    def _build(self) -> None:
+        self._days: List[Day] = self._store.get_days()
+        self._dates: List[str] = [day.date for day in self._days]
+        self._positions_by_id: Dict[int, int] = {day.id: position for position, day in enumerate(self._days)}
+        self._gaps: List[DayGaps] = [self._compute_day(day) for day in self._days]
+        self._tree: MaxSegmentTree = MaxSegmentTree([gaps.max_gap for gaps in self._gaps])
+
+    def _compute_day(self, day: Day) -> DayGaps:
+        return DayGaps(compute_free_intervals(day, self._store.get_intervals(day.id)))
+
+    def refresh_day(self, day_id: int) -> None:
+        with self._lock:
+            position: Optional[int] = self._positions_by_id.get(day_id)
+            day: Optional[Day] = self._store.get_day_by_id(day_id)
+
+            if position is None or day is None or day.date != self._days[position].date:
+                # Добавление, удаление или перенос дня сдвигают позиции остальных, поэтому индекс перестраивается
+                self._build()
+                return
+
+            self._days[position] = day
+            self._gaps[position] = self._compute_day(day)
+            self._tree.update(position, self._gaps[position].max_gap)
+
+    def _bounds(self, date_from: Optional[str], date_to: Optional[str]) -> Tuple[int, int]:
+        lo: int = 0 if date_from is None else bisect_left(self._dates, date_from)
+        hi: int = len(self._dates) if date_to is None else bisect_right(self._dates, date_to)
+
+        return lo, hi
+
+    def get_day_gaps(self, day_id: int) -> Optional[DayGaps]:
+        with self._lock:
+            position: Optional[int] = self._positions_by_id.get(day_id)
+
+            return self._gaps[position] if position is not None else None
+
+    def _next_fitting(
+            self,
+            duration: int,
+            date_from: Optional[str],
+            date_to: Optional[str],
+            after: Optional[str]
+    ) -> Optional[Tuple[Day, DayGaps]]:
+        # Границы ищутся заново на каждом шаге: между шагами генератора индекс мог быть перестроен
+        with self._lock:
+            lo, hi = self._bounds(date_from=date_from, date_to=date_to)
+            if after is not None:
+                lo = max(lo, bisect_right(self._dates, after))
+
+            position: Optional[int] = self._tree.first_at_least(duration, lo=lo, hi=hi) if lo < hi else None
+            if position is None:
+                return None
+
+            return self._days[position], self._gaps[position]
+
+    def iter_days_fitting(
+            self,
+            duration: int,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None
+    ) -> Iterator[Day]:
+        after: Optional[str] = None
+
+        while True:
+            found: Optional[Tuple[Day, DayGaps]] = self._next_fitting(duration, date_from, date_to, after)
+            if found is None:
+                return
+
+            yield found[0]
+            after = found[0].date
+
+    def earliest_slot(
+            self,
+            duration: int,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None
+    ) -> Optional[Tuple[Day, int, int]]:
+        after: Optional[str] = None
+
+        while True:
+            found: Optional[Tuple[Day, DayGaps]] = self._next_fitting(duration, date_from, date_to, after)
+            if found is None:
+                return None
+
+            day, gaps = found
+            slot: Optional[Tuple[int, int]] = gaps.earliest(duration)
+            if slot is not None:
+                return day, slot[0], slot[1]
+
+            after = day.date
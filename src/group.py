@@ -0,0 +1,101 @@
+from heapq import merge
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from src.common.converters import minutes_to_time
+from src.common.validator import ArgsValidator
+from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex, ScheduleStore
+from src.models import Day
+
+
+class GroupScheduleProcessor:
+    def __init__(self, schedules: Mapping[str, Union[EmploymentScheduleDTO, ScheduleStore]]):
+        self._stores: Dict[str, ScheduleStore] = {
+            employee_id: ScheduleIndex(schedule) if isinstance(schedule, EmploymentScheduleDTO) else schedule
+            for employee_id, schedule in schedules.items()
+        }
+
+    @property
+    def employee_ids(self) -> List[str]:
+        return list(self._stores)
+
+    def get_common_free_timeslots(
+            self,
+            date: str,
+            employee_ids: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        ArgsValidator.validate_date(date)
+
+        return self._render_intervals(self._common_free_intervals(date=date, employee_ids=employee_ids))
+
+    def search_common_timeslots_for_duration(
+            self,
+            date: str,
+            duration: int,
+            employee_ids: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        ArgsValidator.validate_date(date)
+        minutes: int = ArgsValidator.validate_available_timeslots_duration(duration=str(duration))
+
+        return self._render_intervals([
+            (slot_start, slot_end)
+            for slot_start, slot_end in self._common_free_intervals(date=date, employee_ids=employee_ids)
+            if (slot_end - slot_start) >= minutes
+        ])
+
+    def _select_stores(self, employee_ids: Optional[Iterable[str]]) -> List[ScheduleStore]:
+        if employee_ids is None:
+            return list(self._stores.values())
+
+        stores: List[ScheduleStore] = []
+
+        for employee_id in employee_ids:
+            store: Optional[ScheduleStore] = self._stores.get(employee_id)
+            if store is None:
+                raise ValueError(f"Сотрудник {employee_id} не найден")
+
+            stores.append(store)
+
+        return stores
+
+    def _common_free_intervals(self, date: str, employee_ids: Optional[Iterable[str]]) -> List[Tuple[int, int]]:
+        stores: List[ScheduleStore] = self._select_stores(employee_ids)
+        if not stores:
+            return []
+
+        window_start: int = 0
+        window_end: int = 24 * 60
+        busy_lists: List[List[Tuple[int, int]]] = []
+
+        for store in stores:
+            day: Optional[Day] = store.get_day(date)
+
+            # Сотрудник, у которого дата не рабочая, делает общее свободное время пустым
+            if day is None:
+                return []
+
+            window_start = max(window_start, day.start_minutes)
+            window_end = min(window_end, day.end_minutes)
+            busy_lists.append(store.get_intervals(day.id))
+
+        free_intervals: List[Tuple[int, int]] = []
+        current_start: int = window_start
+
+        # k-way слияние уже отсортированных занятых промежутков: O(всего слотов · log k)
+        for slot_start, slot_end in merge(*busy_lists):
+            if slot_start >= window_end:
+                break
+
+            if current_start < slot_start:
+                free_intervals.append((current_start, slot_start))
+
+            current_start = max(current_start, slot_end)
+
+        if current_start < window_end:
+            free_intervals.append((current_start, window_end))
+
+        return free_intervals
+
+    @staticmethod
+    def _render_intervals(intervals: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        return [{"start": minutes_to_time(start), "end": minutes_to_time(end)} for start, end in intervals]
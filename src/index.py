@@ -0,0 +1,229 @@
+from bisect import bisect_left, bisect_right, insort
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from src.common.metrics import timed
+from src.dto import EmploymentScheduleDTO
+from src.models import Day, TimeslotRow, ColumnarTimeslots
+
+
+def iter_timeslot_records(schedule: EmploymentScheduleDTO) -> Iterable[Tuple[int, int, int, int]]:
+    timeslots = schedule.timeslots or []
+
+    if isinstance(timeslots, ColumnarTimeslots):
+        # Колонки читаются напрямую, без создания TimeslotRow на каждую запись
+        return zip(timeslots.ids, timeslots.day_ids, timeslots.starts, timeslots.ends)
+
+    return (
+        (timeslot.id, timeslot.day_id, timeslot.start_minutes, timeslot.end_minutes) for timeslot in timeslots
+    )
+
+
+class ScheduleStore(Protocol):
+    def get_day(self, date: str) -> Optional[Day]:
+        pass
+
+    def get_day_by_id(self, day_id: int) -> Optional[Day]:
+        pass
+
+    def get_days(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Day]:
+        pass
+
+    def get_timeslots(self, day_id: int) -> List[TimeslotRow]:
+        pass
+
+    def get_intervals(self, day_id: int) -> List[Tuple[int, int]]:
+        pass
+
+
+class ScheduleIndex:
+    @timed('index_build')
+    def __init__(self, schedule: EmploymentScheduleDTO):
+        self._days_by_date: Dict[str, Day] = {}
+        self._days_by_id: Dict[int, Day] = {}
+        # Слоты каждого дня хранятся колонками, независимо от представления во входном DTO
+        self._timeslots_by_day: Dict[int, ColumnarTimeslots] = {}
+        # Обратный индекс слот -> день: изменение или удаление слота без day_id не перебирает все дни
+        self._day_by_slot: Dict[int, int] = {}
+
+        for day in schedule.days or []:
+            self._days_by_date[day.date] = day
+            self._days_by_id[day.id] = day
+
+        for slot_id, day_id, start_minutes, end_minutes in iter_timeslot_records(schedule):
+            day_timeslots: Optional[ColumnarTimeslots] = self._timeslots_by_day.get(day_id)
+
+            if day_timeslots is None:
+                day_timeslots = self._timeslots_by_day[day_id] = ColumnarTimeslots()
+
+            day_timeslots.append(id=slot_id, day_id=day_id, start_minutes=start_minutes, end_minutes=end_minutes)
+            self._day_by_slot[slot_id] = day_id
+
+        # Следующий свободный id слота: выдаётся бронированиям, которые сами не знают занятых id
+        self._next_slot_id: int = max(self._day_by_slot, default=0) + 1
+        # Слоты разных дней добавляются из разных потоков: проверка и запись id слота должны быть атомарны
+        self._slots_lock: Lock = Lock()
+
+        # Сортируем один раз при построении индекса, а не на каждый запрос
+        for day_timeslots in self._timeslots_by_day.values():
+            day_timeslots.sort_by_start()
+
+        self._dates: List[str] = sorted(self._days_by_date)
+        # Подписчики получают day_id изменившегося дня, чтобы пересчитать только свои данные по нему
+        self._listeners: List[Callable[[int], None]] = []
+        # Растёт на каждое изменение, позволяет кэшам отличать устаревшие результаты
+        self.version: int = 0
+        # Версия последнего изменения каждого дня: ключ кэшей, не сбрасываемых изменениями других дней
+        self._day_versions: Dict[int, int] = {}
+        # Изменения разных дней могут идти из разных потоков (бронирования), счётчик версий общий
+        self._version_lock: Lock = Lock()
+
+    def get_day(self, date: str) -> Optional[Day]:
+        return self._days_by_date.get(date)
+
+    def get_day_by_id(self, day_id: int) -> Optional[Day]:
+        return self._days_by_id.get(day_id)
+
+    def get_days(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Day]:
+        lo: int = 0 if date_from is None else bisect_left(self._dates, date_from)
+        hi: int = len(self._dates) if date_to is None else bisect_right(self._dates, date_to)
+
+        return [self._days_by_date[date] for date in self._dates[lo:hi]]
+
+    def get_timeslots(self, day_id: int) -> List[TimeslotRow]:
+        day_timeslots: Optional[ColumnarTimeslots] = self._timeslots_by_day.get(day_id)
+
+        return list(day_timeslots) if day_timeslots is not None else []
+
+    def get_intervals(self, day_id: int) -> List[Tuple[int, int]]:
+        day_timeslots: Optional[ColumnarTimeslots] = self._timeslots_by_day.get(day_id)
+
+        return day_timeslots.intervals() if day_timeslots is not None else []
+
+    def add_listener(self, listener: Callable[[int], None]) -> None:
+        self._listeners.append(listener)
+
+    def get_day_version(self, day_id: int) -> int:
+        return self._day_versions.get(day_id, 0)
+
+    def _notify(self, day_id: int) -> None:
+        with self._version_lock:
+            self.version += 1
+            self._day_versions[day_id] = self.version
+
+        for listener in self._listeners:
+            listener(day_id)
+
+    def add_day(self, day: Day) -> None:
+        if day.id in self._days_by_id:
+            raise ValueError(f"День {day.id} уже есть в расписании")
+        if day.date in self._days_by_date:
+            raise ValueError(f"Дата {day.date} уже есть в расписании")
+
+        self._days_by_id[day.id] = day
+        self._days_by_date[day.date] = day
+        insort(self._dates, day.date)
+        self._notify(day.id)
+
+    def modify_day(self, day: Day) -> None:
+        previous: Optional[Day] = self._days_by_id.get(day.id)
+
+        if previous is None:
+            raise ValueError(f"День {day.id} не найден в расписании")
+        if day.date != previous.date and day.date in self._days_by_date:
+            raise ValueError(f"Дата {day.date} уже есть в расписании")
+
+        if day.date != previous.date:
+            del self._days_by_date[previous.date]
+            self._dates.pop(bisect_left(self._dates, previous.date))
+            insort(self._dates, day.date)
+
+        self._days_by_id[day.id] = day
+        self._days_by_date[day.date] = day
+        self._notify(day.id)
+
+    def remove_day(self, day_id: int) -> Day:
+        day: Optional[Day] = self._days_by_id.pop(day_id, None)
+
+        if day is None:
+            raise ValueError(f"День {day_id} не найден в расписании")
+
+        del self._days_by_date[day.date]
+        self._dates.pop(bisect_left(self._dates, day.date))
+        removed_timeslots: Optional[ColumnarTimeslots] = self._timeslots_by_day.pop(day_id, None)
+        with self._slots_lock:
+            for slot_id in removed_timeslots.ids if removed_timeslots is not None else []:
+                if self._day_by_slot.get(slot_id) == day_id:
+                    del self._day_by_slot[slot_id]
+
+        self._notify(day_id)
+
+        return day
+
+    def next_timeslot_id(self) -> int:
+        with self._slots_lock:
+            slot_id: int = self._next_slot_id
+            self._next_slot_id += 1
+
+            return slot_id
+
+    def find_timeslot_day(self, slot_id: int) -> int:
+        day_id: Optional[int] = self._day_by_slot.get(slot_id)
+
+        if day_id is None:
+            raise ValueError(f"Слот {slot_id} не найден в расписании")
+
+        return day_id
+
+    def add_timeslot(self, slot_id: int, day_id: int, start_minutes: int, end_minutes: int) -> None:
+        if day_id not in self._days_by_id:
+            raise ValueError(f"День {day_id} не найден в расписании")
+
+        # Колонки дня меняются в копии и подменяются целиком: читатели из других потоков не видят
+        # наполовину вставленную запись
+        current: Optional[ColumnarTimeslots] = self._timeslots_by_day.get(day_id)
+        day_timeslots: ColumnarTimeslots = current.copy() if current is not None else ColumnarTimeslots()
+
+        day_timeslots.insert(
+            bisect_right(day_timeslots.starts, start_minutes),
+            id=slot_id,
+            day_id=day_id,
+            start_minutes=start_minutes,
+            end_minutes=end_minutes
+        )
+
+        with self._slots_lock:
+            if slot_id in self._day_by_slot:
+                raise ValueError(f"Слот {slot_id} уже есть в расписании")
+
+            self._day_by_slot[slot_id] = day_id
+            self._next_slot_id = max(self._next_slot_id, slot_id + 1)
+
+        self._timeslots_by_day[day_id] = day_timeslots
+        self._notify(day_id)
+
+    def remove_timeslot(self, day_id: int, slot_id: int) -> TimeslotRow:
+        current: Optional[ColumnarTimeslots] = self._timeslots_by_day.get(day_id)
+
+        if current is None or slot_id not in current.ids:
+            raise ValueError(f"Слот {slot_id} не найден в дне {day_id}")
+
+        day_timeslots: ColumnarTimeslots = current.copy()
+        row: TimeslotRow = day_timeslots.pop(day_timeslots.ids.index(slot_id))
+        self._timeslots_by_day[day_id] = day_timeslots
+        with self._slots_lock:
+            if self._day_by_slot.get(slot_id) == day_id:
+                del self._day_by_slot[slot_id]
+
+        self._notify(day_id)
+
+        return row
+
+    def modify_timeslot(self, slot_id: int, day_id: int, start_minutes: int, end_minutes: int) -> None:
+        # Слот может переехать в другой день: тогда уведомляются оба дня.
+        # День назначения проверяется до удаления, чтобы ошибка не оставила слот удалённым
+        if day_id not in self._days_by_id:
+            raise ValueError(f"День {day_id} не найден в расписании")
+
+        self.remove_timeslot(day_id=self.find_timeslot_day(slot_id), slot_id=slot_id)
+        self.add_timeslot(slot_id=slot_id, day_id=day_id, start_minutes=start_minutes, end_minutes=end_minutes)
@@ -0,0 +1,296 @@
+import asyncio
+from io import BytesIO
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+from src.common.metrics import METRICS
+from src.constants import INGEST_BACKOFF, INGEST_CONCURRENCY, INGEST_RETRIES, REQUEST_TIMEOUT
+from src.dto import EmploymentScheduleDTO, ScheduleResponse
+from src.models import Day, ColumnarTimeslots
+from src.normalization import normalize_schedule
+from src.parsers import stream_employment_schedule_parser
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+# Ответы, которые имеет смысл повторить: перегрузка и временные ошибки апстрима
+RETRYABLE_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+class ShardError(Exception):
+    pass
+
+
+class AsyncHTTPClient:
+    def __init__(self, timeout: float = REQUEST_TIMEOUT):
+        self.timeout: float = timeout
+        # Свободные keep-alive соединения по (хост, порт, TLS): следующий запрос к тому же хосту их переиспользует
+        self._idle: Dict[Tuple[str, int, bool], List[Connection]] = {}
+
+    async def __aenter__(self) -> 'AsyncHTTPClient':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+
+        self._idle.clear()
+
+    async def get(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        return await asyncio.wait_for(self._get(url), timeout=self.timeout)
+
+    async def _get(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        secure: bool = parts.scheme == 'https'
+        key: Tuple[str, int, bool] = (parts.hostname or '', parts.port or (443 if secure else 80), secure)
+        target: str = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        request: bytes = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            "Accept: application/json\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        ).encode('latin-1')
+
+        idle: List[Connection] = self._idle.setdefault(key, [])
+
+        while True:
+            reused: bool = bool(idle)
+            reader, writer = idle.pop() if reused else await asyncio.open_connection(
+                key[0],
+                key[1],
+                ssl=secure or None
+            )
+
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers, body, keep_alive = await self._read_response(reader)
+
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+
+                # Апстрим мог закрыть простаивавшее соединение: повторяем на новом, не тратя попытку
+                if reused:
+                    continue
+                raise
+
+            except ValueError as error:
+                # Испорченные заголовки или размер чанка — ошибка этого шарда, а не всей загрузки
+                writer.close()
+                raise ShardError(f"Некорректный ответ HTTP от {url}: {error}") from error
+
+            except BaseException:
+                writer.close()
+                raise
+
+            if keep_alive:
+                idle.append((reader, writer))
+            else:
+                writer.close()
+
+            return status, headers, body
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes, bool]:
+        status_line: bytes = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Соединение закрыто до получения ответа")
+
+        parts: List[str] = status_line.decode('latin-1').split(maxsplit=2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ShardError(f"Некорректный ответ HTTP: {status_line!r}")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line: bytes = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive: bool = parts[0] == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks: List[bytes] = []
+
+            while True:
+                size: int = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Пропускаем трейлеры до пустой строки
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+
+            body: bytes = b''.join(chunks)
+
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+
+        else:
+            # Без длины тело читается до закрытия соединения
+            body, keep_alive = await reader.read(), False
+
+        return int(parts[1]), headers, body, keep_alive
+
+
+async def fetch_shard(
+        client: AsyncHTTPClient,
+        url: str,
+        retries: int = INGEST_RETRIES,
+        backoff: float = INGEST_BACKOFF
+) -> bytes:
+    attempt: int = 0
+
+    while True:
+        try:
+            with METRICS.timer('shard_fetch'):
+                status, _, body = await client.get(url)
+
+            if status == 200:
+                return body
+
+            error: Exception = ShardError(f"Возникла проблема при запросе к URL {url}, код ответа -> {status}.")
+            if status not in RETRYABLE_STATUSES:
+                raise error
+
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as network_error:
+            error = ShardError(f"Не удалось получить {url}: {network_error or type(network_error).__name__}")
+
+        if attempt >= retries:
+            raise error
+
+        # Экспоненциальная задержка между попытками: 1x, 2x, 4x от базовой
+        METRICS.increment('shard_retries')
+        await asyncio.sleep(backoff * 2 ** attempt)
+        attempt += 1
+
+
+async def iter_schedule_shards(
+        shards: Mapping[str, Sequence[str]],
+        concurrency: int = INGEST_CONCURRENCY,
+        retries: int = INGEST_RETRIES,
+        backoff: float = INGEST_BACKOFF,
+        timeout: float = REQUEST_TIMEOUT
+) -> AsyncIterator[Tuple[str, str, Union[EmploymentScheduleDTO, Exception]]]:
+    if concurrency < 1:
+        raise ValueError("Количество одновременных запросов должно быть положительным")
+
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncHTTPClient(timeout=timeout) as client:
+        async def load(employee_id: str, url: str) -> Tuple[str, str, Union[bytes, Exception]]:
+            async with semaphore:
+                try:
+                    return employee_id, url, await fetch_shard(client, url, retries=retries, backoff=backoff)
+
+                except ShardError as error:
+                    return employee_id, url, error
+
+        tasks: List[asyncio.Task] = [
+            asyncio.create_task(load(employee_id, url)) for employee_id, urls in shards.items() for url in urls
+        ]
+
+        try:
+            # Шарды разбираются по мере прихода, пока остальные ещё скачиваются
+            for completed in asyncio.as_completed(tasks):
+                employee_id, url, payload = await completed
+
+                if isinstance(payload, Exception):
+                    yield employee_id, url, payload
+                    continue
+
+                shard: Union[EmploymentScheduleDTO, Exception]
+                try:
+                    shard = stream_employment_schedule_parser(stream=BytesIO(payload), columnar=True)
+
+                except (KeyError, TypeError, ValueError) as error:
+                    shard = ShardError(f"Некорректные данные шарда {url}: {error}")
+
+                yield employee_id, url, shard
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def ingest_schedules(
+        shards: Mapping[str, Sequence[str]],
+        concurrency: int = INGEST_CONCURRENCY,
+        retries: int = INGEST_RETRIES,
+        backoff: float = INGEST_BACKOFF,
+        timeout: float = REQUEST_TIMEOUT,
+        normalize: bool = True
+) -> Dict[str, ScheduleResponse]:
+    # Соседние шарды могут повторять дни и слоты на границах: дни склеиваются по id, одинаковые слоты — один раз
+    days: Dict[str, Dict[int, Day]] = {employee_id: {} for employee_id in shards}
+    timeslots: Dict[str, ColumnarTimeslots] = {employee_id: ColumnarTimeslots() for employee_id in shards}
+    seen_slots: Dict[str, Set[Tuple[int, int, int, int]]] = {employee_id: set() for employee_id in shards}
+    errors: Dict[str, str] = {}
+
+    async for employee_id, url, shard in iter_schedule_shards(
+        shards,
+        concurrency=concurrency,
+        retries=retries,
+        backoff=backoff,
+        timeout=timeout
+    ):
+        if isinstance(shard, Exception):
+            errors.setdefault(employee_id, str(shard))
+            continue
+        if employee_id in errors:
+            continue
+
+        conflict: Optional[str] = None
+        for day in shard.days or []:
+            known: Day = days[employee_id].setdefault(day.id, day)
+
+            if known != day:
+                conflict = f"День {day.id} по-разному записан в шардах расписания: {known.date} и {day.date} ({url})"
+                break
+
+        if conflict is not None:
+            errors[employee_id] = conflict
+            continue
+
+        # Колонки шарда дописываются к расписанию сотрудника сразу, без ожидания остальных шардов
+        for row in shard.timeslots or []:
+            record: Tuple[int, int, int, int] = (row.id, row.day_id, row.start_minutes, row.end_minutes)
+
+            if record not in seen_slots[employee_id]:
+                seen_slots[employee_id].add(record)
+                timeslots[employee_id].append(
+                    id=row.id,
+                    day_id=row.day_id,
+                    start_minutes=row.start_minutes,
+                    end_minutes=row.end_minutes
+                )
+
+    responses: Dict[str, ScheduleResponse] = {}
+
+    for employee_id in shards:
+        if employee_id in errors:
+            responses[employee_id] = ScheduleResponse(error=errors[employee_id])
+            continue
+
+        schedule: EmploymentScheduleDTO = EmploymentScheduleDTO(
+            days=list(days[employee_id].values()),
+            timeslots=timeslots[employee_id]
+        )
+        responses[employee_id] = ScheduleResponse(result=schedule)
+
+        if normalize:
+            # Повторы между шардами уже отброшены, нормализация склеивает пересечения внутри дней
+            responses[employee_id].result, responses[employee_id].normalization = normalize_schedule(schedule)
+
+    return responses
+
+
+def ingest_employee_schedules(shards: Mapping[str, Sequence[str]], **options: Any) -> Dict[str, ScheduleResponse]:
+    return asyncio.run(ingest_schedules(shards, **options))
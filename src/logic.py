@@ -1,30 +1,203 @@
-from sys import exit as sys_exit
+import os
+from contextlib import ExitStack, contextmanager
+from json import dump
+from sys import exit as sys_exit, stderr, stdin, stdout
+from tempfile import gettempdir
+from typing import Any, Iterator, Optional, TextIO, Union
 
+from src.batch import run_batch
+from src.common.metrics import METRICS, MetricsSink, json_log_sink
+from src.common.validator import ArgsValidator
 from src.processor import ScheduleProcessor
-from src.dto import EmploymentScheduleDTO, APIResponse, ProcessorResponse
-from src.parsers import employment_schedule_parser
-from src.utils import get_employment_schedule
+from src.dto import EmploymentScheduleDTO, ProcessorResponse, ScheduleResponse
+from src.index import ScheduleIndex, ScheduleStore
+from src.snapshot import load_snapshot, save_snapshot
 from src.constants import EMPLOYMENT_SCHEDULE_URL
 
 
-def run(action_id: int) -> ProcessorResponse:
-    api_response: APIResponse = get_employment_schedule(
-        url=EMPLOYMENT_SCHEDULE_URL,
-    )
-    if api_response.error:
-        print(api_response.error)
+def load_schedule() -> EmploymentScheduleDTO:
+    # requests и urllib3 импортируются только когда расписание действительно скачивается, не при ответе из снимка
+    from src.fetcher import ScheduleFetcher
+
+    schedule_response: ScheduleResponse = ScheduleFetcher(url=EMPLOYMENT_SCHEDULE_URL).fetch()
+    if schedule_response.error:
+        METRICS.emit({'event': 'error', 'stage': 'fetch', 'message': schedule_response.error})
+        print(schedule_response.error)
         sys_exit(1)
 
-    assert api_response.result is not None
+    assert schedule_response.result is not None
 
-    parsed_api_response: EmploymentScheduleDTO = employment_schedule_parser(
-        data=api_response.result
-    )
+    if schedule_response.normalization is not None and schedule_response.normalization.conflicts:
+        METRICS.emit({
+            'event': 'normalization',
+            'input_slots': schedule_response.normalization.input_slots,
+            'output_slots': schedule_response.normalization.output_slots,
+            'conflicts': len(schedule_response.normalization.conflicts)
+        })
+
+    return schedule_response.result
+
+
+def load_schedule_store(snapshot_path: Optional[str] = None) -> Union[EmploymentScheduleDTO, ScheduleStore]:
+    if snapshot_path is None:
+        return load_schedule()
+
+    try:
+        return load_snapshot(snapshot_path)
+
+    except (OSError, ValueError) as error:
+        METRICS.emit({'event': 'error', 'stage': 'snapshot', 'message': str(error)})
+        print(error)
+        sys_exit(1)
+
+
+@contextmanager
+def setup_metrics(enabled: bool, log_path: Optional[str] = None) -> Iterator[None]:
+    if not enabled and log_path is None:
+        yield
+        return
 
+    METRICS.enabled = True
+
+    if log_path is None:
+        yield
+        return
+
+    # Структурированный лог: одна JSON-запись на каждый замер этапа и каждую ошибку;
+    # файл открыт на время запуска и закрывается при любом выходе, в том числе через sys.exit
+    with ExitStack() as stack:
+        log_file: TextIO = stderr if log_path == '-' else stack.enter_context(open(log_path, 'a', encoding='utf-8'))
+        sink: MetricsSink = json_log_sink(log_file)
+        METRICS.add_sink(sink)
+
+        try:
+            yield
+        finally:
+            METRICS.remove_sink(sink)
+
+
+def run(action_id: int, snapshot_path: Optional[str] = None) -> ProcessorResponse:
     processor: ScheduleProcessor = ScheduleProcessor(
         action=action_id,
-        schedule=parsed_api_response
+        schedule=load_schedule_store(snapshot_path)
     )
     response: ProcessorResponse = processor.get_response()
 
     return response
+
+
+def run_batch_file(
+        input_path: str,
+        output_path: str,
+        snapshot_path: Optional[str] = None,
+        workers: int = 1
+) -> int:
+    temporary_snapshot: Optional[str] = None
+
+    if workers > 1 and snapshot_path is None:
+        # Воркеры получают расписание через снимок в файле, а не пиклингом объектов
+        snapshot_path = temporary_snapshot = os.path.join(gettempdir(), f'schedule_batch_{os.getpid()}.snapshot')
+        save_snapshot(schedule=load_schedule(), file_path=snapshot_path)
+
+    input_file: TextIO = stdin if input_path == '-' else open(input_path, encoding='utf-8')
+    output_file: TextIO = stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8')
+
+    try:
+        if workers > 1:
+            # Пул процессов (multiprocessing) нужен только для параллельного пакета
+            from src.parallel import run_parallel_batch
+
+            assert snapshot_path is not None
+
+            return run_parallel_batch(
+                snapshot_paths=snapshot_path,
+                queries=input_file,
+                output=output_file,
+                workers=workers
+            )
+
+        # Расписание загружается и индексируется один раз на весь пакет запросов
+        processor: ScheduleProcessor = ScheduleProcessor(schedule=load_schedule_store(snapshot_path))
+
+        return run_batch(processor=processor, queries=input_file, output=output_file)
+
+    finally:
+        if input_file is not stdin:
+            input_file.close()
+        if output_file is not stdout:
+            output_file.close()
+        if temporary_snapshot is not None and os.path.exists(temporary_snapshot):
+            os.remove(temporary_snapshot)
+
+
+def run_export_file(
+        kind: str,
+        output_path: str,
+        export_format: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+) -> int:
+    # Модуль выгрузки тянет numpy (если установлен), поэтому импортируется только в этом режиме
+    from src.export import export_schedule
+
+    store: Union[EmploymentScheduleDTO, ScheduleStore] = load_schedule_store(snapshot_path)
+
+    try:
+        return export_schedule(
+            store=ScheduleIndex(store) if isinstance(store, EmploymentScheduleDTO) else store,
+            kind=kind,
+            output_path=output_path,
+            export_format=export_format,
+            date_from=date_from,
+            date_to=date_to
+        )
+
+    except (OSError, ValueError) as error:
+        METRICS.emit({'event': 'error', 'stage': 'export', 'message': str(error)})
+        print(error)
+        sys_exit(1)
+
+
+def run_report_file(
+        kind: str,
+        output_path: str,
+        snapshot_path: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        bucket_minutes: int = 60
+) -> None:
+    from src.analytics import ScheduleAnalytics
+
+    store: Union[EmploymentScheduleDTO, ScheduleStore] = load_schedule_store(snapshot_path)
+
+    try:
+        for date in (date_from, date_to):
+            if date is not None:
+                ArgsValidator.validate_date(date)
+
+        # Префиксные суммы строятся один раз, дальше каждая ячейка отчёта считается за O(1)
+        report: Any = ScheduleAnalytics(
+            store=ScheduleIndex(store) if isinstance(store, EmploymentScheduleDTO) else store,
+            date_from=date_from,
+            date_to=date_to
+        ).report(kind, bucket_minutes=bucket_minutes)
+
+    except ValueError as error:
+        METRICS.emit({'event': 'error', 'stage': 'report', 'message': str(error)})
+        print(error)
+        sys_exit(1)
+
+    output_file: TextIO = stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8')
+
+    try:
+        dump(report, output_file, ensure_ascii=False, indent=2)
+        output_file.write('\n')
+
+    finally:
+        if output_file is not stdout:
+            output_file.close()
+
+
+def save_snapshot_file(snapshot_path: str) -> None:
+    save_snapshot(schedule=load_schedule(), file_path=snapshot_path)
@@ -1,16 +1,70 @@
 import sys
 import os
+from typing import List, Optional
 
 # Adding ./src to python path for running from console purpose:
 sys.path.append(os.getcwd())
 
-from src.logic import run
+from src.logic import run, run_batch_file, run_export_file, run_report_file, save_snapshot_file, setup_metrics
+from src.common.metrics import write_prometheus_file
 from src.dto import ProcessorResponse
-from src.common.read_args import get_action
+from src.common.read_args import get_action, parse_cli_args
 
-if __name__ == "__main__":
-    action_id: int = get_action()
 
-    result: ProcessorResponse = run(action_id=action_id)
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_cli_args(argv)
+
+    with setup_metrics(enabled=args.metrics or args.metrics_file is not None, log_path=args.metrics_log):
+        try:
+            if args.serve:
+                # Сервер (asyncio, загрузчик по сети) импортируется только в режиме сервиса
+                from src.server import run_server
+
+                run_server(
+                    host=args.host,
+                    port=args.port,
+                    workers=args.workers,
+                    refresh_interval=args.refresh_interval,
+                    snapshot_path=args.snapshot
+                )
+            elif args.save_snapshot is not None:
+                save_snapshot_file(snapshot_path=args.save_snapshot)
+            elif args.export is not None:
+                run_export_file(
+                    kind=args.export,
+                    output_path=args.output,
+                    export_format=args.export_format,
+                    snapshot_path=args.snapshot,
+                    date_from=args.date_from,
+                    date_to=args.date_to
+                )
+            elif args.report is not None:
+                run_report_file(
+                    kind=args.report,
+                    output_path=args.output,
+                    snapshot_path=args.snapshot,
+                    date_from=args.date_from,
+                    date_to=args.date_to,
+                    bucket_minutes=args.bucket_minutes
+                )
+            elif args.batch is not None:
+                run_batch_file(
+                    input_path=args.batch,
+                    output_path=args.output,
+                    snapshot_path=args.snapshot,
+                    workers=args.workers
+                )
+            else:
+                action_id: int = get_action()
+
+                result: ProcessorResponse = run(action_id=action_id, snapshot_path=args.snapshot)
 
-    print(result.result)
+                print(result.result)
+
+        finally:
+            if args.metrics_file is not None:
+                write_prometheus_file(args.metrics_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,164 @@
-from dataclasses import dataclass
-from typing import Optional, Dict, List
+from array import array
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Iterator, List, Tuple
 
+from src.common.converters import time_to_minutes, minutes_to_time
 
-@dataclass
+
+@dataclass(slots=True)
 class Day:
     id: int
     date: str
     start: str
     end: str
+    start_minutes: int = field(init=False, repr=False, compare=False)
+    end_minutes: int = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        self.start_minutes = time_to_minutes(self.start)
+        self.end_minutes = time_to_minutes(self.end)
 
-@dataclass
+
+@dataclass(slots=True)
 class Timeslot:
     id: int
     day_id: int
     start: str
     end: str
+    start_minutes: int = field(init=False, repr=False, compare=False)
+    end_minutes: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.start_minutes = time_to_minutes(self.start)
+        self.end_minutes = time_to_minutes(self.end)
+
+
+@dataclass(slots=True)
+class WorkingHours:
+    weekday: int  # 0 — понедельник, 6 — воскресенье
+    start: str
+    end: str
+    start_minutes: int = field(init=False, repr=False, compare=False)
+    end_minutes: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.start_minutes = time_to_minutes(self.start)
+        self.end_minutes = time_to_minutes(self.end)
+
+
+@dataclass(slots=True)
+class RecurringBlock:
+    weekdays: List[int]
+    start: str
+    end: str
+    # Повтор раз в N недель, считая от недели date_from блока (или начала расписания)
+    every_weeks: int = 1
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    start_minutes: int = field(init=False, repr=False, compare=False)
+    end_minutes: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.start_minutes = time_to_minutes(self.start)
+        self.end_minutes = time_to_minutes(self.end)
+
+
+@dataclass(slots=True)
+class ScheduleException:
+    date: str
+    # Без start/end дата выходная, иначе рабочие часы этой даты заменяются указанными
+    start: Optional[str] = None
+    end: Optional[str] = None
+
+
+# Легковесное представление строки ColumnarTimeslots, совместимое по атрибутам с Timeslot
+class TimeslotRow:
+    __slots__ = ('id', 'day_id', 'start_minutes', 'end_minutes')
+
+    def __init__(self, id: int, day_id: int, start_minutes: int, end_minutes: int):
+        self.id: int = id
+        self.day_id: int = day_id
+        self.start_minutes: int = start_minutes
+        self.end_minutes: int = end_minutes
+
+    @property
+    def start(self) -> str:
+        return minutes_to_time(self.start_minutes)
+
+    @property
+    def end(self) -> str:
+        return minutes_to_time(self.end_minutes)
+
+    def __repr__(self) -> str:
+        return f"TimeslotRow(id={self.id}, day_id={self.day_id}, start='{self.start}', end='{self.end}')"
+
+
+# Колоночное хранение слотов: параллельные массивы вместо объекта на каждую запись
+class ColumnarTimeslots:
+    __slots__ = ('ids', 'day_ids', 'starts', 'ends')
+
+    def __init__(self) -> None:
+        self.ids: array = array('I')
+        self.day_ids: array = array('I')
+        self.starts: array = array('H')
+        self.ends: array = array('H')
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, position: int) -> TimeslotRow:
+        return TimeslotRow(
+            id=self.ids[position],
+            day_id=self.day_ids[position],
+            start_minutes=self.starts[position],
+            end_minutes=self.ends[position]
+        )
+
+    def __iter__(self) -> Iterator[TimeslotRow]:
+        for position in range(len(self.ids)):
+            yield self[position]
+
+    def copy(self) -> 'ColumnarTimeslots':
+        copied: ColumnarTimeslots = ColumnarTimeslots()
+        copied.ids = self.ids[:]
+        copied.day_ids = self.day_ids[:]
+        copied.starts = self.starts[:]
+        copied.ends = self.ends[:]
+
+        return copied
+
+    def append(self, id: int, day_id: int, start_minutes: int, end_minutes: int) -> None:
+        self.ids.append(id)
+        self.day_ids.append(day_id)
+        self.starts.append(start_minutes)
+        self.ends.append(end_minutes)
+
+    def insert(self, position: int, id: int, day_id: int, start_minutes: int, end_minutes: int) -> None:
+        self.ids.insert(position, id)
+        self.day_ids.insert(position, day_id)
+        self.starts.insert(position, start_minutes)
+        self.ends.insert(position, end_minutes)
+
+    def pop(self, position: int) -> TimeslotRow:
+        row: TimeslotRow = self[position]
+
+        self.ids.pop(position)
+        self.day_ids.pop(position)
+        self.starts.pop(position)
+        self.ends.pop(position)
+
+        return row
+
+    def sort_by_start(self) -> None:
+        order: List[int] = sorted(range(len(self.ids)), key=self.starts.__getitem__)
+
+        self.ids = array('I', (self.ids[position] for position in order))
+        self.day_ids = array('I', (self.day_ids[position] for position in order))
+        self.starts = array('H', (self.starts[position] for position in order))
+        self.ends = array('H', (self.ends[position] for position in order))
+
+    def intervals(self) -> List[Tuple[int, int]]:
+        return list(zip(self.starts, self.ends))
 
 
 @dataclass
@@ -0,0 +1,114 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.common.converters import minutes_to_time
+from src.common.metrics import METRICS, timed
+from src.dto import EmploymentScheduleDTO, NormalizationReport, ScheduleConflict
+from src.index import iter_timeslot_records
+from src.models import Day, Timeslot, ColumnarTimeslots
+
+
+def _append_slot(
+        timeslots: Union[List[Timeslot], ColumnarTimeslots],
+        slot_id: int,
+        day_id: int,
+        start_minutes: int,
+        end_minutes: int
+) -> None:
+    if isinstance(timeslots, ColumnarTimeslots):
+        timeslots.append(id=slot_id, day_id=day_id, start_minutes=start_minutes, end_minutes=end_minutes)
+    else:
+        timeslots.append(
+            Timeslot(id=slot_id, day_id=day_id, start=minutes_to_time(start_minutes), end=minutes_to_time(end_minutes))
+        )
+
+
+def _merge_day(
+        day_id: int,
+        slots: List[Tuple[int, int, int]],
+        timeslots: Union[List[Timeslot], ColumnarTimeslots],
+        report: NormalizationReport
+) -> None:
+    # Пересекающиеся и смежные слоты склеиваются в один с id первого из них;
+    # пересечения (в отличие от простого соседства) попадают в отчёт как конфликты
+    blocks: List[List[Tuple[int, int, int]]] = []
+    block_ends: List[int] = []
+
+    for slot in sorted(slots):
+        if blocks and slot[0] <= block_ends[-1]:
+            blocks[-1].append(slot)
+            block_ends[-1] = max(block_ends[-1], slot[1])
+        else:
+            blocks.append([slot])
+            block_ends.append(slot[1])
+
+    for block, block_end in zip(blocks, block_ends):
+        block_start, running_end, first_id = block[0]
+        overlapping: bool = False
+
+        for start, end, _ in block[1:]:
+            overlapping = overlapping or start < running_end
+            running_end = max(running_end, end)
+
+        _append_slot(timeslots, slot_id=first_id, day_id=day_id, start_minutes=block_start, end_minutes=block_end)
+
+        if overlapping:
+            kind: str = 'duplicate' if len({(start, end) for start, end, _ in block}) == 1 else 'overlap'
+            report.conflicts.append(ScheduleConflict(kind=kind, day_id=day_id, slot_ids=[item[2] for item in block]))
+
+
+@timed('normalize')
+def normalize_schedule(
+        schedule: EmploymentScheduleDTO,
+        columnar: Optional[bool] = None
+) -> Tuple[EmploymentScheduleDTO, NormalizationReport]:
+    days_by_id: Dict[int, Day] = {}
+    report: NormalizationReport = NormalizationReport()
+    slots_by_day: Dict[int, List[Tuple[int, int, int]]] = {}
+
+    # Повтор дня с тем же id — отдельный конфликт: остаётся первая запись, слоты дня склеиваются один раз
+    for record in schedule.days or []:
+        if record.id in days_by_id:
+            report.conflicts.append(ScheduleConflict(kind='duplicate_day', day_id=record.id, slot_ids=[]))
+        else:
+            days_by_id[record.id] = record
+
+    days: List[Day] = list(days_by_id.values())
+
+    for slot_id, day_id, start_minutes, end_minutes in iter_timeslot_records(schedule):
+        report.input_slots += 1
+        day: Optional[Day] = days_by_id.get(day_id)
+
+        if day is None:
+            report.conflicts.append(ScheduleConflict(kind='orphan', day_id=day_id, slot_ids=[slot_id]))
+            continue
+
+        if end_minutes <= start_minutes:
+            report.conflicts.append(ScheduleConflict(kind='empty', day_id=day_id, slot_ids=[slot_id]))
+            continue
+
+        # Занятость за пределами рабочего дня не влияет ни на один запрос, поэтому обрезается
+        clipped_start: int = max(start_minutes, day.start_minutes)
+        clipped_end: int = min(end_minutes, day.end_minutes)
+
+        if clipped_start >= clipped_end:
+            report.conflicts.append(ScheduleConflict(kind='outside', day_id=day_id, slot_ids=[slot_id]))
+            continue
+
+        if (clipped_start, clipped_end) != (start_minutes, end_minutes):
+            report.conflicts.append(ScheduleConflict(kind='clipped', day_id=day_id, slot_ids=[slot_id]))
+
+        slots_by_day.setdefault(day_id, []).append((clipped_start, clipped_end, slot_id))
+
+    if columnar is None:
+        columnar = isinstance(schedule.timeslots, ColumnarTimeslots)
+
+    timeslots: Union[List[Timeslot], ColumnarTimeslots] = ColumnarTimeslots() if columnar else []
+
+    for day in sorted(days, key=lambda item: item.date):
+        _merge_day(day_id=day.id, slots=slots_by_day.get(day.id, []), timeslots=timeslots, report=report)
+
+    report.output_slots = len(timeslots)
+    METRICS.increment('slots_normalized', report.input_slots - report.output_slots)
+    METRICS.increment('schedule_conflicts', len(report.conflicts))
+
+    return EmploymentScheduleDTO(days=days, timeslots=timeslots), report
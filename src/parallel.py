@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+from json import dumps, loads
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TextIO, Tuple, Union
+
+from src.batch import answer_query
+from src.processor import ScheduleProcessor
+from src.snapshot import load_snapshot
+
+# Сотрудник, к которому относятся запросы без поля employee
+DEFAULT_EMPLOYEE: str = ''
+
+# Состояние процесса-воркера: пути к снимкам и процессоры над уже открытыми снимками
+_snapshot_paths: Dict[str, str] = {}
+_processors: Dict[str, ScheduleProcessor] = {}
+
+
+def _init_worker(snapshot_paths: Dict[str, str]) -> None:
+    _snapshot_paths.clear()
+    _snapshot_paths.update(snapshot_paths)
+    _processors.clear()
+
+
+def _resolve_processor(query: Dict[str, Any]) -> ScheduleProcessor:
+    employee_id: str = str(query.get('employee', DEFAULT_EMPLOYEE))
+    processor: Optional[ScheduleProcessor] = _processors.get(employee_id)
+
+    if processor is None:
+        snapshot_path: Optional[str] = _snapshot_paths.get(employee_id)
+        if snapshot_path is None:
+            raise ValueError(f"Сотрудник {employee_id} не найден")
+
+        # Воркер отображает снимок в память: страницы файла общие для всех процессов, расписание не пиклится
+        processor = _processors[employee_id] = ScheduleProcessor(schedule=load_snapshot(snapshot_path))
+
+    return processor
+
+
+def _answer_chunk(chunk: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+    return [
+        (position, dumps(answer_query(line=line, resolve=_resolve_processor), ensure_ascii=False))
+        for position, line in chunk
+    ]
+
+
+def _shard_key(line: str) -> Tuple[str, str]:
+    try:
+        query: Any = loads(line)
+
+    except ValueError:
+        return DEFAULT_EMPLOYEE, ''
+
+    if not isinstance(query, dict):
+        return DEFAULT_EMPLOYEE, ''
+
+    return str(query.get('employee', DEFAULT_EMPLOYEE)), str(query.get('date', query.get('date_from', '')))
+
+
+def run_parallel_batch(
+        snapshot_paths: Union[str, Mapping[str, str]],
+        queries: Iterable[str],
+        output: TextIO,
+        workers: Optional[int] = None,
+        chunk_size: int = 256
+) -> int:
+    if chunk_size < 1:
+        raise ValueError("Размер блока запросов должен быть положительным")
+
+    paths: Dict[str, str] = (
+        {DEFAULT_EMPLOYEE: snapshot_paths} if isinstance(snapshot_paths, str) else dict(snapshot_paths)
+    )
+    lines: List[str] = [line for line in queries if line.strip()]
+
+    # Запросы одного сотрудника и соседних дат попадают в один блок: воркер переиспользует открытый снимок
+    # и кэш дней, а блоки равного размера распределяются по процессам равномерно
+    order: List[int] = sorted(range(len(lines)), key=lambda position: _shard_key(lines[position]))
+    chunks: List[List[Tuple[int, str]]] = [
+        [(position, lines[position]) for position in order[offset:offset + chunk_size]]
+        for offset in range(0, len(order), chunk_size)
+    ]
+    answers: List[str] = [''] * len(lines)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(paths,)) as executor:
+        for chunk_answers in executor.map(_answer_chunk, chunks):
+            for position, answer in chunk_answers:
+                answers[position] = answer
+
+    # Ответы пишутся в порядке входных запросов, независимо от того, какой воркер их посчитал
+    output.writelines(f'{answer}\n' for answer in answers)
+
+    return len(lines)
@@ -1,25 +1,70 @@
-from typing import Any, Dict
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Tuple
 
-from src.dto import EmploymentScheduleDTO
-from src.models import Day, Timeslot
+from src.common.converters import time_to_minutes, minutes_to_time
+from src.common.json_stream import iter_json_arrays, ReadableStream
+from src.common.metrics import timed
+from src.dto import EmploymentScheduleDTO, RecurringScheduleDTO
+from src.models import Day, Timeslot, ColumnarTimeslots, RecurringBlock, ScheduleException, WorkingHours
 
+__all__ = [
+    'employment_schedule_parser',
+    'recurring_schedule_parser',
+    'stream_employment_schedule_parser',
+    'time_to_minutes',
+    'minutes_to_time'
+]
 
-def employment_schedule_parser(data: Dict[str, Any]) -> EmploymentScheduleDTO:
-    result: EmploymentScheduleDTO = EmploymentScheduleDTO()
+SCHEDULE_ARRAY_KEYS: Tuple[str, str] = ('days', 'timeslots')
 
-    result.days = [Day(**day) for day in data['days']]
-    result.timeslots = [Timeslot(**timeslot) for timeslot in data['timeslots']]
 
-    return result
+def _build_schedule(records: Iterable[Tuple[str, Dict[str, Any]]], columnar: bool) -> EmploymentScheduleDTO:
+    days: List[Day] = []
+    timeslots: List[Timeslot] = []
+    columns: ColumnarTimeslots = ColumnarTimeslots()
 
+    # Перевод "ЧЧ:ММ" в минуты происходит один раз, при создании моделей
+    for key, record in records:
+        if key == 'days':
+            days.append(Day(**record))
+        elif columnar:
+            columns.append(
+                id=record['id'],
+                day_id=record['day_id'],
+                start_minutes=time_to_minutes(record['start']),
+                end_minutes=time_to_minutes(record['end'])
+            )
+        else:
+            timeslots.append(Timeslot(**record))
 
-def time_to_minutes(time_str: str) -> int:
-    hours, minutes = map(int, time_str.split(':'))
+    return EmploymentScheduleDTO(days=days, timeslots=columns if columnar else timeslots)
 
-    return hours * 60 + minutes
 
+@timed('parse')
+def employment_schedule_parser(data: Dict[str, Any], columnar: bool = False) -> EmploymentScheduleDTO:
+    records: Iterable[Tuple[str, Dict[str, Any]]] = chain(
+        (('days', day) for day in data['days']),
+        (('timeslots', timeslot) for timeslot in data['timeslots'])
+    )
 
-def minutes_to_time(minutes: int) -> str:
-    hours, mins = divmod(minutes, 60)
+    return _build_schedule(records=records, columnar=columnar)
 
-    return f"{hours:02d}:{mins:02d}"
+
+@timed('parse')
+def stream_employment_schedule_parser(stream: ReadableStream, columnar: bool = False) -> EmploymentScheduleDTO:
+    # Записи читаются из потока по одной, без загрузки всего тела и дерева словарей в память
+    records: Iterable[Tuple[str, Dict[str, Any]]] = iter_json_arrays(stream=stream, keys=SCHEDULE_ARRAY_KEYS)
+
+    return _build_schedule(records=records, columnar=columnar)
+
+
+@timed('parse')
+def recurring_schedule_parser(data: Dict[str, Any]) -> RecurringScheduleDTO:
+    # {"date_from": ..., "date_to": ..., "hours": [...], "blocks": [...], "exceptions": [...]}
+    return RecurringScheduleDTO(
+        date_from=data['date_from'],
+        date_to=data['date_to'],
+        hours=[WorkingHours(**record) for record in data.get('hours', [])],
+        blocks=[RecurringBlock(**record) for record in data.get('blocks', [])],
+        exceptions=[ScheduleException(**record) for record in data.get('exceptions', [])]
+    )
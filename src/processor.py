@@ -1,30 +1,67 @@
 from sys import exit as sys_exit
-from typing import Dict, Any, List, Optional
-
-from src.dto import EmploymentScheduleDTO, ProcessorResponse
+from itertools import islice
+from threading import Lock
+from typing import (
+    Dict, Any, Callable, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+)
+
+from src.availability import DayAvailability, compute_free_intervals
+from src.constants import SCHEDULE_CACHE_SIZE
+from src.dto import EmploymentScheduleDTO, ProcessorResponse, RecurringScheduleDTO
+from src.gaps import GapIndex
+from src.common.lru_cache import LRUCache
+from src.common.metrics import METRICS
 from src.common.validator import ArgsValidator
-from src.models import Timeslot
+from src.index import ScheduleIndex, ScheduleStore
+from src.models import Day
 from src.parsers import time_to_minutes, minutes_to_time
+from src.recurrence import RecurringSchedule
+
+Cached = TypeVar('Cached')
 
 
 class ScheduleProcessor:
-    def __init__(self, action: int, schedule: EmploymentScheduleDTO):
-        self.action: int = action
-        self._schedule: EmploymentScheduleDTO = schedule
+    def __init__(
+            self,
+            action: Optional[int] = None,
+            schedule: Optional[Union[EmploymentScheduleDTO, RecurringScheduleDTO, ScheduleStore]] = None,
+            *,
+            cache_size: int = SCHEDULE_CACHE_SIZE
+    ):
+        # Порядок (action, schedule) сохранён для позиционных вызовов, новые параметры — только по имени
+        if schedule is None:
+            raise TypeError("Не передано расписание для обработки")
+
+        self.action: Optional[int] = action
+        self._index: ScheduleStore
+        if isinstance(schedule, EmploymentScheduleDTO):
+            self._index = ScheduleIndex(schedule)
+        elif isinstance(schedule, RecurringScheduleDTO):
+            # Повторяющиеся правила не материализуются: дни разворачиваются по мере запросов
+            self._index = RecurringSchedule(schedule)
+        else:
+            self._index = schedule
+        # Ключ записи — (вид расчёта, day_id, версия дня): устаревший результат не может быть возвращён
+        self._cache: LRUCache[Any] = LRUCache(max_size=cache_size)
+        self._gaps: Optional[GapIndex] = None
+        self._gaps_lock: Lock = Lock()
+
+        if isinstance(self._index, ScheduleIndex):
+            self._index.add_listener(self._invalidate_day)
 
     def get_response(self) -> ProcessorResponse:
         result: ProcessorResponse = ProcessorResponse()
-        date, day_id = self._correct_date()
+        day: Day = self._correct_date()
 
         match self.action:
             case 1:
-                result.result = self._get_busy_timeslots_for_date(day_id=day_id)
+                result.result = self._get_busy_timeslots_for_date(day_id=day.id)
             case 2:
-                result.result = self._get_free_timeslots_for_date(date=date, day_id=day_id)
+                result.result = self._get_free_timeslots_for_date(day=day)
             case 3:
-                result.result = self._timeslots_interval_access(date=date, day_id=day_id)
+                result.result = self._timeslots_interval_access(day=day)
             case 4:
-                result.result = self._search_available_timeslots_for_duration(date=date, day_id=day_id)
+                result.result = self._search_available_timeslots_for_duration(day=day)
             case _:
                 print("Неизвестный запрос действия!")
                 sys_exit(1)
@@ -35,48 +72,206 @@ class ScheduleProcessor:
 
         return result
 
-    def _get_busy_timeslots_for_date(self, day_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        if day_id is None:
-            day_id = self._correct_date()[1]
+    def get_busy_timeslots(self, date: str) -> List[Dict[str, Any]]:
+        return self._get_busy_timeslots_for_date(day_id=self._find_day(date).id)
 
-        day_timeslots: List[Timeslot] = [
-            timeslot for timeslot in self._schedule.timeslots if timeslot.day_id == day_id  # type: ignore[union-attr]
-        ]
+    def get_free_timeslots(self, date: str) -> List[Dict[str, Any]]:
+        return self._get_free_timeslots_for_date(day=self._find_day(date))
 
-        busy_timeslots: List[Dict[str, Any]] = [
-            {"start": timeslot.start, "end": timeslot.end} for timeslot in day_timeslots
-        ]
+    def is_interval_available(self, date: str, start: str, end: str) -> bool:
+        day: Day = self._find_day(date)
+        ArgsValidator.validate_timeslots_intervals(start=start, end=end)
+
+        return self._is_interval_available(
+            day=day,
+            interval_start=time_to_minutes(start),
+            interval_end=time_to_minutes(end)
+        )
+
+    def are_intervals_available(self, date: str, intervals: Sequence[Tuple[str, str]]) -> List[bool]:
+        day: Day = self._find_day(date)
+
+        for start, end in intervals:
+            ArgsValidator.validate_timeslots_intervals(start=start, end=end)
+
+        return self._day_availability(day).are_available(
+            [(time_to_minutes(start), time_to_minutes(end)) for start, end in intervals]
+        )
+
+    def search_timeslots_for_duration(self, date: str, duration: int) -> List[Dict[str, Any]]:
+        day: Day = self._find_day(date)
+        minutes: int = ArgsValidator.validate_available_timeslots_duration(duration=str(duration))
+
+        return self._render_intervals(self._suitable_intervals_for_day(day=day, minutes=minutes))
+
+    def iter_busy_timeslots_range(self, date_from: str, date_to: str) -> Iterator[Dict[str, Any]]:
+        return self._iter_range(
+            days=self._find_days(date_from=date_from, date_to=date_to),
+            intervals=lambda day: self._busy_intervals(day.id)
+        )
+
+    def iter_free_timeslots_range(self, date_from: str, date_to: str) -> Iterator[Dict[str, Any]]:
+        return self._iter_range(
+            days=self._find_days(date_from=date_from, date_to=date_to),
+            intervals=self._free_intervals_for_day
+        )
+
+    def iter_timeslots_for_duration_range(
+            self,
+            date_from: str,
+            date_to: str,
+            duration: int
+    ) -> Iterator[Dict[str, Any]]:
+        self._validate_range(date_from=date_from, date_to=date_to)
+        minutes: int = ArgsValidator.validate_available_timeslots_duration(duration=str(duration))
+
+        if isinstance(self._index, RecurringSchedule):
+            # Дерево максимумов строится по всем дням сразу, а у правил это весь горизонт: дни диапазона
+            # разворачиваются по одному
+            return self._iter_range(
+                days=self._index.iter_days(date_from=date_from, date_to=date_to),
+                intervals=lambda day: self._suitable_intervals_for_day(day=day, minutes=minutes)
+            )
+
+        # Дерево максимумов по дням сразу пропускает дни, где нет окна нужной длины
+        gaps: GapIndex = self._gap_index()
+
+        return self._iter_range(
+            days=gaps.iter_days_fitting(duration=minutes, date_from=date_from, date_to=date_to),
+            intervals=lambda day: gaps.get_day_gaps(day.id).fitting(minutes)  # type: ignore[union-attr]
+        )
+
+    def find_earliest_timeslot_for_duration(
+            self,
+            duration: int,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        self._validate_range(date_from=date_from, date_to=date_to)
+        minutes: int = ArgsValidator.validate_available_timeslots_duration(duration=str(duration))
+
+        found: Optional[Tuple[Day, int, int]] = (
+            self._earliest_in_days(self._index.iter_days(date_from=date_from, date_to=date_to), minutes=minutes)
+            if isinstance(self._index, RecurringSchedule)
+            else self._gap_index().earliest_slot(duration=minutes, date_from=date_from, date_to=date_to)
+        )
+        if found is None:
+            return None
+
+        day, start, end = found
+
+        return {"date": day.date, "start": minutes_to_time(start), "end": minutes_to_time(end)}
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    @staticmethod
+    def take(timeslots: Iterator[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Генераторы ленивые: при заданном лимите обход дней прекращается после N-го совпадения
+        return list(islice(timeslots, limit))
+
+    @staticmethod
+    def _iter_range(days: Iterable[Day], intervals: Callable[[Day], List[Tuple[int, int]]]) -> Iterator[Dict[str, Any]]:
+        for day in days:
+            for start, end in intervals(day):
+                yield {"date": day.date, "start": minutes_to_time(start), "end": minutes_to_time(end)}
+
+    @staticmethod
+    def _validate_range(date_from: Optional[str], date_to: Optional[str]) -> None:
+        for date in (date_from, date_to):
+            if date is not None:
+                ArgsValidator.validate_date(date)
 
-        return sorted(busy_timeslots, key=lambda timeslot: time_to_minutes(time_str=timeslot["start"]))
+        if date_from is not None and date_to is not None and date_from > date_to:
+            raise ValueError("Начальная дата диапазона не может быть больше конечной")
 
-    def _get_free_timeslots_for_date(self, date: str, day_id: int) -> List[Dict[str, Any]]:
-        found_day = next(day for day in self._schedule.days if day.date == date)  # type: ignore[union-attr]
-        busy_timeslots: List[Dict[str, Any]] = self._get_busy_timeslots_for_date(day_id)
+    def _find_days(self, date_from: str, date_to: str) -> List[Day]:
+        self._validate_range(date_from=date_from, date_to=date_to)
 
-        free_slots: List[Dict[str, Any]] = []
-        current_start: int = time_to_minutes(found_day.start)  # Начало рабочего дня
+        return self._index.get_days(date_from=date_from, date_to=date_to)
 
-        for slot in busy_timeslots:
-            slot_start: int = time_to_minutes(slot['start'])
-            slot_end: int = time_to_minutes(slot['end'])
+    def _invalidate_day(self, day_id: int) -> None:
+        # Записи старой версии и так не совпадут по ключу, но освобождаем место под актуальные
+        self._cache.invalidate(lambda key: key[1] == day_id)  # type: ignore[index]
 
-            if current_start < slot_start:
-                free_slots.append({
-                    "start": minutes_to_time(current_start),
-                    "end": minutes_to_time(slot_start)
-                })
+    def _cached(self, kind: str, day_id: int, compute: Callable[[], Cached]) -> Cached:
+        version: int = self._index.get_day_version(day_id) if isinstance(self._index, ScheduleIndex) else 0
+        key: Hashable = (kind, day_id, version)
 
-            current_start = max(current_start, slot_end)
+        return self._cache.get_or_compute(key, compute)
 
-        if current_start < time_to_minutes(found_day.end):
-            free_slots.append({
-                "start": minutes_to_time(current_start),
-                "end": found_day.end
-            })
+    def _earliest_in_days(self, days: Iterable[Day], minutes: int) -> Optional[Tuple[Day, int, int]]:
+        for day in days:
+            intervals: List[Tuple[int, int]] = self._suitable_intervals_for_day(day=day, minutes=minutes)
 
-        return free_slots
+            if intervals:
+                return day, intervals[0][0], intervals[0][1]
 
-    def _timeslots_interval_access(self, date: str, day_id: int) -> str:
+        return None
+
+    def _gap_index(self) -> GapIndex:
+        # Строится при первом запросе по продолжительности и дальше обновляется по дням через подписку
+        # (под блокировкой, чтобы параллельные запросы не построили и не подписали второй индекс)
+        if self._gaps is None:
+            with self._gaps_lock:
+                if self._gaps is None:
+                    self._gaps = GapIndex(self._index)
+
+        return self._gaps
+
+    def _find_day(self, date: str) -> Day:
+        ArgsValidator.validate_date(date)
+
+        found_day: Optional[Day] = self._index.get_day(date)
+        if found_day is None:
+            raise ValueError(f"Дата {date} не найдена в расписании.")
+
+        return found_day
+
+    @staticmethod
+    def _render_intervals(intervals: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        return [{"start": minutes_to_time(start), "end": minutes_to_time(end)} for start, end in intervals]
+
+    def _busy_intervals(self, day_id: int) -> List[Tuple[int, int]]:
+        return self._cached('busy', day_id, lambda: self._load_intervals(day_id))
+
+    def _load_intervals(self, day_id: int) -> List[Tuple[int, int]]:
+        intervals: List[Tuple[int, int]] = self._index.get_intervals(day_id)
+        METRICS.increment('slots_scanned', len(intervals))
+
+        return intervals
+
+    def _free_intervals_for_day(self, found_day: Day) -> List[Tuple[int, int]]:
+        return self._cached(
+            'free',
+            found_day.id,
+            lambda: compute_free_intervals(found_day, self._busy_intervals(found_day.id))
+        )
+
+    def _day_availability(self, day: Day) -> DayAvailability:
+        # Индекс доступности строится один раз на версию дня и дальше отвечает за O(log n)
+        return self._cached('availability', day.id, lambda: DayAvailability(day, self._busy_intervals(day.id)))
+
+    def _is_interval_available(self, day: Day, interval_start: int, interval_end: int) -> bool:
+        return self._day_availability(day).is_available(interval_start, interval_end)
+
+    def _suitable_intervals_for_day(self, day: Day, minutes: int) -> List[Tuple[int, int]]:
+        return [
+            (slot_start, slot_end)
+            for slot_start, slot_end in self._free_intervals_for_day(day)
+            if (slot_end - slot_start) >= minutes
+        ]
+
+    def _get_busy_timeslots_for_date(self, day_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        if day_id is None:
+            day_id = self._correct_date().id
+
+        return self._render_intervals(self._busy_intervals(day_id))
+
+    def _get_free_timeslots_for_date(self, day: Day) -> List[Dict[str, Any]]:
+        return self._render_intervals(self._free_intervals_for_day(day))
+
+    def _timeslots_interval_access(self, day: Day) -> str:
         print(
             "Введите начало и конец нужного временного промежутка в виде ЧЧ:ММ (ЧАСЫ:МИНУТЫ)\n"
             "Пример: Начало: 15:30 ; Конец: 16:45\n"
@@ -89,21 +284,19 @@ class ScheduleProcessor:
             try:
                 ArgsValidator.validate_timeslots_intervals(start=start_interval, end=end_interval)
 
-                free_slots: List[Dict[str, Any]] = self._get_free_timeslots_for_date(date, day_id)
-
-                for slot in free_slots:
-                    slot_start: int = time_to_minutes(slot['start'])
-                    slot_end: int = time_to_minutes(slot['end'])
-
-                    if slot_start <= time_to_minutes(start_interval) and time_to_minutes(end_interval) <= slot_end:
-                        return "Данный промежуток для заданной даты доступен"
+                if self._is_interval_available(
+                    day=day,
+                    interval_start=time_to_minutes(start_interval),
+                    interval_end=time_to_minutes(end_interval)
+                ):
+                    return "Данный промежуток для заданной даты доступен"
 
                 return "Промежуток для заданной даты недоступен"
 
             except Exception as error:
                 print(error)
 
-    def _search_available_timeslots_for_duration(self, date: str, day_id: int):
+    def _search_available_timeslots_for_duration(self, day: Day):
         print(
             "Необходимо ввести продолжительность заявки в минутах\n"
             "Предупреждение!\n"
@@ -115,41 +308,32 @@ class ScheduleProcessor:
 
             try:
                 minutes: int = ArgsValidator.validate_available_timeslots_duration(duration=duration)
-                free_slots: List[Dict[str, Any]] = self._get_free_timeslots_for_date(date, day_id)
-
-                suitable_slots: List[Dict[str, Any]] = []
-
-                for slot in free_slots:
-                    slot_start: int = time_to_minutes(slot['start'])
-                    slot_end: int = time_to_minutes(slot['end'])
-
-                    if (slot_end - slot_start) >= minutes:
-                        suitable_slots.append(slot)
+                suitable_intervals: List[Tuple[int, int]] = self._suitable_intervals_for_day(
+                    day=day,
+                    minutes=minutes
+                )
 
-                if not suitable_slots:
+                if not suitable_intervals:
                     return "Для заданной продолжительности заявки на указанную дату нет доступных промежутков"
 
-                return suitable_slots
+                return self._render_intervals(suitable_intervals)
 
             except Exception as error:
                 print(error)
 
-    def _correct_date(self) -> List[Any]:
+    def _correct_date(self) -> Day:
         while True:
             date: str = input("Введите дату в формате ГГГГ-ММ-ДД: ")
 
             try:
                 ArgsValidator.validate_date(date)
 
-                found_day = next(
-                    (day for day in self._schedule.days if day.date == date),  # type: ignore[union-attr]
-                    None
-                )
+                found_day: Optional[Day] = self._index.get_day(date)
                 if found_day is None:
                     print(f"Дата {date} не найдена в расписании.")
                     sys_exit(1)
 
-                return [date, found_day.id]
+                return found_day
 
             except ValueError as error:
                 print(error)
@@ -0,0 +1,141 @@
+from datetime import date as date_type, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.common.converters import minutes_to_time, time_to_minutes
+from src.common.lru_cache import LRUCache
+from src.constants import RECURRENCE_CACHE_SIZE
+from src.dto import RecurringScheduleDTO
+from src.models import Day, RecurringBlock, ScheduleException, TimeslotRow
+
+# Развёрнутый день: рабочий день и отсортированные занятые промежутки или None для выходного
+ExpandedDay = Optional[Tuple[Day, List[Tuple[int, int]]]]
+
+
+def _week_number(value: date_type) -> int:
+    # Номер недели с понедельника: одинаков для всех дней одной календарной недели
+    return (value.toordinal() - value.weekday()) // 7
+
+
+def _parse_date(value: str) -> date_type:
+    try:
+        return date_type.fromisoformat(value)
+
+    except ValueError:
+        raise ValueError(f"Некорректная дата {value} в повторяющемся расписании")
+
+
+class RecurringSchedule:
+    def __init__(self, schedule: RecurringScheduleDTO, cache_size: int = RECURRENCE_CACHE_SIZE):
+        self.date_from: date_type = _parse_date(schedule.date_from)
+        self.date_to: date_type = _parse_date(schedule.date_to)
+
+        if self.date_from > self.date_to:
+            raise ValueError("Начальная дата расписания не может быть больше конечной")
+
+        self._hours: Dict[int, Tuple[int, int]] = {}
+        for hours in schedule.hours:
+            if not 0 <= hours.weekday <= 6:
+                raise ValueError(f"Некорректный день недели {hours.weekday}, ожидается число от 0 до 6")
+            if hours.start_minutes >= hours.end_minutes:
+                raise ValueError("Начало рабочего дня не может быть >= его концу")
+
+            self._hours[hours.weekday] = (hours.start_minutes, hours.end_minutes)
+
+        for block in schedule.blocks:
+            if block.every_weeks < 1 or not set(block.weekdays) <= set(range(7)):
+                raise ValueError("Некорректное правило повторения занятого промежутка")
+            if block.start_minutes >= block.end_minutes:
+                raise ValueError("Начало промежутка не может быть >= его концу")
+
+        # Границы действия и неделя отсчёта каждого блока разбираются один раз, а не на каждый день
+        self._blocks: List[Tuple[RecurringBlock, date_type, date_type, int]] = []
+        for block in schedule.blocks:
+            block_from: date_type = _parse_date(block.date_from) if block.date_from else self.date_from
+            block_to: date_type = _parse_date(block.date_to) if block.date_to else self.date_to
+            self._blocks.append((block, block_from, block_to, _week_number(block_from)))
+
+        self._exceptions: Dict[str, ScheduleException] = {
+            exception.date: exception for exception in schedule.exceptions
+        }
+        # Дни разворачиваются по запросу, недавно развёрнутые держатся в небольшом кэше
+        self._cache: LRUCache[ExpandedDay] = LRUCache(max_size=cache_size)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    def get_day(self, date: str) -> Optional[Day]:
+        try:
+            day_date: date_type = date_type.fromisoformat(date)
+
+        except ValueError:
+            return None
+
+        expanded: ExpandedDay = self._expanded(day_date)
+
+        return expanded[0] if expanded is not None else None
+
+    def get_day_by_id(self, day_id: int) -> Optional[Day]:
+        expanded: ExpandedDay = self._expanded(date_type.fromordinal(day_id)) if day_id > 0 else None
+
+        return expanded[0] if expanded is not None else None
+
+    def get_days(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Day]:
+        return list(self.iter_days(date_from=date_from, date_to=date_to))
+
+    def iter_days(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Iterator[Day]:
+        # Перебираются только дни запрошенного диапазона и только пока их запрашивают, а не весь горизонт
+        first: date_type = max(self.date_from, _parse_date(date_from)) if date_from else self.date_from
+        last: date_type = min(self.date_to, _parse_date(date_to)) if date_to else self.date_to
+
+        for offset in range((last - first).days + 1):
+            expanded: ExpandedDay = self._expanded(first + timedelta(days=offset))
+
+            if expanded is not None:
+                yield expanded[0]
+
+    def get_timeslots(self, day_id: int) -> List[TimeslotRow]:
+        return [
+            TimeslotRow(id=day_id * len(self._blocks) + position, day_id=day_id, start_minutes=start, end_minutes=end)
+            for position, (start, end) in enumerate(self.get_intervals(day_id))
+        ]
+
+    def get_intervals(self, day_id: int) -> List[Tuple[int, int]]:
+        expanded: ExpandedDay = self._expanded(date_type.fromordinal(day_id)) if day_id > 0 else None
+
+        return list(expanded[1]) if expanded is not None else []
+
+    def _expanded(self, day_date: date_type) -> ExpandedDay:
+        if not self.date_from <= day_date <= self.date_to:
+            return None
+
+        return self._cache.get_or_compute(day_date.toordinal(), lambda: self._expand(day_date))
+
+    def _expand(self, day_date: date_type) -> ExpandedDay:
+        iso_date: str = day_date.isoformat()
+        hours: Optional[Tuple[int, int]] = self._hours.get(day_date.weekday())
+        exception: Optional[ScheduleException] = self._exceptions.get(iso_date)
+
+        if exception is not None:
+            hours = None
+            if exception.start is not None and exception.end is not None:
+                hours = (time_to_minutes(exception.start), time_to_minutes(exception.end))
+
+        if hours is None:
+            return None
+
+        week: int = _week_number(day_date)
+        intervals: List[Tuple[int, int]] = sorted(
+            (block.start_minutes, block.end_minutes)
+            for block, block_from, block_to, anchor_week in self._blocks
+            if block_from <= day_date <= block_to
+            and day_date.weekday() in block.weekdays
+            and (week - anchor_week) % block.every_weeks == 0
+        )
+        day: Day = Day(
+            id=day_date.toordinal(),
+            date=iso_date,
+            start=minutes_to_time(hours[0]),
+            end=minutes_to_time(hours[1])
+        )
+
+        return day, intervals
@@ -0,0 +1,321 @@
+import asyncio
+import os
+from http import HTTPStatus
+from json import dumps
+from signal import SIGTERM
+from socket import socket, create_server
+from tempfile import gettempdir
+from threading import Lock
+from time import sleep
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from src.batch import execute_query
+from src.common.metrics import METRICS, render_prometheus
+from src.constants import EMPLOYMENT_SCHEDULE_URL
+from src.dto import EmploymentScheduleDTO, ScheduleResponse
+from src.index import ScheduleStore
+from src.processor import ScheduleProcessor
+from src.snapshot import SnapshotIndex, load_snapshot, save_snapshot
+
+ScheduleLoader = Callable[[], Union[EmploymentScheduleDTO, ScheduleStore]]
+
+ENDPOINT_ACTIONS: Dict[str, int] = {
+    '/busy': 1,
+    '/free': 2,
+    '/interval': 3,
+    '/duration': 4
+}
+
+
+def fetch_loader(url: str = EMPLOYMENT_SCHEDULE_URL) -> ScheduleLoader:
+    from src.fetcher import ScheduleFetcher
+
+    fetcher: ScheduleFetcher = ScheduleFetcher(url=url)
+
+    def load() -> EmploymentScheduleDTO:
+        response: ScheduleResponse = fetcher.fetch()
+
+        if response.error:
+            raise RuntimeError(response.error)
+
+        assert response.result is not None
+
+        return response.result
+
+    return load
+
+
+def snapshot_loader(snapshot_path: str) -> ScheduleLoader:
+    return lambda: load_snapshot(snapshot_path)
+
+
+class _Generation:
+    # Расписание одного обновления: снимок закрывается, когда его заменило новое и последний запрос завершился
+    __slots__ = ('processor', 'store', 'readers', 'retired')
+
+    def __init__(self, processor: ScheduleProcessor, store: Optional[SnapshotIndex]):
+        self.processor: ScheduleProcessor = processor
+        self.store: Optional[SnapshotIndex] = store
+        self.readers: int = 0
+        self.retired: bool = False
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+
+class ScheduleService:
+    def __init__(self, loader: ScheduleLoader, refresh_interval: Optional[float] = None):
+        self._loader: ScheduleLoader = loader
+        self.refresh_interval: Optional[float] = refresh_interval
+        self._generation: Optional[_Generation] = None
+        self._generation_lock: Lock = Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _build_generation(self) -> _Generation:
+        schedule: Union[EmploymentScheduleDTO, ScheduleStore] = self._loader()
+
+        return _Generation(
+            processor=ScheduleProcessor(schedule=schedule),
+            store=schedule if isinstance(schedule, SnapshotIndex) else None
+        )
+
+    def _swap(self, generation: Optional[_Generation]) -> None:
+        with self._generation_lock:
+            previous: Optional[_Generation] = self._generation
+            self._generation = generation
+
+            if previous is None:
+                return
+
+            previous.retired = True
+            unused: bool = not previous.readers
+
+        # Снимок с запросами в работе закроет последний из них в _release
+        if unused:
+            previous.close()
+
+    def _acquire(self) -> Optional[_Generation]:
+        with self._generation_lock:
+            generation: Optional[_Generation] = self._generation
+            if generation is not None:
+                generation.readers += 1
+
+            return generation
+
+    def _release(self, generation: _Generation) -> None:
+        with self._generation_lock:
+            generation.readers -= 1
+            unused: bool = generation.retired and not generation.readers
+
+        if unused:
+            generation.close()
+
+    async def refresh(self) -> None:
+        # Загрузка и построение индекса идут в отдельном потоке, запросы обслуживаются старым расписанием
+        self._swap(await asyncio.to_thread(self._build_generation))
+
+    async def _refresh_loop(self) -> None:
+        assert self.refresh_interval is not None
+
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+
+            try:
+                await self.refresh()
+
+            except Exception as error:
+                print(f"Не удалось обновить расписание: {error}")
+
+    async def start(self) -> None:
+        await self.refresh()
+
+        if self.refresh_interval:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+        self._swap(None)
+
+    def handle(self, method: str, target: str) -> Tuple[int, Union[Dict[str, Any], str]]:
+        METRICS.increment('http_requests')
+
+        if method != 'GET':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Поддерживается только метод GET"}
+
+        url = urlsplit(target)
+
+        if url.path == '/health':
+            return HTTPStatus.OK, {'result': self._generation is not None}
+
+        if url.path == '/metrics':
+            # Текстовый формат Prometheus; при нескольких воркерах у каждого процесса свои метрики
+            return HTTPStatus.OK, render_prometheus()
+
+        action: Optional[int] = ENDPOINT_ACTIONS.get(url.path)
+        if action is None:
+            return HTTPStatus.NOT_FOUND, {'error': f"Неизвестный адрес {url.path}"}
+
+        generation: Optional[_Generation] = self._acquire()
+        if generation is None:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': "Расписание ещё не загружено"}
+
+        query: Dict[str, Any] = dict(parse_qsl(url.query))
+        query['action'] = action
+
+        try:
+            return HTTPStatus.OK, {'result': execute_query(processor=generation.processor, query=query)}
+
+        except KeyError as error:
+            return HTTPStatus.BAD_REQUEST, {'error': f"В запросе отсутствует поле {error}"}
+
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, {'error': str(error)}
+
+        finally:
+            self._release(generation)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line: bytes = await reader.readline()
+                if not request_line:
+                    break
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line: bytes = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                content_length: int = int(headers.get('content-length') or 0)
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                parts: List[str] = request_line.decode('latin-1').split()
+                keep_alive: bool = False
+
+                if len(parts) == 3:
+                    method, target, version = parts
+                    status, body = self.handle(method=method, target=target)
+                    connection: str = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                else:
+                    status, body = HTTPStatus.BAD_REQUEST, {'error': "Некорректный HTTP-запрос"}
+
+                if isinstance(body, str):
+                    payload: bytes = body.encode()
+                    content_type: str = 'text/plain; version=0.0.4; charset=utf-8'
+                else:
+                    payload = dumps(body, ensure_ascii=False).encode()
+                    content_type = 'application/json; charset=utf-8'
+
+                writer.write(
+                    f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode('latin-1') + payload
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+
+        finally:
+            writer.close()
+
+
+async def serve(service: ScheduleService, sock: Optional[socket] = None, host: str = '', port: int = 0) -> None:
+    await service.start()
+
+    if sock is not None:
+        server = await asyncio.start_server(service.handle_connection, sock=sock)
+    else:
+        server = await asyncio.start_server(service.handle_connection, host=host, port=port)
+
+    try:
+        async with server:
+            await server.serve_forever()
+
+    finally:
+        await service.stop()
+
+
+def run_server(
+        host: str,
+        port: int,
+        workers: int = 1,
+        refresh_interval: Optional[float] = None,
+        snapshot_path: Optional[str] = None,
+        url: str = EMPLOYMENT_SCHEDULE_URL
+) -> None:
+    if workers <= 1:
+        loader: ScheduleLoader = snapshot_loader(snapshot_path) if snapshot_path else fetch_loader(url)
+        asyncio.run(serve(ScheduleService(loader=loader, refresh_interval=refresh_interval), host=host, port=port))
+        return
+
+    if not hasattr(os, 'fork'):
+        raise ValueError("Несколько воркеров поддерживаются только на системах с fork()")
+
+    # Родитель публикует снимок, воркеры отображают его в память только на чтение.
+    # Если снимок передан явно, он считается источником расписания и обновляется извне
+    refresh_loader: Optional[ScheduleLoader] = None
+
+    if snapshot_path is None:
+        refresh_loader = fetch_loader(url)
+        snapshot_path = os.path.join(gettempdir(), f'schedule_service_{os.getpid()}.snapshot')
+        save_snapshot(schedule=refresh_loader(), file_path=snapshot_path)
+
+    listener: socket = create_server((host, port))
+    pids: List[int] = []
+
+    for _ in range(workers):
+        pid: int = os.fork()
+
+        if pid == 0:
+            service: ScheduleService = ScheduleService(
+                loader=snapshot_loader(snapshot_path),
+                refresh_interval=refresh_interval
+            )
+            try:
+                asyncio.run(serve(service, sock=listener))
+            finally:
+                os._exit(0)
+
+        pids.append(pid)
+
+    listener.close()
+
+    try:
+        while refresh_interval and refresh_loader is not None:
+            sleep(refresh_interval)
+
+            try:
+                save_snapshot(schedule=refresh_loader(), file_path=snapshot_path)
+
+            except Exception as error:
+                print(f"Не удалось обновить расписание: {error}")
+
+        for pid in pids:
+            os.waitpid(pid, 0)
+
+    finally:
+        for pid in pids:
+            try:
+                os.kill(pid, SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        if refresh_loader is not None and os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
@@ -0,0 +1,185 @@
+from mmap import mmap, ACCESS_READ
+from os import replace
+from struct import Struct
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+from src.common.converters import minutes_to_time
+from src.common.metrics import timed
+from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex, ScheduleStore
+from src.models import Day, TimeslotRow
+
+SNAPSHOT_MAGIC: bytes = b'SCHD'
+SNAPSHOT_VERSION: int = 2
+
+# Заголовок: магия, версия, количество дней, количество слотов
+HEADER: Struct = Struct('<4sHII')
+# Запись дня: id, дата ГГГГ-ММ-ДД, начало и конец в минутах, смещение и количество его слотов
+DAY_RECORD: Struct = Struct('<I10sHHII')
+# Запись индекса по id: id дня и позиция его записи; записи отсортированы по id
+ID_RECORD: Struct = Struct('<II')
+# Запись слота: id, начало и конец в минутах (day_id задаётся записью дня)
+SLOT_RECORD: Struct = Struct('<IHH')
+
+
+def save_snapshot(schedule: Union[EmploymentScheduleDTO, ScheduleStore], file_path: str) -> None:
+    store: ScheduleStore = ScheduleIndex(schedule) if isinstance(schedule, EmploymentScheduleDTO) else schedule
+    days: List[Day] = store.get_days()
+
+    slots_offset: int = 0
+    day_records: List[bytes] = []
+
+    for day in days:
+        date: bytes = day.date.encode('ascii')
+        if len(date) != 10:
+            raise ValueError(f"Некорректный формат даты {day.date} для снимка расписания")
+
+        slots_count: int = len(store.get_intervals(day.id))
+        day_records.append(
+            DAY_RECORD.pack(day.id, date, day.start_minutes, day.end_minutes, slots_offset, slots_count)
+        )
+        slots_offset += slots_count
+
+    with open(f'{file_path}.tmp', 'wb') as snapshot_file:
+        snapshot_file.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(days), slots_offset))
+        snapshot_file.writelines(day_records)
+        snapshot_file.writelines(
+            ID_RECORD.pack(day_id, position)
+            for day_id, position in sorted((day.id, position) for position, day in enumerate(days))
+        )
+
+        for day in days:
+            snapshot_file.writelines(
+                SLOT_RECORD.pack(row.id, row.start_minutes, row.end_minutes) for row in store.get_timeslots(day.id)
+            )
+
+    replace(f'{file_path}.tmp', file_path)
+
+
+class SnapshotIndex:
+    def __init__(self, file_path: str):
+        self._file: BinaryIO = open(file_path, 'rb')
+
+        try:
+            self._buffer: mmap = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Снимок расписания {file_path} пуст")
+
+        if len(self._buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f"Некорректный снимок расписания {file_path}")
+
+        magic, version, self._days_count, self._slots_count = HEADER.unpack_from(self._buffer, 0)
+
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"Некорректный снимок расписания {file_path}")
+
+        self._days_offset: int = HEADER.size
+        self._ids_offset: int = self._days_offset + self._days_count * DAY_RECORD.size
+        self._slots_offset: int = self._ids_offset + self._days_count * ID_RECORD.size
+
+        if len(self._buffer) < self._slots_offset + self._slots_count * SLOT_RECORD.size:
+            self.close()
+            raise ValueError(f"Некорректный снимок расписания {file_path}")
+
+    def close(self) -> None:
+        if not self._buffer.closed:
+            self._buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> 'SnapshotIndex':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _read_day(self, position: int) -> Tuple[int, bytes, int, int, int, int]:
+        return DAY_RECORD.unpack_from(self._buffer, self._days_offset + position * DAY_RECORD.size)
+
+    def _make_day(self, position: int) -> Day:
+        day_id, date, start_minutes, end_minutes, _, _ = self._read_day(position)
+
+        return Day(
+            id=day_id,
+            date=date.decode('ascii'),
+            start=minutes_to_time(start_minutes),
+            end=minutes_to_time(end_minutes)
+        )
+
+    def _find_position(self, day_id: int) -> Optional[int]:
+        # Бинарный поиск по индексу id: читается O(log n) записей индекса, а не вся таблица дней
+        lo, hi = 0, self._days_count
+
+        while lo < hi:
+            middle: int = (lo + hi) // 2
+            current_id, position = ID_RECORD.unpack_from(self._buffer, self._ids_offset + middle * ID_RECORD.size)
+
+            if current_id == day_id:
+                return position
+            if current_id < day_id:
+                lo = middle + 1
+            else:
+                hi = middle
+
+        return None
+
+    def _read_slots(self, day_id: int) -> List[Tuple[int, int, int]]:
+        position: Optional[int] = self._find_position(day_id)
+        if position is None:
+            return []
+
+        _, _, _, _, slots_offset, slots_count = self._read_day(position)
+        start: int = self._slots_offset + slots_offset * SLOT_RECORD.size
+
+        return list(SLOT_RECORD.iter_unpack(self._buffer[start:start + slots_count * SLOT_RECORD.size]))
+
+    def _bisect(self, date: str, right: bool = False) -> int:
+        # Дни записаны отсортированными по дате: бинарный поиск прямо по отображённому файлу
+        target: bytes = date.encode('ascii', errors='replace')
+        lo, hi = 0, self._days_count
+
+        while lo < hi:
+            middle: int = (lo + hi) // 2
+            current: bytes = self._read_day(middle)[1]
+
+            if current < target or (right and current == target):
+                lo = middle + 1
+            else:
+                hi = middle
+
+        return lo
+
+    def get_day(self, date: str) -> Optional[Day]:
+        position: int = self._bisect(date)
+
+        if position < self._days_count and self._read_day(position)[1] == date.encode('ascii', errors='replace'):
+            return self._make_day(position)
+
+        return None
+
+    def get_day_by_id(self, day_id: int) -> Optional[Day]:
+        position: Optional[int] = self._find_position(day_id)
+
+        return self._make_day(position) if position is not None else None
+
+    def get_days(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Day]:
+        lo: int = 0 if date_from is None else self._bisect(date_from)
+        hi: int = self._days_count if date_to is None else self._bisect(date_to, right=True)
+
+        return [self._make_day(position) for position in range(lo, hi)]
+
+    def get_timeslots(self, day_id: int) -> List[TimeslotRow]:
+        return [
+            TimeslotRow(id=slot_id, day_id=day_id, start_minutes=start_minutes, end_minutes=end_minutes)
+            for slot_id, start_minutes, end_minutes in self._read_slots(day_id)
+        ]
+
+    def get_intervals(self, day_id: int) -> List[Tuple[int, int]]:
+        return [(start_minutes, end_minutes) for _, start_minutes, end_minutes in self._read_slots(day_id)]
+
+
+@timed('snapshot_load')
+def load_snapshot(file_path: str) -> SnapshotIndex:
+    return SnapshotIndex(file_path)
@@ -0,0 +1,161 @@
+from json import loads
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot, TimeslotRow
+
+
+def _apply_day_change(index: ScheduleIndex, operation: str, record: Dict[str, Any]) -> None:
+    match operation:
+        case 'add':
+            index.add_day(Day(**record))
+        case 'modify':
+            index.modify_day(Day(**record))
+        case 'remove':
+            index.remove_day(day_id=record['id'])
+        case _:
+            raise ValueError(f"Неизвестная операция изменения {operation}")
+
+
+def _apply_timeslot_change(index: ScheduleIndex, operation: str, record: Dict[str, Any]) -> None:
+    match operation:
+        case 'add':
+            timeslot: Timeslot = Timeslot(**record)
+            index.add_timeslot(
+                slot_id=timeslot.id,
+                day_id=timeslot.day_id,
+                start_minutes=timeslot.start_minutes,
+                end_minutes=timeslot.end_minutes
+            )
+        case 'modify':
+            timeslot = Timeslot(**record)
+            index.modify_timeslot(
+                slot_id=timeslot.id,
+                day_id=timeslot.day_id,
+                start_minutes=timeslot.start_minutes,
+                end_minutes=timeslot.end_minutes
+            )
+        case 'remove':
+            day_id: Optional[int] = record.get('day_id')
+            index.remove_timeslot(
+                day_id=day_id if day_id is not None else index.find_timeslot_day(record['id']),
+                slot_id=record['id']
+            )
+        case _:
+            raise ValueError(f"Неизвестная операция изменения {operation}")
+
+
+def apply_change(index: ScheduleIndex, event: Dict[str, Any]) -> None:
+    # Событие: {"op": "add" | "modify" | "remove", "entity": "day" | "timeslot", "record": {...}}
+    match event.get('entity'):
+        case 'day':
+            _apply_day_change(index=index, operation=event['op'], record=event['record'])
+        case 'timeslot':
+            _apply_timeslot_change(index=index, operation=event['op'], record=event['record'])
+        case _:
+            raise ValueError(f"Неизвестный тип изменяемой записи {event.get('entity')}")
+
+
+def apply_changes(index: ScheduleIndex, events: Iterable[Dict[str, Any]]) -> int:
+    applied: int = 0
+
+    for event in events:
+        apply_change(index=index, event=event)
+        applied += 1
+
+    return applied
+
+
+def apply_change_stream(index: ScheduleIndex, lines: Iterable[str]) -> int:
+    return apply_changes(index=index, events=(loads(line) for line in lines if line.strip()))
+
+
+def _find_timeslot(index: ScheduleIndex, slot_id: Any, day_id: Optional[int] = None) -> Optional[TimeslotRow]:
+    if day_id is None:
+        try:
+            day_id = index.find_timeslot_day(slot_id)
+
+        except ValueError:
+            return None
+
+    return next((row for row in index.get_timeslots(day_id) if row.id == slot_id), None)
+
+
+def _restore_timeslot(index: ScheduleIndex, row: Optional[TimeslotRow], moved: bool = False) -> None:
+    assert row is not None
+
+    restore: Callable[..., None] = index.modify_timeslot if moved else index.add_timeslot
+    restore(slot_id=row.id, day_id=row.day_id, start_minutes=row.start_minutes, end_minutes=row.end_minutes)
+
+
+def _restore_day(index: ScheduleIndex, day: Optional[Day], rows: Optional[List[TimeslotRow]] = None) -> None:
+    assert day is not None
+
+    if rows is None:
+        index.modify_day(day)
+        return
+
+    index.add_day(day)
+    for row in rows:
+        _restore_timeslot(index=index, row=row)
+
+
+def _undo_change(index: ScheduleIndex, event: Dict[str, Any]) -> Callable[[], Any]:
+    # Обратное действие снимается до применения изменения, пока прежнее состояние ещё можно прочитать.
+    # Если запись некорректна, изменение упадёт само и откат для него не понадобится
+    record: Dict[str, Any] = event.get('record') or {}
+    record_id: Any = record.get('id')
+
+    match event.get('entity'), event.get('op'):
+        case 'day', 'add':
+            return lambda: index.remove_day(day_id=record['id'])
+        case 'day', 'modify':
+            previous: Optional[Day] = index.get_day_by_id(record_id)
+            return lambda: _restore_day(index=index, day=previous)
+        case 'day', 'remove':
+            removed: Optional[Day] = index.get_day_by_id(record_id)
+            rows: List[TimeslotRow] = index.get_timeslots(record_id)
+            return lambda: _restore_day(index=index, day=removed, rows=rows)
+        case 'timeslot', 'add':
+            return lambda: index.remove_timeslot(day_id=record['day_id'], slot_id=record['id'])
+        case 'timeslot', 'modify':
+            modified: Optional[TimeslotRow] = _find_timeslot(index=index, slot_id=record_id)
+            return lambda: _restore_timeslot(index=index, row=modified, moved=True)
+        case 'timeslot', 'remove':
+            row: Optional[TimeslotRow] = _find_timeslot(index=index, slot_id=record_id, day_id=record.get('day_id'))
+            return lambda: _restore_timeslot(index=index, row=row)
+
+    return lambda: None
+
+
+def apply_diff(index: ScheduleIndex, diff: Dict[str, Any]) -> int:
+    # Дифф: {"days": {"added": [...], "modified": [...], "removed": [...]}, "timeslots": {...}}.
+    # Дни добавляются раньше слотов, а удаляются после них, чтобы слоты не ссылались на отсутствующий день
+    days: Dict[str, Any] = diff.get('days', {})
+    timeslots: Dict[str, Any] = diff.get('timeslots', {})
+
+    events = [
+        *({'op': 'add', 'entity': 'day', 'record': record} for record in days.get('added', [])),
+        *({'op': 'modify', 'entity': 'day', 'record': record} for record in days.get('modified', [])),
+        *({'op': 'remove', 'entity': 'timeslot', 'record': record} for record in timeslots.get('removed', [])),
+        *({'op': 'modify', 'entity': 'timeslot', 'record': record} for record in timeslots.get('modified', [])),
+        *({'op': 'add', 'entity': 'timeslot', 'record': record} for record in timeslots.get('added', [])),
+        *({'op': 'remove', 'entity': 'day', 'record': record} for record in days.get('removed', []))
+    ]
+
+    # Дифф применяется целиком или не применяется: при ошибке уже внесённые изменения откатываются
+    # в обратном порядке, и индекс остаётся в состоянии до диффа
+    undo: List[Callable[[], Any]] = []
+
+    try:
+        for event in events:
+            rollback: Callable[[], Any] = _undo_change(index=index, event=event)
+            apply_change(index=index, event=event)
+            undo.append(rollback)
+
+    except Exception:
+        for rollback in reversed(undo):
+            rollback()
+        raise
+
+    return len(undo)
@@ -1,19 +1,41 @@
 from requests import get as requests_get, Response
 from requests.exceptions import RequestException
 
-from src.dto import APIResponse
+from src.common.metrics import METRICS
+from src.dto import APIResponse, ScheduleResponse
+from src.parsers import stream_employment_schedule_parser
 
 
 def get_employment_schedule(url: str) -> APIResponse:
     result: APIResponse = APIResponse()
 
     try:
-        response: Response = requests_get(url=url)
+        with METRICS.timer('fetch'):
+            response: Response = requests_get(url=url)
 
         if not response.ok:
             raise RequestException(f"Возникла проблема при запросе к URL, код ответа -> {response.status_code}.")
 
-        result.result = response.json()
+        with METRICS.timer('json_decode'):
+            result.result = response.json()
+
+    except Exception as error:
+        result.error = str(error)
+
+    return result
+
+
+def stream_employment_schedule(url: str, columnar: bool = False) -> ScheduleResponse:
+    result: ScheduleResponse = ScheduleResponse()
+
+    try:
+        with requests_get(url=url, stream=True) as response:
+            if not response.ok:
+                raise RequestException(f"Возникла проблема при запросе к URL, код ответа -> {response.status_code}.")
+
+            # Тело читается из сокета частями и разбирается по мере поступления
+            response.raw.decode_content = True
+            result.result = stream_employment_schedule_parser(stream=response.raw, columnar=columnar)
 
     except Exception as error:
         result.error = str(error)
@@ -0,0 +1,184 @@
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.availability import compute_free_intervals, merge_intervals
+from src.index import ScheduleStore
+from src.models import Day
+
+Intervals = Dict[int, List[Tuple[int, int]]]
+
+
+def _import_numpy() -> Optional[Any]:
+    # NumPy — необязательная зависимость: без неё используется чистый Python с теми же результатами
+    try:
+        return import_module('numpy')
+
+    except ImportError:
+        return None
+
+
+np: Optional[Any] = _import_numpy()
+HAS_NUMPY: bool = np is not None
+
+
+class ScheduleArrays:
+    def __init__(
+            self,
+            store: ScheduleStore,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            use_numpy: Optional[bool] = None
+    ):
+        if use_numpy and not HAS_NUMPY:
+            raise ValueError("Для векторных вычислений необходимо установить numpy")
+
+        self.use_numpy: bool = HAS_NUMPY if use_numpy is None else use_numpy
+        self.days: List[Day] = store.get_days(date_from=date_from, date_to=date_to)
+        # Слоты всех дней подряд, сгруппированные по дням в порядке дат; offsets[i] — начало группы i-го дня
+        self.offsets: List[int] = [0]
+        self.slot_starts: List[int] = []
+        self.slot_ends: List[int] = []
+
+        for day in self.days:
+            for start, end in store.get_intervals(day.id):
+                self.slot_starts.append(start)
+                self.slot_ends.append(end)
+
+            self.offsets.append(len(self.slot_starts))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _day_intervals(self, position: int) -> List[Tuple[int, int]]:
+        lo, hi = self.offsets[position], self.offsets[position + 1]
+
+        return list(zip(self.slot_starts[lo:hi], self.slot_ends[lo:hi]))
+
+    def _group_by_day(self, groups: Any, starts: Any, ends: Any) -> Intervals:
+        # Промежутки отсортированы по дню: границы групп находятся одним searchsorted
+        bounds: List[int] = np.searchsorted(groups, np.arange(len(self.days) + 1)).tolist()  # type: ignore[union-attr]
+        pairs: List[Tuple[int, int]] = list(zip(starts.tolist(), ends.tolist()))
+
+        return {day.id: pairs[bounds[position]:bounds[position + 1]] for position, day in enumerate(self.days)}
+
+    def _slot_arrays(self, inside_day: bool) -> Tuple[Any, Any, Any]:
+        assert np is not None
+
+        groups = np.repeat(np.arange(len(self.days)), np.diff(self.offsets))
+        starts = np.asarray(self.slot_starts, dtype=np.int64)
+        ends = np.asarray(self.slot_ends, dtype=np.int64)
+
+        if inside_day and len(starts):
+            # Слоты, начинающиеся после конца рабочего дня, на свободное время не влияют
+            day_ends = np.asarray([day.end_minutes for day in self.days], dtype=np.int64)
+            inside = starts < day_ends[groups]
+            groups, starts, ends = groups[inside], starts[inside], ends[inside]
+
+        return groups, starts, ends
+
+    @staticmethod
+    def _merge(groups: Any, starts: Any, ends: Any) -> Tuple[Any, Any, Any]:
+        assert np is not None
+
+        if not len(starts):
+            return groups, starts, ends
+
+        # Накопленный максимум концов внутри дня: сдвиг на номер дня не даёт максимуму перетечь в следующий день
+        shift: int = int(ends.max()) + 1
+        running_ends = np.maximum.accumulate(groups * shift + ends) - groups * shift
+
+        new_block = np.ones(len(starts), dtype=bool)
+        new_block[1:] = (np.diff(groups) != 0) | (starts[1:] > running_ends[:-1])
+
+        first = np.flatnonzero(new_block)
+        last = np.append(first[1:] - 1, len(starts) - 1)
+
+        return groups[first], starts[first], running_ends[last]
+
+    def merged_busy_intervals(self) -> Intervals:
+        if not self.use_numpy:
+            return {
+                day.id: merge_intervals(self._day_intervals(position)) for position, day in enumerate(self.days)
+            }
+
+        return self._group_by_day(*self._merge(*self._slot_arrays(inside_day=False)))
+
+    def _free_arrays(self) -> Tuple[Any, Any, Any]:
+        assert np is not None
+
+        groups, starts, ends = self._merge(*self._slot_arrays(inside_day=True))
+        day_starts = np.asarray([day.start_minutes for day in self.days], dtype=np.int64)
+        day_ends = np.asarray([day.end_minutes for day in self.days], dtype=np.int64)
+
+        # Промежуток перед каждым блоком занятости начинается с конца предыдущего блока того же дня
+        previous_ends = np.full(len(starts), -1, dtype=np.int64)
+        same_day = np.zeros(len(starts), dtype=bool)
+        same_day[1:] = groups[1:] == groups[:-1]
+        previous_ends[1:][same_day[1:]] = ends[:-1][same_day[1:]]
+
+        inner_starts = np.maximum(day_starts[groups], previous_ends)
+        inner = inner_starts < starts
+
+        # Хвост дня: от конца последнего блока (или начала дня) до конца рабочего дня
+        last_ends = np.full(len(self.days), -1, dtype=np.int64)
+        last_ends[groups] = ends
+        tail_starts = np.maximum(day_starts, last_ends)
+        tail = tail_starts < day_ends
+
+        all_groups = np.concatenate((groups[inner], np.flatnonzero(tail)))
+        order = np.argsort(all_groups, kind='stable')
+
+        return (
+            all_groups[order],
+            np.concatenate((inner_starts[inner], tail_starts[tail]))[order],
+            np.concatenate((starts[inner], day_ends[tail]))[order]
+        )
+
+    def free_intervals(self) -> Intervals:
+        if not self.use_numpy:
+            return {
+                day.id: compute_free_intervals(day, self._day_intervals(position))
+                for position, day in enumerate(self.days)
+            }
+
+        return self._group_by_day(*self._free_arrays())
+
+    def intervals_for_duration(self, duration: int) -> Intervals:
+        if not self.use_numpy:
+            return {
+                day_id: [(start, end) for start, end in intervals if end - start >= duration]
+                for day_id, intervals in self.free_intervals().items()
+            }
+
+        groups, starts, ends = self._free_arrays()
+        fitting = ends - starts >= duration
+
+        return self._group_by_day(groups[fitting], starts[fitting], ends[fitting])
+
+    def utilization(self) -> Dict[int, float]:
+        # Доля рабочего дня, занятая слотами; занятость за границами дня не учитывается
+        if not self.use_numpy:
+            result: Dict[int, float] = {}
+
+            for position, day in enumerate(self.days):
+                length: int = day.end_minutes - day.start_minutes
+                busy: int = sum(
+                    max(0, min(end, day.end_minutes) - max(start, day.start_minutes))
+                    for start, end in merge_intervals(self._day_intervals(position))
+                )
+                result[day.id] = busy / length if length > 0 else 0.0
+
+            return result
+
+        assert np is not None
+
+        groups, starts, ends = self._merge(*self._slot_arrays(inside_day=True))
+        day_starts = np.asarray([day.start_minutes for day in self.days], dtype=np.int64)
+        day_ends = np.asarray([day.end_minutes for day in self.days], dtype=np.int64)
+
+        covered = np.clip(np.minimum(ends, day_ends[groups]) - np.maximum(starts, day_starts[groups]), 0, None)
+        busy_minutes = np.bincount(groups, weights=covered, minlength=len(self.days))
+        lengths = day_ends - day_starts
+        shares = np.divide(busy_minutes, lengths, out=np.zeros(len(self.days)), where=lengths > 0)
+
+        return {day.id: share for day, share in zip(self.days, shares.tolist())}
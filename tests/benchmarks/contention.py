@@ -0,0 +1,152 @@
+from argparse import ArgumentParser, Namespace
+from sys import exit as sys_exit
+from threading import Barrier, Thread
+from time import perf_counter, sleep
+from typing import Any, Dict, List, Optional
+
+from src.booking import BookingConflict, BookingEngine
+from src.common.metrics import METRICS
+from src.index import ScheduleIndex
+from src.parsers import employment_schedule_parser
+from tests.benchmarks.generator import DAY_END_MINUTES, DAY_START_MINUTES, generate_schedule_payload
+
+
+def run_contention(
+        threads: int,
+        distinct_days: int,
+        bookings_per_day: int = 40,
+        duration: int = 5,
+        simulated_commit_latency: float = 0.0
+) -> Dict[str, Any]:
+    # Каждый день получает одинаковое число броней в любом сценарии: длина списка слотов дня не зависит от
+    # количества дней, и разница в пропускной способности показывает только параллельность блокировок.
+    # Без simulated_commit_latency замеряется сам reserve() под GIL; с ней подписчик индекса засыпает под
+    # блокировкой дня, имитируя запись брони во внешнее хранилище — основной сценарий конкуренции
+    capacity: int = (DAY_END_MINUTES - DAY_START_MINUTES) // duration
+    if bookings_per_day >= capacity:
+        raise ValueError(f"Бронирований на день ({bookings_per_day}) должно быть меньше вместимости дня ({capacity})")
+
+    payload: Dict[str, Any] = generate_schedule_payload(days=distinct_days, slots_per_day=0)
+    index: ScheduleIndex = ScheduleIndex(employment_schedule_parser(payload, columnar=True))
+    if simulated_commit_latency:
+        index.add_listener(lambda _: sleep(simulated_commit_latency))
+
+    engine: BookingEngine = BookingEngine(index)
+    dates: List[str] = [day['date'] for day in payload['days']]
+    # Брони раздаются потокам по кругу, соседние брони потока приходятся на разные дни
+    jobs: List[str] = [dates[number % distinct_days] for number in range(bookings_per_day * distinct_days)]
+    barrier: Barrier = Barrier(threads + 1)
+    booked: List[int] = [0] * threads
+    failed: List[int] = [0] * threads
+    conflicts: List[int] = [0] * threads
+
+    def worker(number: int) -> None:
+        barrier.wait()
+
+        for date in jobs[number::threads]:
+            try:
+                if engine.reserve(date=date, duration=duration) is not None:
+                    booked[number] += 1
+                else:
+                    failed[number] += 1
+
+            except BookingConflict:
+                conflicts[number] += 1
+
+    workers: List[Thread] = [Thread(target=worker, args=(number,)) for number in range(threads)]
+    for thread in workers:
+        thread.start()
+
+    metrics_enabled: bool = METRICS.enabled
+    METRICS.enabled = True
+    METRICS.reset()
+
+    try:
+        started: float = perf_counter()
+        barrier.wait()
+        for thread in workers:
+            thread.join()
+        elapsed: float = perf_counter() - started
+
+        retries: float = METRICS.collect()[0].get('booking_retries', 0)
+
+    finally:
+        METRICS.reset()
+        METRICS.enabled = metrics_enabled
+
+    return {
+        'threads': threads,
+        'distinct_days': distinct_days,
+        'bookings_per_day': bookings_per_day,
+        'simulated_commit_latency': simulated_commit_latency,
+        'bookings': sum(booked),
+        'failed': sum(failed),
+        'conflicts': sum(conflicts),
+        'retries': int(retries),
+        'throughput_per_s': sum(booked) / elapsed if elapsed else 0.0
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Namespace:
+    parser: ArgumentParser = ArgumentParser(description="Пропускная способность бронирования при конкуренции потоков")
+    parser.add_argument('--threads', type=int, default=8, help="Количество одновременно бронирующих потоков")
+    parser.add_argument(
+        '--days',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8],
+        help="Количество различных дней, между которыми распределяются бронирования"
+    )
+    parser.add_argument(
+        '--bookings-per-day',
+        type=int,
+        default=40,
+        help="Бронирований на каждый день, одинаково во всех сценариях (меньше вместимости дня)"
+    )
+    parser.add_argument(
+        '--simulated-commit-latency',
+        type=float,
+        default=0.001,
+        help=(
+            "Имитация записи брони во внешнее хранилище под блокировкой дня, в секундах: основной результат. "
+            "Рядом печатается пропускная способность самого reserve() без задержки; 0 — только она"
+        )
+    )
+
+    return parser.parse_args(argv)
+
+
+def _describe(result: Dict[str, Any]) -> str:
+    return (
+        f"{result['throughput_per_s']:>10.0f} броней/с  повторов {result['retries']:>5}  "
+        f"конфликтов {result['conflicts']:>3}  без окна {result['failed']:>3}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args: Namespace = parse_args(argv)
+
+    for distinct_days in args.days:
+        line: str = f"дней {distinct_days:>4}  потоков {args.threads:>3}  "
+
+        if args.simulated_commit_latency:
+            with_latency: Dict[str, Any] = run_contention(
+                threads=args.threads,
+                distinct_days=distinct_days,
+                bookings_per_day=args.bookings_per_day,
+                simulated_commit_latency=args.simulated_commit_latency
+            )
+            line += f"запись {args.simulated_commit_latency * 1000:g} мс: {_describe(with_latency)}  |  reserve(): "
+
+        result: Dict[str, Any] = run_contention(
+            threads=args.threads,
+            distinct_days=distinct_days,
+            bookings_per_day=args.bookings_per_day
+        )
+        print(line + _describe(result))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys_exit(main())
@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+from random import Random
+from typing import Any, Dict, List
+
+from src.common.converters import minutes_to_time
+
+DAY_START_MINUTES: int = 8 * 60
+DAY_END_MINUTES: int = 20 * 60
+
+
+def generate_schedule_payload(
+        days: int,
+        slots_per_day: int,
+        overlap: float = 0.0,
+        seed: int = 0,
+        start_date: date = date(2024, 1, 1)
+) -> Dict[str, Any]:
+    # JSON в формате эндпоинта: слоты равномерно распределены по рабочему дню, доля overlap из них
+    # растянута так, что пересекается со следующим слотом
+    if not 0.0 <= overlap <= 1.0:
+        raise ValueError("Доля пересекающихся слотов должна быть от 0 до 1")
+
+    random: Random = Random(seed)
+    step: int = max((DAY_END_MINUTES - DAY_START_MINUTES) // max(slots_per_day, 1), 2)
+    payload_days: List[Dict[str, Any]] = []
+    payload_timeslots: List[Dict[str, Any]] = []
+
+    for day_number in range(days):
+        day_id: int = day_number + 1
+        payload_days.append({
+            'id': day_id,
+            'date': (start_date + timedelta(days=day_number)).isoformat(),
+            'start': minutes_to_time(DAY_START_MINUTES),
+            'end': minutes_to_time(DAY_END_MINUTES)
+        })
+
+        for slot_number in range(slots_per_day):
+            start: int = DAY_START_MINUTES + slot_number * step + random.randrange(step // 2)
+            length: int = step * 3 // 2 if random.random() < overlap else random.randrange(1, step // 2 + 1)
+
+            payload_timeslots.append({
+                'id': len(payload_timeslots) + 1,
+                'day_id': day_id,
+                'start': minutes_to_time(min(start, 24 * 60 - 2)),
+                'end': minutes_to_time(min(start + length, 24 * 60 - 1))
+            })
+
+    return {'days': payload_days, 'timeslots': payload_timeslots}
+
+
+def generate_employee_payloads(
+        employees: int,
+        days: int,
+        slots_per_day: int,
+        overlap: float = 0.0,
+        seed: int = 0
+) -> Dict[str, Dict[str, Any]]:
+    return {
+        f'employee-{number}': generate_schedule_payload(
+            days=days,
+            slots_per_day=slots_per_day,
+            overlap=overlap,
+            seed=seed + number
+        )
+        for number in range(employees)
+    }
@@ -0,0 +1,244 @@
+from argparse import ArgumentParser, Namespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dump, dumps, load
+from platform import python_version
+from random import Random
+from statistics import median, quantiles
+from sys import exit as sys_exit
+from threading import Thread
+from time import perf_counter
+from tracemalloc import get_traced_memory, start as tracemalloc_start, stop as tracemalloc_stop
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.dto import EmploymentScheduleDTO
+from src.fetcher import ScheduleFetcher
+from src.group import GroupScheduleProcessor
+from src.index import ScheduleIndex
+from src.parsers import employment_schedule_parser
+from src.processor import ScheduleProcessor
+from tests.benchmarks.generator import generate_employee_payloads, generate_schedule_payload
+
+# Размеры синтетического расписания: дни, слоты в дне, доля пересечений, сотрудники, запросов на действие
+PRESETS: Dict[str, Dict[str, Any]] = {
+    'small': {'days': 60, 'slots_per_day': 8, 'overlap': 0.2, 'employees': 4, 'queries': 200, 'repeat': 5},
+    'medium': {'days': 365, 'slots_per_day': 16, 'overlap': 0.2, 'employees': 16, 'queries': 2000, 'repeat': 5},
+    'large': {'days': 3650, 'slots_per_day': 24, 'overlap': 0.3, 'employees': 64, 'queries': 20000, 'repeat': 3}
+}
+
+# Разница по памяти меньше этого порога считается шумом аллокатора
+MEMORY_SLACK_KB: float = 64.0
+
+
+def measure(operation: Callable[[int], Any], count: int, items_per_operation: int = 1) -> Dict[str, float]:
+    timings: List[float] = []
+
+    for number in range(count):
+        started: float = perf_counter()
+        operation(number)
+        timings.append(perf_counter() - started)
+
+    # Память замеряется отдельным прогоном: трассировка аллокаций искажает время
+    tracemalloc_start()
+    try:
+        operation(0)
+        peak: int = get_traced_memory()[1]
+    finally:
+        tracemalloc_stop()
+
+    percentiles: List[float] = quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+
+    return {
+        'operations': count,
+        'throughput_per_s': count * items_per_operation / sum(timings) if sum(timings) else 0.0,
+        'p50_ms': median(timings) * 1000,
+        'p95_ms': percentiles[94] * 1000,
+        'p99_ms': percentiles[98] * 1000,
+        'peak_memory_kb': peak / 1024
+    }
+
+
+class _StubUpstream:
+    def __init__(self, payload: bytes):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url: str = f'http://127.0.0.1:{self._server.server_address[1]}/'
+
+    def __enter__(self) -> '_StubUpstream':
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _iter_benchmarks(parameters: Dict[str, Any]) -> Iterator[Tuple[str, Callable[[int], Any], int, int]]:
+    payload: Dict[str, Any] = generate_schedule_payload(
+        days=parameters['days'],
+        slots_per_day=parameters['slots_per_day'],
+        overlap=parameters['overlap']
+    )
+    slots: int = len(payload['timeslots'])
+    repeat: int = parameters['repeat']
+    queries: int = parameters['queries']
+
+    yield 'parse_objects', lambda _: employment_schedule_parser(payload), repeat, slots
+    yield 'parse_columnar', lambda _: employment_schedule_parser(payload, columnar=True), repeat, slots
+
+    schedule: EmploymentScheduleDTO = employment_schedule_parser(payload, columnar=True)
+    yield 'build_index', lambda _: ScheduleIndex(schedule), repeat, slots
+
+    random: Random = Random(0)
+    dates: List[str] = [random.choice(payload['days'])['date'] for _ in range(queries)]
+    # Без кэша расчётов: иначе после первого прохода по датам замеряются только попадания в кэш
+    processor: ScheduleProcessor = ScheduleProcessor(schedule=schedule, cache_size=0)
+
+    yield 'action_1_busy', lambda number: processor.get_busy_timeslots(dates[number]), queries, 1
+    yield 'action_2_free', lambda number: processor.get_free_timeslots(dates[number]), queries, 1
+    yield (
+        'action_3_interval',
+        lambda number: processor.is_interval_available(dates[number], '12:00', '12:30'),
+        queries,
+        1
+    )
+    yield 'action_4_duration', lambda number: processor.search_timeslots_for_duration(dates[number], 30), queries, 1
+
+    group: GroupScheduleProcessor = GroupScheduleProcessor({
+        employee_id: employment_schedule_parser(employee_payload, columnar=True)
+        for employee_id, employee_payload in generate_employee_payloads(
+            employees=parameters['employees'],
+            days=min(parameters['days'], 31),
+            slots_per_day=parameters['slots_per_day'],
+            overlap=parameters['overlap']
+        ).items()
+    })
+    last_group_date: str = payload['days'][min(parameters['days'], 31) - 1]['date']
+    group_dates: List[str] = [date for date in dates if date <= last_group_date]
+    yield (
+        'group_common_free',
+        lambda number: group.get_common_free_timeslots(group_dates[number % len(group_dates)]),
+        queries,
+        1
+    )
+
+    with _StubUpstream(dumps(payload).encode()) as upstream:
+        fetcher: ScheduleFetcher = ScheduleFetcher(url=upstream.url, cache_dir=None)
+        yield 'fetch_local_stub', lambda _: fetcher.fetch(), repeat, slots
+
+
+def run_suite(preset: str = 'small', overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    parameters: Dict[str, Any] = {**PRESETS[preset], **(overrides or {})}
+    results: Dict[str, Dict[str, float]] = {}
+
+    for name, operation, count, items in _iter_benchmarks(parameters):
+        results[name] = measure(operation=operation, count=count, items_per_operation=items)
+
+    return {'preset': preset, 'parameters': parameters, 'python': python_version(), 'results': results}
+
+
+def _minor_version(version: Optional[str]) -> Optional[str]:
+    return '.'.join(version.split('.')[:2]) if version else None
+
+
+def compare(
+        current: Dict[str, Any],
+        baseline: Dict[str, Any],
+        time_tolerance: float,
+        memory_tolerance: float
+) -> List[str]:
+    if current.get('parameters') != baseline.get('parameters'):
+        raise ValueError("Базовый прогон выполнен на расписании с другими параметрами")
+    # Скорость интерпретатора заметно меняется между минорными версиями, сравнивать их прогоны бессмысленно
+    if _minor_version(current.get('python')) != _minor_version(baseline.get('python')):
+        raise ValueError(
+            f"Базовый прогон выполнен на Python {baseline.get('python')}, текущий — на {current.get('python')}"
+        )
+
+    regressions: List[str] = []
+
+    for name, expected in baseline['results'].items():
+        actual: Optional[Dict[str, float]] = current['results'].get(name)
+        if actual is None:
+            continue
+
+        if actual['throughput_per_s'] * (1 + time_tolerance) < expected['throughput_per_s']:
+            regressions.append(
+                f"{name}: пропускная способность {actual['throughput_per_s']:.0f}/с "
+                f"против {expected['throughput_per_s']:.0f}/с в базовом прогоне"
+            )
+
+        memory_limit: float = expected['peak_memory_kb'] * (1 + memory_tolerance) + MEMORY_SLACK_KB
+        if actual['peak_memory_kb'] > memory_limit:
+            regressions.append(
+                f"{name}: пиковая память {actual['peak_memory_kb']:.0f} КБ "
+                f"против {expected['peak_memory_kb']:.0f} КБ в базовом прогоне"
+            )
+
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Namespace:
+    parser: ArgumentParser = ArgumentParser(description="Замеры производительности разбора, индексации и действий")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small', help="Размер синтетического расписания")
+    parser.add_argument('--output', metavar='PATH', default=None, help="JSON-файл для результатов замеров")
+    parser.add_argument('--baseline', metavar='PATH', default=None, help="JSON базового прогона для сравнения")
+    parser.add_argument(
+        '--time-tolerance',
+        type=float,
+        default=0.25,
+        help="Допустимое замедление относительно базового прогона (0.25 — в 1.25 раза медленнее)"
+    )
+    parser.add_argument(
+        '--memory-tolerance',
+        type=float,
+        default=0.1,
+        help="Допустимый рост пиковой памяти относительно базового прогона"
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args: Namespace = parse_args(argv)
+    report: Dict[str, Any] = run_suite(preset=args.preset)
+
+    for name, metrics in report['results'].items():
+        print(
+            f"{name:<20} {metrics['throughput_per_s']:>14.0f}/с  p50 {metrics['p50_ms']:>9.3f} мс  "
+            f"p95 {metrics['p95_ms']:>9.3f} мс  p99 {metrics['p99_ms']:>9.3f} мс  "
+            f"память {metrics['peak_memory_kb']:>10.0f} КБ"
+        )
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            dump(report, output_file, ensure_ascii=False, indent=2)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as baseline_file:
+        regressions: List[str] = compare(
+            current=report,
+            baseline=load(baseline_file),
+            time_tolerance=args.time_tolerance,
+            memory_tolerance=args.memory_tolerance
+        )
+
+    for regression in regressions:
+        print(f"Регрессия: {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys_exit(main())
@@ -0,0 +1,104 @@
+import pytest
+
+from src.analytics import ScheduleAnalytics
+from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex
+from src.parsers import employment_schedule_parser
+from src.vectorized import HAS_NUMPY
+from tests.benchmarks.generator import generate_schedule_payload
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy не установлен"))]
+
+
+@pytest.fixture(scope="function")
+def index() -> ScheduleIndex:
+    """Фикстура расписания: понедельник с пересекающимися слотами и слотом за концом дня, пустой вторник."""
+    return ScheduleIndex(employment_schedule_parser({
+        "days": [
+            {"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"},
+            {"id": 2, "date": "2024-01-02", "start": "10:00", "end": "12:00"},
+            {"id": 3, "date": "2024-01-08", "start": "09:00", "end": "13:00"}
+        ],
+        "timeslots": [
+            {"id": 1, "day_id": 1, "start": "09:30", "end": "11:00"},
+            {"id": 2, "day_id": 1, "start": "10:00", "end": "12:00"},
+            {"id": 3, "day_id": 1, "start": "17:30", "end": "19:00"},
+            {"id": 4, "day_id": 3, "start": "09:00", "end": "10:00"}
+        ]
+    }))
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+class TestScheduleAnalytics:
+    def test_busy_minutes(self, index, use_numpy):
+        """Занятость любого промежутка дня берётся из префиксных сумм; время за границами дня не учитывается."""
+        analytics = ScheduleAnalytics(index, use_numpy=use_numpy)
+
+        assert analytics.busy_minutes("2024-01-01") == 180
+        assert analytics.busy_minutes("2024-01-01", 600, 660) == 60
+        assert analytics.busy_minutes("2024-01-02") == 0
+
+    def test_utilization(self, index, use_numpy):
+        analytics = ScheduleAnalytics(index, use_numpy=use_numpy)
+
+        assert analytics.utilization_by_day()[0] == {
+            "date": "2024-01-01", "busy_minutes": 180, "working_minutes": 540, "utilization": 0.3333
+        }
+        assert analytics.utilization_by_week() == [
+            {"week": "2024-W01", "busy_minutes": 180, "working_minutes": 660, "utilization": 0.2727},
+            {"week": "2024-W02", "busy_minutes": 60, "working_minutes": 240, "utilization": 0.25}
+        ]
+
+    def test_heatmap(self, index, use_numpy):
+        """Ячейка тепловой карты — доля занятых рабочих минут по дню недели и часу."""
+        heatmap = ScheduleAnalytics(index, use_numpy=use_numpy).heatmap(bucket_minutes=120)
+
+        assert heatmap["buckets"][4:6] == ["08:00", "10:00"]
+        assert heatmap["weekdays"][0][4:9] == [0.75, 0.5, 0.0, 0.0, 0.25]
+        assert heatmap["weekdays"][1][5] == 0.0
+        assert heatmap["weekdays"][6] == [0.0] * 12
+
+    def test_busiest_hours(self, index, use_numpy):
+        hours = ScheduleAnalytics(index, use_numpy=use_numpy).busiest_hours(top=2)
+
+        assert [row["hour"] for row in hours] == ["09:00", "17:00"]
+        assert hours[0]["busy_minutes"] == 90 and hours[0]["working_minutes"] == 120
+
+    def test_gap_histogram(self, index, use_numpy):
+        histogram = ScheduleAnalytics(index, use_numpy=use_numpy).gap_histogram(bins=(60, 240))
+
+        assert histogram == [
+            {"from_minutes": 0, "to_minutes": 60, "count": 1},
+            {"from_minutes": 60, "to_minutes": 240, "count": 2},
+            {"from_minutes": 240, "to_minutes": None, "count": 1}
+        ]
+
+    def test_invalid_queries(self, index, use_numpy):
+        analytics = ScheduleAnalytics(index, use_numpy=use_numpy)
+
+        with pytest.raises(ValueError, match="Дата 2024-01-03 не найдена в расписании."):
+            analytics.busy_minutes("2024-01-03")
+        with pytest.raises(ValueError, match="Некорректный промежуток"):
+            analytics.busy_minutes("2024-01-01", 700, 600)
+        with pytest.raises(ValueError, match="Размер ячейки должен быть от 1 до 1440 минут"):
+            analytics.report("heatmap", bucket_minutes=0)
+        with pytest.raises(ValueError, match="Неизвестный вид отчёта month"):
+            analytics.report("month")
+
+
+class TestBackendsParity:
+    def test_generated_schedule(self):
+        """На случайном расписании с пересечениями оба варианта дают одинаковые отчёты."""
+        pytest.importorskip("numpy")
+        payload = generate_schedule_payload(days=90, slots_per_day=12, overlap=0.4)
+        index = ScheduleIndex(employment_schedule_parser(payload))
+        python, vectorized = ScheduleAnalytics(index, use_numpy=False), ScheduleAnalytics(index, use_numpy=True)
+
+        for kind in ("day", "week", "heatmap", "hours", "gaps"):
+            assert python.report(kind) == vectorized.report(kind)
+
+    def test_empty_schedule(self):
+        analytics = ScheduleAnalytics(ScheduleIndex(EmploymentScheduleDTO(days=[], timeslots=[])), use_numpy=False)
+
+        assert analytics.utilization_by_day() == []
+        assert analytics.busiest_hours() == []
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from src.availability import DayAvailability, merge_intervals
+from src.dto import EmploymentScheduleDTO
+from src.models import Day, Timeslot
+from src.processor import ScheduleProcessor
+from src.vectorized import HAS_NUMPY
+
+
+class TestMergeIntervals:
+    @pytest.mark.parametrize(
+        "intervals, expected",
+        [
+            ([], []),
+            ([(60, 120), (90, 100), (120, 180), (200, 210)], [(60, 180), (200, 210)]),
+            ([(0, 10), (5, 30), (30, 30), (31, 40)], [(0, 30), (31, 40)])
+        ]
+    )
+    def test_merge(self, intervals, expected):
+        assert merge_intervals(intervals) == expected
+
+
+class TestDayAvailability:
+    @pytest.fixture(scope="function")
+    def availability(self) -> DayAvailability:
+        """Фикстура дня 09:00-18:00 с пересекающимися занятыми слотами."""
+        day = Day(id=1, date="2024-01-01", start="09:00", end="18:00")
+        return DayAvailability(day, [(600, 720), (660, 690), (840, 900)])
+
+    @pytest.mark.parametrize(
+        "start, end, expected",
+        [
+            (540, 600, True),
+            (720, 840, True),
+            (900, 1080, True),
+            (500, 560, False),
+            (1000, 1100, False),
+            (700, 730, False),
+            (830, 850, False)
+        ]
+    )
+    def test_is_available(self, availability, start: int, end: int, expected: bool):
+        assert availability.is_available(start, end) is expected
+
+    def test_matches_free_slots_sweep(self):
+        """Сверка с проверкой вхождения в свободные слоты на случайных данных."""
+        rng = random.Random(7)
+        day = Day(id=1, date="2024-01-01", start="08:00", end="20:00")
+
+        for _ in range(50):
+            starts = rng.sample(range(420, 1260), rng.randint(0, 8))
+            busy = sorted((start, start + rng.randint(0, 90)) for start in starts)
+            timeslots = [
+                Timeslot(id=number, day_id=1, start=f"{s // 60:02d}:{s % 60:02d}", end=f"{e // 60:02d}:{e % 60:02d}")
+                for number, (s, e) in enumerate(busy)
+            ]
+            processor = ScheduleProcessor(schedule=EmploymentScheduleDTO(days=[day], timeslots=timeslots))
+            free = processor._free_intervals_for_day(day)
+            availability = DayAvailability(day, busy)
+
+            queries = [(start, start + rng.randint(1, 120)) for start in rng.sample(range(400, 1300), 40)]
+            expected = [any(s <= start and end <= e for s, e in free) for start, end in queries]
+            assert availability.are_available(queries, use_numpy=False) == expected
+            if HAS_NUMPY:
+                assert availability.are_available(queries, use_numpy=True) == expected
+
+
+class TestAreIntervalsAvailable:
+    def test_bulk_check(self):
+        """Проверка пакетной проверки промежутков через процессор."""
+        schedule = EmploymentScheduleDTO(
+            days=[Day(id=1, date="2024-01-01", start="09:00", end="18:00")],
+            timeslots=[Timeslot(id=1, day_id=1, start="10:00", end="12:00")]
+        )
+        processor = ScheduleProcessor(schedule=schedule)
+        assert processor.are_intervals_available(
+            "2024-01-01",
+            [("09:00", "10:00"), ("11:00", "13:00"), ("12:00", "18:00")]
+        ) == [True, False, True]
+
+        with pytest.raises(ValueError, match="Некорректный формат интервала"):
+            processor.are_intervals_available("2024-01-01", [("09:00", "25:00")])
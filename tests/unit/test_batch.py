@@ -0,0 +1,111 @@
+import json
+from io import StringIO
+
+import pytest
+
+from src.batch import run_batch
+from src.processor import ScheduleProcessor
+from src.dto import EmploymentScheduleDTO
+from src.models import Day, Timeslot
+
+
+@pytest.fixture(scope="function")
+def processor() -> ScheduleProcessor:
+    """Фикстура процессора над тестовым расписанием."""
+    days = [Day(id=1, date="2024-01-01", start="09:00", end="18:00")]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+        Timeslot(id=2, day_id=1, start="14:00", end="15:00")
+    ]
+    return ScheduleProcessor(schedule=EmploymentScheduleDTO(days=days, timeslots=timeslots))
+
+
+class TestRunBatch:
+    def test_all_actions(self, processor):
+        """Проверка пакетной обработки всех четырёх действий."""
+        queries = [
+            {"id": "a", "action": 1, "date": "2024-01-01"},
+            {"id": "b", "action": 2, "date": "2024-01-01"},
+            {"id": "c", "action": 3, "date": "2024-01-01", "start": "12:00", "end": "13:00"},
+            {"id": "d", "action": 4, "date": "2024-01-01", "duration": 150}
+        ]
+        output = StringIO()
+
+        processed = run_batch(processor, [json.dumps(query) + "\n" for query in queries], output)
+
+        answers = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert processed == 4
+        assert [answer["id"] for answer in answers] == ["a", "b", "c", "d"]
+        assert answers[0]["result"] == [{"start": "10:00", "end": "12:00"}, {"start": "14:00", "end": "15:00"}]
+        assert len(answers[1]["result"]) == 3
+        assert answers[2]["result"] is True
+        assert answers[3]["result"] == [{"start": "15:00", "end": "18:00"}]
+        assert all(answer["error"] is None for answer in answers)
+
+    def test_errors_do_not_stop_batch(self, processor):
+        """Проверка, что ошибка в одном запросе не прерывает пакет."""
+        lines = [
+            "not json\n",
+            "\n",
+            json.dumps({"action": 9, "date": "2024-01-01"}) + "\n",
+            json.dumps({"action": 3, "date": "2024-01-01"}) + "\n",
+            json.dumps({"action": 1, "date": "2024-01-05"}) + "\n"
+        ]
+        output = StringIO()
+
+        processed = run_batch(processor, lines, output)
+
+        answers = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert processed == 4
+        assert all(answer["result"] is None for answer in answers)
+        assert "Неизвестный запрос действия" in answers[1]["error"]
+        assert "start" in answers[2]["error"]
+        assert "не найдена в расписании" in answers[3]["error"]
+
+    def test_range_queries(self, processor):
+        """Проверка запросов по диапазону дат с ограничением количества."""
+        lines = [
+            json.dumps({"action": 2, "date_from": "2024-01-01", "date_to": "2024-01-31", "limit": 2}) + "\n",
+            json.dumps({"action": 4, "date_from": "2024-01-01", "date_to": "2024-01-31", "duration": 150}) + "\n",
+            json.dumps({"action": 3, "date_from": "2024-01-01", "date_to": "2024-01-31"}) + "\n",
+            json.dumps({"action": 1, "date_from": "2024-01-01", "date_to": "2024-01-31", "limit": 0}) + "\n"
+        ]
+        output = StringIO()
+
+        run_batch(processor, lines, output)
+
+        answers = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert answers[0]["result"] == [
+            {"date": "2024-01-01", "start": "09:00", "end": "10:00"},
+            {"date": "2024-01-01", "start": "12:00", "end": "14:00"}
+        ]
+        assert answers[1]["result"] == [{"date": "2024-01-01", "start": "15:00", "end": "18:00"}]
+        assert "не поддерживает запрос по диапазону" in answers[2]["error"]
+        assert "Некорректное ограничение" in answers[3]["error"]
+
+    @pytest.mark.parametrize(
+        "line, error_msg",
+        [
+            ("not json", "Некорректный JSON запроса"),
+            ("[1, 2]", "Запрос должен быть JSON-объектом"),
+            ("42", "Запрос должен быть JSON-объектом"),
+            (json.dumps({"id": "q", "action": 1, "date": 20240101}), "Поле date должно быть строкой"),
+            (json.dumps({"action": 3, "date": "2024-01-01", "start": ["12:00"], "end": "13:00"}),
+             "Поле start должно быть строкой"),
+            (json.dumps({"action": 2, "date_from": None, "date_to": "2024-01-31"}),
+             "Поле date_from должно быть строкой"),
+            (json.dumps({"action": 4, "date": "2024-01-01", "duration": {"minutes": 30}}),
+             "Поле duration должно быть целым числом"),
+            (json.dumps({"action": 1, "date_from": "2024-01-01", "date_to": "2024-01-31", "limit": True}),
+             "Поле limit должно быть целым числом")
+        ]
+    )
+    def test_invalid_query_shape(self, processor, line: str, error_msg: str):
+        """Запросы не того вида получают сообщение валидации, а не текст исключения Python."""
+        output = StringIO()
+
+        run_batch(processor, [line + "\n"], output)
+
+        answer = json.loads(output.getvalue())
+        assert answer["result"] is None
+        assert answer["error"] == error_msg
@@ -0,0 +1,89 @@
+import pytest
+
+from src.index import ScheduleIndex
+from src.parsers import employment_schedule_parser
+from tests.benchmarks.contention import run_contention
+from tests.benchmarks.generator import generate_employee_payloads, generate_schedule_payload
+from tests.benchmarks.suite import compare, run_suite
+
+
+class TestGenerator:
+    def test_schedule_payload(self):
+        """Генератор выдаёт детерминированное расписание в формате эндпоинта."""
+        payload = generate_schedule_payload(days=3, slots_per_day=4, overlap=1.0, seed=7)
+        schedule = employment_schedule_parser(payload)
+
+        assert payload == generate_schedule_payload(days=3, slots_per_day=4, overlap=1.0, seed=7)
+        assert [day.date for day in schedule.days or []] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert len(schedule.timeslots or []) == 12
+
+        intervals = ScheduleIndex(schedule).get_intervals(1)
+        assert all(start < previous_end for (_, previous_end), (start, _) in zip(intervals, intervals[1:]))
+
+    def test_employee_payloads(self):
+        payloads = generate_employee_payloads(employees=2, days=1, slots_per_day=2)
+
+        assert list(payloads) == ["employee-0", "employee-1"]
+        assert payloads["employee-0"] != payloads["employee-1"]
+
+    def test_invalid_overlap(self):
+        with pytest.raises(ValueError, match="Доля пересекающихся слотов должна быть от 0 до 1"):
+            generate_schedule_payload(days=1, slots_per_day=1, overlap=1.5)
+
+
+class TestSuite:
+    def test_run_suite(self):
+        """Прогон на крошечном расписании возвращает метрики по всем замерам."""
+        report = run_suite(overrides={"days": 3, "slots_per_day": 2, "employees": 2, "queries": 5, "repeat": 2})
+
+        assert set(report["results"]) == {
+            "parse_objects", "parse_columnar", "build_index", "action_1_busy", "action_2_free",
+            "action_3_interval", "action_4_duration", "group_common_free", "fetch_local_stub"
+        }
+        assert all(metrics["throughput_per_s"] > 0 for metrics in report["results"].values())
+
+    def test_compare(self):
+        baseline = {"results": {
+            "parse": {"throughput_per_s": 1000.0, "peak_memory_kb": 1000.0},
+            "index": {"throughput_per_s": 1000.0, "peak_memory_kb": 100.0}
+        }}
+        current = {"results": {
+            "parse": {"throughput_per_s": 700.0, "peak_memory_kb": 1200.0},
+            "index": {"throughput_per_s": 900.0, "peak_memory_kb": 150.0}
+        }}
+
+        regressions = compare(current, baseline, time_tolerance=0.25, memory_tolerance=0.1)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("parse: пропускная способность 700/с")
+        assert regressions[1].startswith("parse: пиковая память 1200 КБ")
+
+    def test_compare_different_parameters(self):
+        with pytest.raises(ValueError, match="другими параметрами"):
+            compare({"parameters": {"days": 1}, "results": {}}, {"parameters": {"days": 2}, "results": {}}, 0.25, 0.1)
+
+    def test_compare_different_python(self):
+        """Прогоны разных минорных версий Python не сравниваются, отличие патч-версии допустимо."""
+        assert compare({"python": "3.12.4", "results": {}}, {"python": "3.12.1", "results": {}}, 0.25, 0.1) == []
+
+        with pytest.raises(ValueError, match="на Python 3.12.1"):
+            compare({"python": "3.11.7", "results": {}}, {"python": "3.12.1", "results": {}}, 0.25, 0.1)
+
+
+class TestContention:
+    def test_run_contention(self):
+        """Все брони выполняются, а потоки на разных днях не мешают друг другу."""
+        result = run_contention(threads=4, distinct_days=4, bookings_per_day=3)
+
+        assert (result["bookings"], result["failed"], result["conflicts"], result["retries"]) == (12, 0, 0, 0)
+        assert result["throughput_per_s"] > 0
+
+    def test_simulated_commit_latency(self):
+        """Сценарий с задержкой записи бронирует столько же, сколько и без неё: каждому дню поровну."""
+        result = run_contention(threads=4, distinct_days=2, bookings_per_day=4, simulated_commit_latency=0.001)
+
+        assert (result["bookings"], result["failed"], result["conflicts"]) == (8, 0, 0)
+
+    def test_bookings_over_day_capacity(self):
+        with pytest.raises(ValueError, match="должно быть меньше вместимости дня"):
+            run_contention(threads=2, distinct_days=1, bookings_per_day=144)
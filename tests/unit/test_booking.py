@@ -0,0 +1,227 @@
+import asyncio
+import sys
+from threading import Thread
+
+import pytest
+
+from src.booking import BookingConflict, BookingEngine
+from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot
+from src.processor import ScheduleProcessor
+
+
+@pytest.fixture(scope="function")
+def schedule() -> EmploymentScheduleDTO:
+    """Фикстура расписания: свободно 09:00-10:00, 12:00-12:30 и 13:00-18:00."""
+    return EmploymentScheduleDTO(
+        days=[
+            Day(id=1, date="2024-01-01", start="09:00", end="18:00"),
+            Day(id=2, date="2024-01-02", start="09:00", end="18:00")
+        ],
+        timeslots=[
+            Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+            Timeslot(id=2, day_id=1, start="12:30", end="13:00")
+        ]
+    )
+
+
+class TestBookingEngine:
+    def test_reserve_earliest(self, schedule):
+        """Бронь занимает начало первого подходящего окна и сразу видна в расписании."""
+        index = ScheduleIndex(schedule)
+        engine = BookingEngine(index)
+
+        booking = engine.reserve(date="2024-01-01", duration=30)
+
+        assert (booking.slot_id, booking.start, booking.end) == (3, "09:00", "09:30")  # type: ignore[union-attr]
+        assert booking.version == index.get_day_version(1)  # type: ignore[union-attr]
+        assert index.get_intervals(1) == [(540, 570), (600, 720), (750, 780)]
+
+    def test_reserve_best_fit(self, schedule):
+        """best_fit выбирает самое короткое окно, в которое помещается заявка."""
+        engine = BookingEngine(schedule)
+
+        booking = engine.reserve(date="2024-01-01", duration=30, strategy="best_fit")
+
+        assert (booking.start, booking.end) == ("12:00", "12:30")  # type: ignore[union-attr]
+
+    def test_no_window(self, schedule):
+        engine = BookingEngine(schedule)
+
+        assert engine.reserve(date="2024-01-01", duration=400) is None
+
+    def test_reserve_earliest_over_range(self, schedule):
+        """Поиск по диапазону переходит к следующему дню, если в текущем нет окна."""
+        engine = BookingEngine(schedule)
+
+        booking = engine.reserve_earliest(duration=400, date_from="2024-01-01")
+
+        assert (booking.date, booking.start) == ("2024-01-02", "09:00")  # type: ignore[union-attr]
+        assert engine.reserve_earliest(duration=600) is None
+
+    def test_expected_version(self, schedule):
+        """Бронь с устаревшей версией дня отклоняется."""
+        engine = BookingEngine(schedule)
+        version = engine.get_day_version("2024-01-01")
+
+        first = engine.reserve(date="2024-01-01", duration=30, expected_version=version)
+
+        assert first is not None
+        with pytest.raises(BookingConflict):
+            engine.reserve(date="2024-01-01", duration=30, expected_version=version)
+
+        assert engine.reserve(date="2024-01-01", duration=30, expected_version=first.version) is not None
+
+    def test_retry_after_concurrent_change(self, schedule):
+        """Если день изменился между поиском окна и записью, окно ищется заново."""
+        index = ScheduleIndex(schedule)
+        engine = BookingEngine(index)
+        choose_window = engine._choose_window
+        calls: list = []
+
+        def racing_choose_window(**kwargs):
+            window = choose_window(**kwargs)
+            if not calls:
+                index.add_timeslot(slot_id=100, day_id=1, start_minutes=540, end_minutes=600)
+            calls.append(window)
+            return window
+
+        engine._choose_window = racing_choose_window  # type: ignore[method-assign,assignment]
+        booking = engine.reserve(date="2024-01-01", duration=30)
+
+        assert calls == [(540, 570), (720, 750)]
+        assert booking.start == "12:00"  # type: ignore[union-attr]
+
+    def test_slot_ids_follow_index(self, schedule):
+        """id брони не совпадает со слотами, добавленными в индекс мимо движка после его создания."""
+        index = ScheduleIndex(schedule)
+        engine = BookingEngine(index)
+        index.add_timeslot(slot_id=3, day_id=2, start_minutes=540, end_minutes=600)
+        index.add_timeslot(slot_id=7, day_id=2, start_minutes=600, end_minutes=660)
+
+        booking = engine.reserve(date="2024-01-02", duration=30)
+
+        assert (booking.slot_id, booking.start) == (8, "11:00")  # type: ignore[union-attr]
+        assert index.find_timeslot_day(8) == 2
+
+    def test_retry_rereads_day_hours(self, schedule):
+        """Повтор после конкурентного modify_day ищет окно в новых рабочих часах дня."""
+        index = ScheduleIndex(schedule)
+        engine = BookingEngine(index)
+        choose_window = engine._choose_window
+        calls: list = []
+
+        def racing_choose_window(**kwargs):
+            window = choose_window(**kwargs)
+            if not calls:
+                index.modify_day(Day(id=2, date="2024-01-02", start="13:00", end="18:00"))
+            calls.append(window)
+            return window
+
+        engine._choose_window = racing_choose_window  # type: ignore[method-assign,assignment]
+        booking = engine.reserve(date="2024-01-02", duration=30)
+
+        assert calls == [(540, 570), (780, 810)]
+        assert booking.start == "13:00"  # type: ignore[union-attr]
+
+    def test_release(self, schedule):
+        index = ScheduleIndex(schedule)
+        engine = BookingEngine(index)
+
+        engine.release(engine.reserve(date="2024-01-02", duration=60))  # type: ignore[arg-type]
+
+        assert index.get_intervals(2) == []
+
+    def test_invalid_arguments(self, schedule):
+        engine = BookingEngine(schedule)
+
+        with pytest.raises(ValueError, match="Неизвестная стратегия бронирования worst_fit"):
+            engine.reserve(date="2024-01-01", duration=30, strategy="worst_fit")
+        with pytest.raises(ValueError, match="Дата 2024-02-01 не найдена в расписании."):
+            engine.reserve(date="2024-02-01", duration=30)
+
+    def test_concurrent_bookings_do_not_overlap(self, schedule):
+        """Потоки, бронирующие один день, не получают пересекающихся окон."""
+        index = ScheduleIndex(schedule)
+        engine = BookingEngine(index)
+        bookings: list = []
+
+        def worker():
+            for _ in range(5):
+                bookings.append(engine.reserve(date="2024-01-02", duration=10))
+
+        threads = [Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        intervals = index.get_intervals(2)
+        assert len(intervals) == 20
+        assert all(end <= start for (_, end), (start, _) in zip(intervals, intervals[1:]))
+        assert len({booking.slot_id for booking in bookings}) == 20
+
+    def test_concurrent_bookings_and_queries(self):
+        """Брони разных дней и запросы процессора к тому же индексу идут параллельно без ошибок и устаревших ответов."""
+        days = [Day(id=number, date=f"2024-02-{number:02d}", start="09:00", end="18:00") for number in range(1, 29)]
+        index = ScheduleIndex(EmploymentScheduleDTO(days=days, timeslots=[]))
+        engine = BookingEngine(index)
+        processor = ScheduleProcessor(schedule=index, cache_size=8)
+        errors: list = []
+
+        def guarded(target):
+            def run():
+                try:
+                    target()
+                except Exception as error:
+                    errors.append(error)
+            return run
+
+        def writer(offset):
+            for number in range(300):
+                day = days[(offset + number * 4) % len(days)]
+                booking = engine.reserve(date=day.date, duration=10)
+                if booking is not None and number % 3 == 0:
+                    engine.release(booking)
+
+        def reader(offset):
+            for number in range(300):
+                date = days[(offset + number * 7) % len(days)].date
+                processor.get_free_timeslots(date)
+                processor.is_interval_available(date, "12:00", "12:30")
+                processor.take(processor.iter_timeslots_for_duration_range("2024-02-01", "2024-02-28", 30), limit=5)
+                processor.find_earliest_timeslot_for_duration(60)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [Thread(target=guarded(lambda offset=offset: writer(offset))) for offset in range(4)]
+            threads += [Thread(target=guarded(lambda offset=offset: reader(offset))) for offset in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+        fresh = ScheduleProcessor(schedule=ScheduleIndex(EmploymentScheduleDTO(
+            days=days,
+            timeslots=[row for day in days for row in index.get_timeslots(day.id)]  # type: ignore[misc]
+        )))
+        for day in days:
+            assert processor.get_free_timeslots(day.date) == fresh.get_free_timeslots(day.date)
+            assert processor.search_timeslots_for_duration(day.date, 30) == fresh.search_timeslots_for_duration(
+                day.date, 30
+            )
+
+    def test_reserve_async(self, schedule):
+        engine = BookingEngine(schedule)
+
+        async def reserve_many():
+            return await asyncio.gather(*(engine.reserve_async(date="2024-01-02", duration=60) for _ in range(3)))
+
+        bookings = asyncio.run(reserve_many())
+
+        assert sorted(booking.start for booking in bookings) == ["09:00", "10:00", "11:00"]
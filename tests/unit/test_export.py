@@ -0,0 +1,103 @@
+import csv
+import json
+
+import pytest
+
+from src import export
+from src.dto import EmploymentScheduleDTO
+from src.export import detect_export_format, export_schedule, iter_export_chunks
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot
+
+
+@pytest.fixture(scope="function")
+def index() -> ScheduleIndex:
+    """Фикстура расписания на три дня с пересекающимися слотами в первом."""
+    days = [
+        Day(id=1, date="2024-01-01", start="09:00", end="18:00"),
+        Day(id=2, date="2024-01-02", start="08:00", end="17:00"),
+        Day(id=3, date="2024-01-03", start="09:00", end="18:00")
+    ]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+        Timeslot(id=2, day_id=1, start="11:00", end="15:00"),
+        Timeslot(id=3, day_id=2, start="16:00", end="17:00")
+    ]
+    return ScheduleIndex(EmploymentScheduleDTO(days=days, timeslots=timeslots))
+
+
+class TestExport:
+    def test_chunks(self, index):
+        """Дни выгружаются порциями заданного размера."""
+        chunks = list(iter_export_chunks(index, kind="free", chunk_days=2))
+
+        assert chunks == [
+            [("2024-01-01", "09:00", "10:00"), ("2024-01-01", "15:00", "18:00"), ("2024-01-02", "08:00", "16:00")],
+            [("2024-01-03", "09:00", "18:00")]
+        ]
+
+    def test_csv_busy(self, index, tmp_path):
+        output = tmp_path / "busy.csv"
+
+        assert export_schedule(index, kind="busy", output_path=str(output), chunk_days=1) == 2
+
+        with open(output, encoding="utf-8") as output_file:
+            assert list(csv.reader(output_file)) == [
+                ["date", "start", "end"],
+                ["2024-01-01", "10:00", "15:00"],
+                ["2024-01-02", "16:00", "17:00"]
+            ]
+
+    def test_jsonl_utilization_range(self, index, tmp_path):
+        """Загрузка выгружается одной строкой на день в пределах диапазона дат."""
+        output = tmp_path / "utilization.jsonl"
+
+        export_schedule(index, kind="utilization", output_path=str(output), date_from="2024-01-02")
+
+        with open(output, encoding="utf-8") as output_file:
+            assert [json.loads(line) for line in output_file] == [
+                {"date": "2024-01-02", "busy_minutes": 60, "utilization": 0.1111},
+                {"date": "2024-01-03", "busy_minutes": 0, "utilization": 0.0}
+            ]
+
+    def test_stdout(self, index, capsys):
+        export_schedule(index, kind="busy", output_path="-", date_to="2024-01-01")
+
+        assert capsys.readouterr().out == "date,start,end\n2024-01-01,10:00,15:00\n"
+
+    @pytest.mark.parametrize(
+        "options, message",
+        [
+            ({"kind": "gaps", "output_path": "out.csv"}, "Неизвестный вид выгрузки gaps"),
+            ({"kind": "busy", "output_path": "out.xlsx"}, "Не удалось определить формат выгрузки"),
+            ({"kind": "busy", "output_path": "-", "export_format": "parquet"}, "возможна только в файл"),
+            ({"kind": "busy", "output_path": "out.csv", "date_from": "2024-13-01"}, "Некорректный формат даты")
+        ]
+    )
+    def test_invalid_arguments(self, index, tmp_path, monkeypatch, options, message):
+        monkeypatch.chdir(tmp_path)
+
+        with pytest.raises(ValueError, match=message):
+            export_schedule(index, **options)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_parquet_without_pyarrow(self, index, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "_import_pyarrow", lambda: None)
+
+        with pytest.raises(ValueError, match="необходимо установить pyarrow"):
+            export_schedule(index, kind="busy", output_path=str(tmp_path / "busy.parquet"))
+
+    def test_parquet(self, index, tmp_path):
+        """Каждая порция дней записывается отдельной группой строк."""
+        parquet = pytest.importorskip("pyarrow.parquet")
+        output = tmp_path / "free.parquet"
+
+        export_schedule(index, kind="free", output_path=str(output), chunk_days=2)
+
+        parquet_file = parquet.ParquetFile(str(output))
+        assert parquet_file.metadata.num_row_groups == 2
+        assert parquet_file.read().to_pydict()["start"] == ["09:00", "15:00", "08:00", "09:00"]
+
+    def test_detect_export_format(self):
+        assert detect_export_format("out/Busy.JSONL") == "jsonl"
@@ -0,0 +1,145 @@
+import pickle
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.fetcher import ScheduleFetcher, fetch_employee_schedules
+
+PAYLOAD: bytes = (
+    b'{"days": [{"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"}], '
+    b'"timeslots": [{"id": 1, "day_id": 1, "start": "10:00", "end": "12:00"}]}'
+)
+
+
+def make_response(status_code: int, headers=None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.headers = headers or {}
+    response.raw = BytesIO(PAYLOAD)
+    response.__enter__.return_value = response
+    return response
+
+
+@pytest.fixture(scope="function")
+def session() -> MagicMock:
+    session = MagicMock()
+    session.get.return_value = make_response(200, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    return session
+
+
+class TestScheduleFetcher:
+    def test_download_and_fresh_cache_hit(self, tmp_path, session):
+        """Повторный запрос в пределах TTL не обращается к сети."""
+        fetcher = ScheduleFetcher("http://test.url", cache_dir=str(tmp_path), ttl=60, session=session)
+
+        first = fetcher.fetch()
+        second = fetcher.fetch()
+
+        assert first.error is None and second.error is None
+        assert second.result.days[0].date == "2024-01-01"  # type: ignore[union-attr,index]
+        assert list(second.result.timeslots.starts) == [600]  # type: ignore[union-attr]
+        assert session.get.call_count == 1
+
+    def test_conditional_request_not_modified(self, tmp_path, session):
+        """После истечения TTL отправляется условный запрос, ответ 304 берётся из кэша."""
+        fetcher = ScheduleFetcher("http://test.url", cache_dir=str(tmp_path), ttl=0, session=session)
+        fetcher.fetch()
+
+        not_modified = make_response(304)
+        not_modified.raw = BytesIO(b"")
+        session.get.return_value = not_modified
+
+        result = fetcher.fetch()
+
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        assert result.error is None
+        assert result.result.days[0].id == 1  # type: ignore[union-attr,index]
+
+    def test_without_cache_dir(self, session):
+        """Без каталога кэша каждый вызов скачивает расписание."""
+        fetcher = ScheduleFetcher("http://test.url", cache_dir=None, session=session)
+        fetcher.fetch()
+        session.get.return_value = make_response(200)
+        fetcher.fetch()
+
+        assert session.get.call_count == 2
+        assert session.get.call_args.kwargs["headers"] == {}
+
+    def test_normalization(self, session):
+        """Скачанное расписание нормализуется, отчёт о конфликтах возвращается вместе с ним."""
+        response = make_response(200)
+        response.raw = BytesIO(
+            b'{"days": [{"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"}], '
+            b'"timeslots": [{"id": 1, "day_id": 1, "start": "10:00", "end": "12:00"}, '
+            b'{"id": 2, "day_id": 1, "start": "11:00", "end": "13:00"}]}'
+        )
+        session.get.return_value = response
+
+        result = ScheduleFetcher("http://test.url", cache_dir=None, session=session).fetch()
+
+        assert list(zip(result.result.timeslots.starts, result.result.timeslots.ends)) == [  # type: ignore[union-attr]
+            (600, 780)
+        ]
+        assert result.normalization is not None
+        assert [conflict.kind for conflict in result.normalization.conflicts] == ["overlap"]
+
+    @pytest.mark.parametrize(
+        "meta, data",
+        [
+            ('{"url": "http://test.url"}', None),
+            ('{"fetched_at": 1e18, "version": 1}', None),
+            ('[]', None),
+            (None, b"not a pickle"),
+            (None, pickle.dumps({"days": []}))
+        ]
+    )
+    def test_broken_cache_is_miss(self, tmp_path, session, meta, data):
+        """Неполная, устаревшая или повреждённая запись кэша — промах: расписание скачивается заново."""
+        fetcher = ScheduleFetcher("http://test.url", cache_dir=str(tmp_path), ttl=60, session=session)
+        fetcher.fetch()
+
+        if meta is not None:
+            with open(fetcher._meta_path, "w", encoding="utf-8") as meta_file:  # type: ignore[arg-type]
+                meta_file.write(meta)
+        if data is not None:
+            with open(fetcher._data_path, "wb") as data_file:  # type: ignore[arg-type]
+                data_file.write(data)
+
+        session.get.return_value = make_response(200)
+        result = fetcher.fetch()
+
+        assert result.error is None
+        assert result.result.days[0].date == "2024-01-01"  # type: ignore[union-attr,index]
+        assert session.get.call_count == 2
+
+    def test_failure(self, tmp_path, session):
+        """Ошибочный код ответа возвращается как ошибка."""
+        session.get.return_value = make_response(503)
+        fetcher = ScheduleFetcher("http://test.url", cache_dir=str(tmp_path), session=session)
+
+        result = fetcher.fetch()
+
+        assert result.result is None
+        assert "код ответа -> 503" in result.error  # type: ignore[operator]
+
+
+class TestFetchEmployeeSchedules:
+    def test_fetch_concurrently(self, tmp_path, monkeypatch):
+        """Проверка параллельной загрузки расписаний нескольких сотрудников."""
+        session = MagicMock()
+        session.get.side_effect = lambda **kwargs: make_response(200)
+        monkeypatch.setattr(ScheduleFetcher, "_create_session", staticmethod(lambda: session))
+
+        result = fetch_employee_schedules(
+            {"a": "http://test.url/a", "b": "http://test.url/b"},
+            cache_dir=str(tmp_path)
+        )
+
+        assert set(result) == {"a", "b"}
+        assert all(response.error is None for response in result.values())
+        assert sorted(call.kwargs["url"] for call in session.get.call_args_list) == [
+            "http://test.url/a", "http://test.url/b"
+        ]
@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from src.dto import EmploymentScheduleDTO
+from src.gaps import DayGaps, GapIndex, MaxSegmentTree
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot
+from src.processor import ScheduleProcessor
+
+
+@pytest.fixture(scope="function")
+def mock_schedule() -> EmploymentScheduleDTO:
+    """Фикстура расписания на три дня с разными максимальными окнами."""
+    days = [
+        Day(id=1, date="2024-01-01", start="09:00", end="18:00"),
+        Day(id=2, date="2024-01-02", start="08:00", end="17:00"),
+        Day(id=3, date="2024-01-03", start="10:00", end="12:00")
+    ]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+        Timeslot(id=2, day_id=1, start="14:00", end="15:00"),
+        Timeslot(id=3, day_id=2, start="09:00", end="16:00")
+    ]
+    return EmploymentScheduleDTO(days=days, timeslots=timeslots)
+
+
+class TestDayGaps:
+    def test_queries(self):
+        gaps = DayGaps([(540, 600), (720, 840), (900, 1080)])
+        assert gaps.max_gap == 180
+        assert gaps.count_fitting(100) == 2
+        assert gaps.earliest(100) == (720, 840)
+        assert gaps.earliest(181) is None
+        assert gaps.fitting(120) == [(720, 840), (900, 1080)]
+
+    def test_empty(self):
+        gaps = DayGaps([])
+        assert gaps.max_gap == 0
+        assert gaps.earliest(1) is None
+        assert gaps.fitting(1) == []
+
+
+class TestMaxSegmentTree:
+    def test_first_at_least_matches_linear_scan(self):
+        """Сверка спуска по дереву с линейным поиском на случайных данных."""
+        rng = random.Random(3)
+        values = [rng.randint(0, 300) for _ in range(37)]
+        tree = MaxSegmentTree(values)
+
+        for _ in range(200):
+            if rng.random() < 0.3:
+                position = rng.randrange(len(values))
+                values[position] = rng.randint(0, 300)
+                tree.update(position, values[position])
+
+            value, lo = rng.randint(0, 320), rng.randrange(len(values))
+            hi = rng.randint(lo, len(values))
+            expected = next((i for i in range(lo, hi) if values[i] >= value), None)
+            assert tree.first_at_least(value, lo=lo, hi=hi) == expected
+
+
+class TestGapIndex:
+    def test_days_fitting(self, mock_schedule):
+        gaps = GapIndex(ScheduleIndex(mock_schedule))
+        assert [day.id for day in gaps.iter_days_fitting(120)] == [1, 3]
+        assert [day.id for day in gaps.iter_days_fitting(61, date_from="2024-01-02")] == [3]
+        assert [day.id for day in gaps.iter_days_fitting(61, date_to="2024-01-02")] == [1]
+        assert list(gaps.iter_days_fitting(200)) == []
+
+    def test_earliest_slot(self, mock_schedule):
+        gaps = GapIndex(ScheduleIndex(mock_schedule))
+        day, start, end = gaps.earliest_slot(90)  # type: ignore[misc]
+        assert (day.id, start, end) == (1, 720, 840)
+        assert gaps.earliest_slot(90, date_from="2024-01-02") == (gaps._days[2], 600, 720)
+
+    def test_incremental_update(self, mock_schedule):
+        """Добавление и удаление слота пересчитывает только затронутый день."""
+        index = ScheduleIndex(mock_schedule)
+        gaps = GapIndex(index)
+
+        index.add_timeslot(slot_id=10, day_id=3, start_minutes=630, end_minutes=660)
+        assert [day.id for day in gaps.iter_days_fitting(120)] == [1]
+
+        index.remove_timeslot(day_id=1, slot_id=2)
+        assert gaps.get_day_gaps(1).max_gap == 360  # type: ignore[union-attr]
+        assert gaps.earliest_slot(300) == (index.get_day_by_id(1), 720, 1080)
+
+
+class TestFindEarliestTimeslot:
+    def test_processor(self, mock_schedule):
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        assert processor.find_earliest_timeslot_for_duration(150) == {
+            "date": "2024-01-01", "start": "15:00", "end": "18:00"
+        }
+        assert processor.find_earliest_timeslot_for_duration(100, date_from="2024-01-02") == {
+            "date": "2024-01-03", "start": "10:00", "end": "12:00"
+        }
+        assert processor.find_earliest_timeslot_for_duration(600) is None
+
+    def test_range_after_update(self, mock_schedule):
+        """Поиск по диапазону учитывает слоты, добавленные после построения индекса."""
+        index = ScheduleIndex(mock_schedule)
+        processor = ScheduleProcessor(schedule=index)
+        assert len(list(processor.iter_timeslots_for_duration_range("2024-01-01", "2024-01-03", 120))) == 3
+
+        index.add_timeslot(slot_id=11, day_id=1, start_minutes=900, end_minutes=1000)
+        assert list(processor.iter_timeslots_for_duration_range("2024-01-01", "2024-01-03", 120)) == [
+            {"date": "2024-01-01", "start": "12:00", "end": "14:00"},
+            {"date": "2024-01-03", "start": "10:00", "end": "12:00"}
+        ]
+        assert processor.is_interval_available("2024-01-01", "15:30", "16:00") is False
@@ -0,0 +1,69 @@
+import pytest
+
+from src.dto import EmploymentScheduleDTO
+from src.group import GroupScheduleProcessor
+from src.models import Day, Timeslot
+
+
+@pytest.fixture(scope="function")
+def processor() -> GroupScheduleProcessor:
+    """Фикстура группы из трёх сотрудников с разными рабочими днями."""
+    first = EmploymentScheduleDTO(
+        days=[Day(id=1, date="2024-01-01", start="09:00", end="18:00")],
+        timeslots=[
+            Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+            Timeslot(id=2, day_id=1, start="14:00", end="15:00")
+        ]
+    )
+    second = EmploymentScheduleDTO(
+        days=[
+            Day(id=5, date="2024-01-01", start="08:00", end="17:00"),
+            Day(id=6, date="2024-01-02", start="08:00", end="17:00")
+        ],
+        timeslots=[
+            Timeslot(id=1, day_id=5, start="11:30", end="13:00"),
+            Timeslot(id=2, day_id=5, start="15:00", end="15:30")
+        ]
+    )
+    third = EmploymentScheduleDTO(
+        days=[Day(id=1, date="2024-01-01", start="09:30", end="20:00")],
+        timeslots=[Timeslot(id=1, day_id=1, start="16:00", end="16:10")]
+    )
+    return GroupScheduleProcessor({"first": first, "second": second, "third": third})
+
+
+class TestGroupScheduleProcessor:
+    def test_common_free_timeslots(self, processor):
+        """Проверка общего свободного времени всей группы."""
+        assert processor.get_common_free_timeslots("2024-01-01") == [
+            {"start": "09:30", "end": "10:00"},
+            {"start": "13:00", "end": "14:00"},
+            {"start": "15:30", "end": "16:00"},
+            {"start": "16:10", "end": "17:00"}
+        ]
+
+    def test_common_free_timeslots_subset(self, processor):
+        """Проверка общего свободного времени части группы."""
+        assert processor.get_common_free_timeslots("2024-01-01", ["first", "third"]) == [
+            {"start": "09:30", "end": "10:00"},
+            {"start": "12:00", "end": "14:00"},
+            {"start": "15:00", "end": "16:00"},
+            {"start": "16:10", "end": "18:00"}
+        ]
+
+    def test_not_working_day(self, processor):
+        """Если у кого-то из группы дата не рабочая, общего времени нет."""
+        assert processor.get_common_free_timeslots("2024-01-02") == []
+        assert processor.get_common_free_timeslots("2024-01-02", ["second"]) == [{"start": "08:00", "end": "17:00"}]
+
+    def test_search_common_timeslots_for_duration(self, processor):
+        """Проверка поиска общего окна заданной продолжительности."""
+        assert processor.search_common_timeslots_for_duration("2024-01-01", 50) == [
+            {"start": "13:00", "end": "14:00"},
+            {"start": "16:10", "end": "17:00"}
+        ]
+
+    def test_unknown_employee(self, processor):
+        """Проверка ошибки для неизвестного сотрудника."""
+        with pytest.raises(ValueError, match="Сотрудник nobody не найден"):
+            processor.get_common_free_timeslots("2024-01-01", ["first", "nobody"])
@@ -0,0 +1,73 @@
+from typing import List
+
+import pytest
+
+from src.index import ScheduleIndex
+from src.dto import EmploymentScheduleDTO
+from src.models import Day, Timeslot
+
+
+@pytest.fixture(scope="function")
+def mock_schedule() -> EmploymentScheduleDTO:
+    """Фикстура расписания с неотсортированными слотами."""
+    days = [
+        Day(id=1, date="2024-01-01", start="09:00", end="18:00"),
+        Day(id=2, date="2024-01-02", start="08:00", end="17:00")
+    ]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="14:00", end="15:00"),
+        Timeslot(id=2, day_id=2, start="09:00", end="11:00"),
+        Timeslot(id=3, day_id=1, start="10:00", end="12:00")
+    ]
+    return EmploymentScheduleDTO(days=days, timeslots=timeslots)
+
+
+class TestScheduleIndex:
+    def test_get_day(self, mock_schedule):
+        """Проверка поиска дня по дате и по идентификатору."""
+        index = ScheduleIndex(mock_schedule)
+        assert index.get_day("2024-01-02").id == 2  # type: ignore[union-attr]
+        assert index.get_day_by_id(1).date == "2024-01-01"  # type: ignore[union-attr]
+        assert index.get_day("2024-01-03") is None
+
+    def test_get_timeslots_sorted(self, mock_schedule):
+        """Проверка, что слоты дня отсортированы по началу."""
+        index = ScheduleIndex(mock_schedule)
+        assert [timeslot.id for timeslot in index.get_timeslots(1)] == [3, 1]
+
+    def test_get_timeslots_unknown_day(self, mock_schedule):
+        """Проверка дня без занятых слотов."""
+        index = ScheduleIndex(mock_schedule)
+        assert index.get_timeslots(42) == []
+
+    def test_add_and_remove_timeslot(self, mock_schedule):
+        """Проверка вставки слота с сохранением сортировки и его удаления."""
+        index = ScheduleIndex(mock_schedule)
+        changed: List[int] = []
+        index.add_listener(changed.append)
+
+        index.add_timeslot(slot_id=9, day_id=1, start_minutes=780, end_minutes=800)
+        assert [timeslot.id for timeslot in index.get_timeslots(1)] == [3, 9, 1]
+
+        removed = index.remove_timeslot(day_id=1, slot_id=3)
+        assert (removed.start, removed.end) == ("10:00", "12:00")
+        assert index.get_intervals(1) == [(780, 800), (840, 900)]
+        assert changed == [1, 1]
+
+        with pytest.raises(ValueError, match="Слот 3 не найден"):
+            index.remove_timeslot(day_id=1, slot_id=3)
+
+    def test_find_timeslot_day(self, mock_schedule):
+        """Обратный индекс слот -> день следует за добавлением, переносом и удалением слотов и дней."""
+        index = ScheduleIndex(mock_schedule)
+        assert index.find_timeslot_day(2) == 2
+
+        index.modify_timeslot(slot_id=3, day_id=2, start_minutes=600, end_minutes=660)
+        index.add_timeslot(slot_id=9, day_id=1, start_minutes=780, end_minutes=800)
+        assert (index.find_timeslot_day(3), index.find_timeslot_day(9)) == (2, 1)
+
+        index.remove_day(day_id=2)
+        for slot_id in (2, 3):
+            with pytest.raises(ValueError, match=f"Слот {slot_id} не найден в расписании"):
+                index.find_timeslot_day(slot_id)
+        assert index.find_timeslot_day(1) == 1
@@ -0,0 +1,218 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+import pytest
+
+from src.ingest import ingest_employee_schedules
+
+SHARDS = {
+    "/alice/2024-01": {
+        "days": [{"id": 1, "date": "2024-01-31", "start": "09:00", "end": "18:00"}],
+        "timeslots": [{"id": 1, "day_id": 1, "start": "10:00", "end": "12:00"}]
+    },
+    "/alice/2024-02": {
+        "days": [{"id": 2, "date": "2024-02-01", "start": "09:00", "end": "18:00"}],
+        "timeslots": [
+            {"id": 2, "day_id": 2, "start": "10:00", "end": "11:00"},
+            {"id": 3, "day_id": 2, "start": "10:30", "end": "12:00"}
+        ]
+    },
+    "/alice/2024-02-overlap": {
+        "days": [
+            {"id": 1, "date": "2024-01-31", "start": "09:00", "end": "18:00"},
+            {"id": 2, "date": "2024-02-01", "start": "09:00", "end": "18:00"}
+        ],
+        "timeslots": [
+            {"id": 1, "day_id": 1, "start": "10:00", "end": "12:00"},
+            {"id": 2, "day_id": 2, "start": "10:00", "end": "11:00"},
+            {"id": 3, "day_id": 2, "start": "10:30", "end": "12:00"}
+        ]
+    },
+    "/alice/2024-03-conflict": {
+        "days": [{"id": 1, "date": "2024-03-01", "start": "09:00", "end": "18:00"}],
+        "timeslots": []
+    },
+    "/broken": {"days": [], "timeslots": []},
+    "/bob/2024-01": {
+        "days": [{"id": 5, "date": "2024-01-15", "start": "09:00", "end": "18:00"}],
+        "timeslots": [{"id": 7, "day_id": 5, "start": "13:00", "end": "14:00"}]
+    }
+}
+
+
+class StubShardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = Lock()
+    requests: list = []
+    connections: set = set()
+    failures: dict = {}
+
+    def do_GET(self):
+        with self.lock:
+            self.requests.append(self.path)
+            self.connections.add(self.client_address)
+            failures = self.failures.get(self.path, 0)
+            self.failures[self.path] = max(failures - 1, 0)
+
+        if failures or self.path not in SHARDS:
+            self.send_response(503 if failures else 404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = json.dumps(SHARDS[self.path]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+
+        if self.path == "/broken":
+            # Размер чанка не шестнадцатеричное число: ответ нельзя разобрать
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b"zz\r\n" + payload + b"\r\n0\r\n\r\n")
+            return
+
+        if self.path.startswith("/bob"):
+            # Один из шардов отдаётся чанками, как это делают потоковые апстримы
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(payload), 16):
+                chunk = payload[start:start + 16]
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="function")
+def upstream_url():
+    """Фикстура локальной заглушки, отдающей помесячные шарды расписаний."""
+    StubShardHandler.requests = []
+    StubShardHandler.connections = set()
+    StubShardHandler.failures = {}
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubShardHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestIngest:
+    def test_merges_shards_per_employee(self, upstream_url):
+        """Шарды сотрудника склеиваются в одно расписание и нормализуются."""
+        responses = ingest_employee_schedules(
+            {
+                "alice": [f"{upstream_url}/alice/2024-01", f"{upstream_url}/alice/2024-02"],
+                "bob": [f"{upstream_url}/bob/2024-01"]
+            },
+            backoff=0.01
+        )
+
+        alice = responses["alice"]
+        assert alice.error is None
+        assert sorted(day.id for day in alice.result.days) == [1, 2]  # type: ignore[union-attr]
+        assert sorted(alice.result.timeslots.starts) == [600, 600]  # type: ignore[union-attr]
+        assert [conflict.kind for conflict in alice.normalization.conflicts] == ["overlap"]  # type: ignore[union-attr]
+
+        bob = responses["bob"]
+        assert bob.error is None
+        assert list(bob.result.timeslots.ends) == [840]  # type: ignore[union-attr]
+
+    def test_overlapping_shards(self, upstream_url):
+        """День и слоты, повторённые в соседних шардах, учитываются один раз."""
+        responses = ingest_employee_schedules(
+            {"alice": [f"{upstream_url}/alice/2024-01", f"{upstream_url}/alice/2024-02-overlap"]},
+            backoff=0.01
+        )
+
+        alice = responses["alice"]
+        assert alice.error is None
+        assert sorted(day.id for day in alice.result.days) == [1, 2]  # type: ignore[union-attr]
+        assert sorted(zip(alice.result.timeslots.starts, alice.result.timeslots.ends)) == [  # type: ignore[union-attr]
+            (600, 720), (600, 720)
+        ]
+        assert [conflict.kind for conflict in alice.normalization.conflicts] == ["overlap"]  # type: ignore[union-attr]
+
+    def test_conflicting_shards(self, upstream_url):
+        """Один id дня с разными датами в разных шардах — ошибка сотрудника, а не склейка."""
+        responses = ingest_employee_schedules(
+            {
+                "alice": [f"{upstream_url}/alice/2024-01", f"{upstream_url}/alice/2024-03-conflict"],
+                "bob": [f"{upstream_url}/bob/2024-01"]
+            },
+            concurrency=1,
+            backoff=0.01
+        )
+
+        assert "День 1 по-разному записан в шардах расписания" in responses["alice"].error  # type: ignore[operator]
+        assert responses["alice"].result is None
+        assert responses["bob"].error is None
+
+    def test_corrupt_chunked_response(self, upstream_url):
+        """Испорченный чанкованный ответ помечает ошибкой только своего сотрудника."""
+        responses = ingest_employee_schedules(
+            {"carol": [f"{upstream_url}/broken"], "bob": [f"{upstream_url}/bob/2024-01"]},
+            backoff=0.01
+        )
+
+        assert "Некорректный ответ HTTP" in responses["carol"].error  # type: ignore[operator]
+        assert responses["bob"].error is None
+        assert list(responses["bob"].result.timeslots.ends) == [840]  # type: ignore[union-attr]
+
+    def test_retry_after_temporary_error(self, upstream_url):
+        """Временная ошибка апстрима повторяется с задержкой."""
+        StubShardHandler.failures = {"/bob/2024-01": 2}
+
+        responses = ingest_employee_schedules({"bob": [f"{upstream_url}/bob/2024-01"]}, retries=2, backoff=0.01)
+
+        assert responses["bob"].error is None
+        assert StubShardHandler.requests.count("/bob/2024-01") == 3
+
+    def test_retries_exhausted(self, upstream_url):
+        StubShardHandler.failures = {"/bob/2024-01": 5}
+
+        responses = ingest_employee_schedules({"bob": [f"{upstream_url}/bob/2024-01"]}, retries=1, backoff=0.01)
+
+        assert "503" in responses["bob"].error  # type: ignore[operator]
+        assert StubShardHandler.requests.count("/bob/2024-01") == 2
+
+    def test_failed_shard_does_not_affect_others(self, upstream_url):
+        """Постоянная ошибка шарда помечает только своего сотрудника и не повторяется."""
+        responses = ingest_employee_schedules(
+            {
+                "alice": [f"{upstream_url}/alice/2024-01", f"{upstream_url}/alice/2024-03"],
+                "bob": [f"{upstream_url}/bob/2024-01"]
+            },
+            backoff=0.01
+        )
+
+        assert "404" in responses["alice"].error  # type: ignore[operator]
+        assert responses["alice"].result is None
+        assert responses["bob"].error is None
+        assert StubShardHandler.requests.count("/alice/2024-03") == 1
+
+    def test_keep_alive_reuses_connections(self, upstream_url):
+        """При ограниченной конкурентности соединения переиспользуются между шардами."""
+        ingest_employee_schedules(
+            {
+                "alice": [f"{upstream_url}/alice/2024-01", f"{upstream_url}/alice/2024-02"],
+                "bob": [f"{upstream_url}/bob/2024-01"]
+            },
+            concurrency=1
+        )
+
+        assert len(StubShardHandler.requests) == 3
+        assert len(StubShardHandler.connections) == 1
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            ingest_employee_schedules({"bob": ["http://127.0.0.1:1/"]}, concurrency=0)
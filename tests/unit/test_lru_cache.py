@@ -0,0 +1,39 @@
+import pytest
+
+from src.common.lru_cache import LRUCache
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        """При переполнении вытесняется запись, к которой дольше всего не обращались."""
+        cache: LRUCache[int] = LRUCache(max_size=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 0)
+        cache.get_or_compute("c", lambda: 3)
+
+        assert cache.get_or_compute("a", lambda: 0) == 1
+        assert cache.get_or_compute("b", lambda: 20) == 20
+        assert cache.stats() == {"hits": 2, "misses": 4, "size": 2, "max_size": 2}
+
+    def test_invalidate_and_clear(self):
+        cache: LRUCache[int] = LRUCache(max_size=4)
+        for key in range(4):
+            cache.get_or_compute(key, lambda: key)
+
+        assert cache.invalidate(lambda key: key % 2 == 0) == 2  # type: ignore[operator]
+        assert len(cache) == 2
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_zero_size_disables_storage(self):
+        cache: LRUCache[int] = LRUCache(max_size=0)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("a", lambda: 1)
+
+        assert cache.stats() == {"hits": 0, "misses": 2, "size": 0, "max_size": 0}
+
+    def test_negative_size(self):
+        with pytest.raises(ValueError, match="Размер кэша не может быть отрицательным"):
+            LRUCache(max_size=-1)
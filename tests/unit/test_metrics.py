@@ -0,0 +1,132 @@
+import json
+from io import StringIO
+
+import pytest
+
+from src.batch import execute_query
+from src.common.metrics import METRICS, MetricsRegistry, json_log_sink, render_prometheus, timed, write_prometheus_file
+from src.dto import EmploymentScheduleDTO
+from src.models import Day, Timeslot
+from src.processor import ScheduleProcessor
+from src.main import main
+from src.server import ScheduleService
+from src.snapshot import save_snapshot
+
+
+@pytest.fixture(scope="function")
+def enabled_metrics():
+    """Фикстура включает общий реестр метрик на время теста и очищает его после."""
+    METRICS.enabled = True
+    METRICS.reset()
+    yield METRICS
+    METRICS.enabled = False
+    METRICS.reset()
+
+
+@pytest.fixture(scope="function")
+def processor() -> ScheduleProcessor:
+    """Фикстура процессора над расписанием на один день."""
+    days = [Day(id=1, date="2024-01-01", start="09:00", end="18:00")]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+        Timeslot(id=2, day_id=1, start="14:00", end="15:00")
+    ]
+    return ScheduleProcessor(schedule=EmploymentScheduleDTO(days=days, timeslots=timeslots))
+
+
+class TestMetricsRegistry:
+    def test_disabled_registry_is_noop(self):
+        """Выключенный реестр ничего не копит и отдаёт общий пустой контекст."""
+        registry = MetricsRegistry(enabled=False)
+        registry.increment("queries")
+        registry.observe("parse", 0.5)
+
+        assert registry.timer("parse") is registry.timer("fetch")
+        assert registry.counters == {}
+        assert render_prometheus(registry) == ""
+
+    def test_counters_histograms_and_json_log(self):
+        registry = MetricsRegistry(enabled=True)
+        log = StringIO()
+        registry.add_sink(json_log_sink(log))
+
+        registry.increment("queries", 2)
+        registry.observe("parse", 0.003)
+        registry.observe("parse", 20.0)
+        with registry.timer("fetch"):
+            pass
+
+        counters, histograms = registry.collect()
+        assert counters == {"queries": 2}
+        assert histograms["parse"].count == 2
+        assert histograms["parse"].counts[-1] == 1
+
+        records = [json.loads(line) for line in log.getvalue().splitlines()]
+        assert [record["stage"] for record in records] == ["parse", "parse", "fetch"]
+        assert records[0]["duration_ms"] == 3.0
+
+    def test_prometheus_text(self, tmp_path):
+        registry = MetricsRegistry(enabled=True)
+        registry.increment("cache_hits")
+        registry.observe("parse", 0.003)
+
+        text = render_prometheus(registry)
+
+        assert "# TYPE schedule_cache_hits_total counter\nschedule_cache_hits_total 1\n" in text
+        assert 'schedule_stage_seconds_bucket{stage="parse",le="0.0025"} 0' in text
+        assert 'schedule_stage_seconds_bucket{stage="parse",le="0.005"} 1' in text
+        assert 'schedule_stage_seconds_count{stage="parse"} 1' in text
+
+        metrics_path = tmp_path / "metrics.prom"
+        write_prometheus_file(str(metrics_path), registry)
+        assert metrics_path.read_text(encoding="utf-8") == text
+
+
+class TestInstrumentation:
+    def test_timed_decorator(self, enabled_metrics):
+        @timed("custom")
+        def work(value):
+            return value * 2
+
+        assert work(21) == 42
+        assert enabled_metrics.histograms["custom"].count == 1
+
+    def test_query_stages_and_counters(self, enabled_metrics, processor):
+        """Запросы учитываются по действиям, вместе с попаданиями в кэш и просмотренными слотами."""
+        for _ in range(2):
+            execute_query(processor, {"action": 2, "date": "2024-01-01"})
+
+        counters, histograms = enabled_metrics.collect()
+        assert histograms["action_2"].count == 2
+        assert counters["queries"] == 2
+        assert counters["cache_hits"] == 1
+        assert counters["cache_misses"] == 2
+        assert counters["slots_scanned"] == 2
+
+    def test_metrics_endpoint(self, enabled_metrics, processor):
+        service = ScheduleService(loader=lambda: EmploymentScheduleDTO(days=[], timeslots=[]))
+
+        status, body = service.handle("GET", "/metrics")
+
+        assert status == 200
+        assert isinstance(body, str)
+        assert "schedule_http_requests_total 1" in body
+
+
+class TestMetricsLog:
+    def test_log_complete_after_main(self, enabled_metrics, tmp_path):
+        """После возврата из main лог метрик дописан и закрыт, в том числе при выходе с ошибкой."""
+        days = [Day(id=1, date="2024-01-01", start="09:00", end="18:00")]
+        snapshot_path, log_path = str(tmp_path / "schedule.snapshot"), tmp_path / "metrics.jsonl"
+        save_snapshot(EmploymentScheduleDTO(days=days, timeslots=[]), snapshot_path)
+
+        report_args = ["--report", "day", "--output", str(tmp_path / "report.json"), "--metrics-log", str(log_path)]
+
+        main(["--snapshot", snapshot_path, *report_args])
+        with pytest.raises(SystemExit):
+            main(["--snapshot", str(tmp_path / "missing.snapshot"), *report_args])
+
+        records = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+        assert {"snapshot_load", "analytics_build"} <= {record.get("stage") for record in records}
+        assert records[-1]["event"] == "error" and records[-1]["stage"] == "snapshot"
+        assert enabled_metrics._sinks == []
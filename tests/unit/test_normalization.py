@@ -0,0 +1,85 @@
+import pytest
+
+from src.dto import EmploymentScheduleDTO, ScheduleConflict
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot, ColumnarTimeslots
+from src.normalization import normalize_schedule
+from src.processor import ScheduleProcessor
+
+
+@pytest.fixture(scope="function")
+def raw_schedule() -> EmploymentScheduleDTO:
+    """Фикстура расписания с дублями, пересечениями, соседними слотами и слотами вне дня."""
+    days = [
+        Day(id=1, date="2024-01-02", start="09:00", end="18:00"),
+        Day(id=2, date="2024-01-01", start="09:00", end="12:00")
+    ]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="10:00", end="11:00"),
+        Timeslot(id=2, day_id=1, start="10:00", end="11:00"),
+        Timeslot(id=3, day_id=1, start="13:00", end="14:00"),
+        Timeslot(id=4, day_id=1, start="12:00", end="13:00"),
+        Timeslot(id=5, day_id=1, start="13:30", end="15:00"),
+        Timeslot(id=6, day_id=1, start="17:30", end="19:00"),
+        Timeslot(id=7, day_id=2, start="08:00", end="08:30"),
+        Timeslot(id=8, day_id=2, start="11:00", end="11:00"),
+        Timeslot(id=9, day_id=3, start="10:00", end="11:00")
+    ]
+    return EmploymentScheduleDTO(days=days, timeslots=timeslots)
+
+
+class TestNormalizeSchedule:
+    def test_merge_clip_and_conflicts(self, raw_schedule):
+        """Слоты склеиваются и обрезаются по дню, нарушения попадают в отчёт."""
+        schedule, report = normalize_schedule(raw_schedule)
+
+        assert [(slot.id, slot.day_id, slot.start, slot.end) for slot in schedule.timeslots or []] == [
+            (1, 1, "10:00", "11:00"),
+            (4, 1, "12:00", "15:00"),
+            (6, 1, "17:30", "18:00")
+        ]
+        assert report.input_slots == 9
+        assert report.output_slots == 3
+        assert report.conflicts == [
+            ScheduleConflict(kind="clipped", day_id=1, slot_ids=[6]),
+            ScheduleConflict(kind="outside", day_id=2, slot_ids=[7]),
+            ScheduleConflict(kind="empty", day_id=2, slot_ids=[8]),
+            ScheduleConflict(kind="orphan", day_id=3, slot_ids=[9]),
+            ScheduleConflict(kind="duplicate", day_id=1, slot_ids=[1, 2]),
+            ScheduleConflict(kind="overlap", day_id=1, slot_ids=[4, 3, 5])
+        ]
+
+    def test_duplicate_days(self):
+        """Повторная запись дня не склеивает его слоты второй раз, а попадает в отчёт отдельным конфликтом."""
+        day = Day(id=1, date="2024-01-01", start="09:00", end="18:00")
+        timeslots = [Timeslot(id=1, day_id=1, start="10:00", end="11:00")]
+
+        schedule, report = normalize_schedule(EmploymentScheduleDTO(days=[day, day, day], timeslots=timeslots))
+
+        assert schedule.days == [day]
+        assert [(slot.start, slot.end) for slot in schedule.timeslots or []] == [("10:00", "11:00")]
+        assert report.conflicts == [ScheduleConflict(kind="duplicate_day", day_id=1, slot_ids=[])] * 2
+
+    def test_columnar_output(self, raw_schedule):
+        schedule, _ = normalize_schedule(raw_schedule, columnar=True)
+
+        assert isinstance(schedule.timeslots, ColumnarTimeslots)
+        assert ScheduleIndex(schedule).get_intervals(1) == [(600, 660), (720, 900), (1050, 1080)]
+
+    def test_free_time_is_unchanged(self, raw_schedule):
+        """Нормализация не меняет свободное время и доступность промежутков."""
+        raw = ScheduleProcessor(schedule=raw_schedule)
+        normalized = ScheduleProcessor(schedule=normalize_schedule(raw_schedule)[0])
+
+        assert normalized.get_free_timeslots("2024-01-02") == raw.get_free_timeslots("2024-01-02")
+        assert normalized.search_timeslots_for_duration("2024-01-02", 30) == (
+            raw.search_timeslots_for_duration("2024-01-02", 30)
+        )
+        # Пустой слот больше не делит свободное время дня на два промежутка
+        assert normalized.get_free_timeslots("2024-01-01") == [{"start": "09:00", "end": "12:00"}]
+        assert normalized.is_interval_available("2024-01-02", "15:00", "17:30") is True
+        assert normalized.get_busy_timeslots("2024-01-02") == [
+            {"start": "10:00", "end": "11:00"},
+            {"start": "12:00", "end": "15:00"},
+            {"start": "17:30", "end": "18:00"}
+        ]
@@ -0,0 +1,92 @@
+import json
+from io import StringIO
+
+import pytest
+
+from src.batch import run_batch
+from src.dto import EmploymentScheduleDTO
+from src.models import Day, Timeslot
+from src.parallel import run_parallel_batch
+from src.processor import ScheduleProcessor
+from src.snapshot import save_snapshot
+
+
+@pytest.fixture(scope="function")
+def schedules() -> dict:
+    """Фикстура расписаний двух сотрудников."""
+    return {
+        "alice": EmploymentScheduleDTO(
+            days=[
+                Day(id=1, date="2024-01-01", start="09:00", end="18:00"),
+                Day(id=2, date="2024-01-02", start="09:00", end="18:00")
+            ],
+            timeslots=[
+                Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+                Timeslot(id=2, day_id=2, start="13:00", end="14:00")
+            ]
+        ),
+        "bob": EmploymentScheduleDTO(
+            days=[Day(id=7, date="2024-01-01", start="08:00", end="12:00")],
+            timeslots=[Timeslot(id=9, day_id=7, start="08:00", end="09:30")]
+        )
+    }
+
+
+@pytest.fixture(scope="function")
+def snapshot_paths(tmp_path, schedules) -> dict:
+    """Фикстура снимков расписаний, из которых читают воркеры."""
+    paths = {}
+    for employee_id, schedule in schedules.items():
+        paths[employee_id] = str(tmp_path / f"{employee_id}.snapshot")
+        save_snapshot(schedule=schedule, file_path=paths[employee_id])
+    return paths
+
+
+class TestRunParallelBatch:
+    def test_matches_sequential_order(self, snapshot_paths, schedules):
+        """Ответы совпадают с последовательной обработкой и идут в порядке запросов."""
+        queries = []
+        for number in range(40):
+            employee = ("alice", "bob")[number % 2]
+            date = "2024-01-01" if employee == "bob" else ("2024-01-01", "2024-01-02")[number % 4 // 2]
+            queries.append({"id": number, "employee": employee, "action": number % 4 + 1, "date": date,
+                            "start": "09:00", "end": "10:00", "duration": 30})
+        lines = [json.dumps(query) + "\n" for query in queries]
+        output = StringIO()
+
+        processed = run_parallel_batch(snapshot_paths, lines, output, workers=2, chunk_size=3)
+
+        answers = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert processed == 40
+        assert [answer["id"] for answer in answers] == list(range(40))
+
+        for employee_id, schedule in schedules.items():
+            expected_output = StringIO()
+            run_batch(
+                ScheduleProcessor(schedule=schedule),
+                [line for line, query in zip(lines, queries) if query["employee"] == employee_id],
+                expected_output
+            )
+            expected = [json.loads(line) for line in expected_output.getvalue().splitlines()]
+            assert [answer for answer in answers if answer["id"] % 2 == ("alice", "bob").index(employee_id)] == expected
+
+    def test_single_snapshot_and_errors(self, snapshot_paths):
+        lines = [
+            json.dumps({"id": "a", "action": 1, "date": "2024-01-02"}) + "\n",
+            "\n",
+            "not json\n",
+            json.dumps({"id": "b", "employee": "carol", "action": 1, "date": "2024-01-02"}) + "\n"
+        ]
+        output = StringIO()
+
+        processed = run_parallel_batch(snapshot_paths["alice"], lines, output, workers=2)
+
+        answers = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert processed == 3
+        assert answers[0] == {"id": "a", "result": [{"start": "13:00", "end": "14:00"}], "error": None}
+        assert answers[1]["error"] is not None
+        assert answers[2] == {"id": "b", "result": None, "error": "Сотрудник carol не найден"}
+
+    def test_invalid_chunk_size(self, snapshot_paths):
+        with pytest.raises(ValueError, match="Размер блока запросов должен быть положительным"):
+            run_parallel_batch(snapshot_paths, [], StringIO(), chunk_size=0)
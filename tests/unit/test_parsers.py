@@ -0,0 +1,91 @@
+import json
+from io import BytesIO, StringIO
+
+import pytest
+
+from src.common.json_stream import iter_json_arrays
+from src.models import ColumnarTimeslots
+from src.parsers import employment_schedule_parser, stream_employment_schedule_parser
+
+
+class TestEmploymentScheduleParser:
+    def test_minutes_computed_on_load(self):
+        """Проверка, что минуты рассчитываются при разборе расписания."""
+        data = {
+            "days": [{"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:30"}],
+            "timeslots": [{"id": 1, "day_id": 1, "start": "10:15", "end": "12:00"}]
+        }
+        result = employment_schedule_parser(data)
+        day = result.days[0]  # type: ignore[index]
+        timeslot = result.timeslots[0]  # type: ignore[index]
+        assert (day.start_minutes, day.end_minutes) == (540, 1110)
+        assert (timeslot.start_minutes, timeslot.end_minutes) == (615, 720)
+
+    def test_columnar_storage(self):
+        """Проверка колоночного представления слотов."""
+        data = {
+            "days": [{"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"}],
+            "timeslots": [
+                {"id": 1, "day_id": 1, "start": "14:00", "end": "15:00"},
+                {"id": 2, "day_id": 1, "start": "10:00", "end": "12:00"}
+            ]
+        }
+        result = employment_schedule_parser(data, columnar=True)
+        assert isinstance(result.timeslots, ColumnarTimeslots)
+        assert list(result.timeslots.starts) == [840, 600]
+        row = result.timeslots[1]
+        assert (row.id, row.day_id, row.start, row.end) == (2, 1, "10:00", "12:00")
+
+
+class TestStreamEmploymentScheduleParser:
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_matches_full_parser(self, columnar: bool):
+        """Проверка, что потоковый разбор совпадает с разбором готового словаря."""
+        data = {
+            "meta": {"version": 12, "tags": ["a", "b"]},
+            "days": [
+                {"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"},
+                {"id": 2, "date": "2024-01-02", "start": "08:00", "end": "17:00"}
+            ],
+            "timeslots": [
+                {"id": 1, "day_id": 1, "start": "14:00", "end": "15:00"},
+                {"id": 2, "day_id": 2, "start": "09:00", "end": "11:00"}
+            ],
+            "total": 12345
+        }
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode()
+        expected = employment_schedule_parser(data, columnar=columnar)
+
+        records = list(iter_json_arrays(BytesIO(payload), keys=("days", "timeslots"), chunk_size=7))
+        result = stream_employment_schedule_parser(BytesIO(payload), columnar=columnar)
+
+        assert len(records) == 4
+        assert result.days == expected.days
+        assert [(row.id, row.start, row.end) for row in result.timeslots] == [  # type: ignore[union-attr]
+            (row.id, row.start, row.end) for row in expected.timeslots  # type: ignore[union-attr]
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 14])
+    def test_numbers_split_between_chunks(self, chunk_size: int):
+        """Дробные числа и экспоненты, разрезанные границей чанка, дочитываются целиком."""
+        payload = b'{"version": 1.5, "scale": 12e-3, "days": [{"id": 1, "weight": 2.25E+2}, {"id": -7}], "total": 10}'
+
+        records = list(iter_json_arrays(BytesIO(payload), keys=("days",), chunk_size=chunk_size))
+
+        assert records == [("days", {"id": 1, "weight": 225.0}), ("days", {"id": -7})]
+
+    @pytest.mark.parametrize("payload", [b'{"days": []} x', b'{} {}', b'{"days": []}]'])
+    def test_trailing_content(self, payload: bytes):
+        with pytest.raises(ValueError, match="лишние данные после конца документа"):
+            list(iter_json_arrays(BytesIO(payload), keys=("days",), chunk_size=1))
+
+    def test_empty_arrays(self):
+        """Проверка разбора расписания без записей."""
+        result = stream_employment_schedule_parser(StringIO('{"days": [], "timeslots": []}'))
+        assert result.days == []
+        assert result.timeslots == []
+
+    def test_invalid_json(self):
+        """Проверка ошибки на некорректном JSON."""
+        with pytest.raises(ValueError):
+            stream_employment_schedule_parser(StringIO('{"days": [{"id": 1'))
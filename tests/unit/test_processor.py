@@ -2,7 +2,9 @@ import pytest
 
 from src.processor import ScheduleProcessor
 from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex
 from src.models import Day, Timeslot
+from src.parsers import employment_schedule_parser
 
 
 @pytest.fixture(scope="function")
@@ -127,3 +129,162 @@ class TestScheduleProcessor:
             processor.get_response()
         captured = capsys.readouterr()
         assert "Неизвестный запрос действия!" in captured.out
+
+    def test_positional_arguments(self, monkeypatch, mock_schedule):
+        """Позиционный вызов (action, schedule) работает, размер кэша передаётся только по имени."""
+        monkeypatch.setattr("builtins.input", lambda _: "2024-01-01")
+
+        assert ScheduleProcessor(1, mock_schedule).get_response().result == [
+            {"start": "10:00", "end": "12:00"},
+            {"start": "14:00", "end": "15:00"}
+        ]
+        with pytest.raises(TypeError):
+            ScheduleProcessor(1, mock_schedule, 16)  # type: ignore[misc]
+        with pytest.raises(TypeError, match="Не передано расписание"):
+            ScheduleProcessor(action=1)
+
+    def test_columnar_schedule(self, monkeypatch):
+        """Проверка работы процессора на колоночном расписании."""
+        data = {
+            "days": [{"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"}],
+            "timeslots": [
+                {"id": 1, "day_id": 1, "start": "14:00", "end": "15:00"},
+                {"id": 2, "day_id": 1, "start": "10:00", "end": "12:00"}
+            ]
+        }
+        monkeypatch.setattr("builtins.input", lambda _: "2024-01-01")
+        processor = ScheduleProcessor(action=2, schedule=employment_schedule_parser(data, columnar=True))
+        response = processor.get_response()
+        expected = [
+            {"start": "09:00", "end": "10:00"},
+            {"start": "12:00", "end": "14:00"},
+            {"start": "15:00", "end": "18:00"}
+        ]
+        assert response.result == expected
+
+
+class TestScheduleProcessorAPI:
+    def test_get_busy_timeslots(self, mock_schedule):
+        """Проверка программного получения занятых слотов."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        assert processor.get_busy_timeslots("2024-01-02") == [{"start": "09:00", "end": "11:00"}]
+
+    def test_get_free_timeslots(self, mock_schedule):
+        """Проверка программного получения свободных слотов."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        assert processor.get_free_timeslots("2024-01-02") == [
+            {"start": "08:00", "end": "09:00"},
+            {"start": "11:00", "end": "17:00"}
+        ]
+
+    @pytest.mark.parametrize(
+        "start, end, expected",
+        [
+            ("12:00", "13:00", True),
+            ("09:00", "10:00", True),
+            ("10:30", "11:30", False),
+            ("17:00", "18:30", False)
+        ]
+    )
+    def test_is_interval_available(self, mock_schedule, start: str, end: str, expected: bool):
+        """Проверка программной проверки доступности промежутка."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        assert processor.is_interval_available("2024-01-01", start, end) is expected
+
+    def test_search_timeslots_for_duration(self, mock_schedule):
+        """Проверка программного поиска слотов по продолжительности."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        assert processor.search_timeslots_for_duration("2024-01-01", 120) == [
+            {"start": "12:00", "end": "14:00"},
+            {"start": "15:00", "end": "18:00"}
+        ]
+        assert processor.search_timeslots_for_duration("2024-01-01", 181) == []
+
+    @pytest.mark.parametrize(
+        "date, error_msg",
+        [
+            ("2024-01-03", "Дата 2024-01-03 не найдена в расписании"),
+            ("01-01-2024", "Некорректный формат даты")
+        ]
+    )
+    def test_invalid_date(self, mock_schedule, date: str, error_msg: str):
+        """Проверка ошибок для некорректной или отсутствующей даты."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        with pytest.raises(ValueError, match=error_msg):
+            processor.get_free_timeslots(date)
+
+    def test_invalid_duration(self, mock_schedule):
+        """Проверка ошибки для некорректной продолжительности."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        with pytest.raises(ValueError, match="Некорректный формат продолжительности"):
+            processor.search_timeslots_for_duration("2024-01-01", 0)
+
+
+class TestScheduleProcessorRange:
+    def test_busy_range(self, mock_schedule):
+        """Проверка занятых слотов по диапазону дат."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        result = list(processor.iter_busy_timeslots_range("2023-12-01", "2024-01-31"))
+        assert result == [
+            {"date": "2024-01-01", "start": "10:00", "end": "12:00"},
+            {"date": "2024-01-01", "start": "14:00", "end": "15:00"},
+            {"date": "2024-01-02", "start": "09:00", "end": "11:00"}
+        ]
+
+    def test_free_range_single_day(self, mock_schedule):
+        """Проверка свободных слотов по диапазону из одного дня."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        result = list(processor.iter_free_timeslots_range("2024-01-02", "2024-01-02"))
+        assert result == [
+            {"date": "2024-01-02", "start": "08:00", "end": "09:00"},
+            {"date": "2024-01-02", "start": "11:00", "end": "17:00"}
+        ]
+
+    def test_duration_range_first_match(self, mock_schedule):
+        """Проверка поиска первого подходящего окна с ранней остановкой."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        timeslots = processor.iter_timeslots_for_duration_range("2024-01-01", "2024-01-02", 300)
+        assert processor.take(timeslots, limit=1) == [{"date": "2024-01-02", "start": "11:00", "end": "17:00"}]
+
+    def test_invalid_range(self, mock_schedule):
+        """Проверка ошибки для перевёрнутого диапазона дат."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        with pytest.raises(ValueError, match="Начальная дата диапазона не может быть больше конечной"):
+            processor.iter_free_timeslots_range("2024-01-02", "2024-01-01")
+
+
+class TestScheduleProcessorCache:
+    def test_repeated_queries_hit_cache(self, mock_schedule):
+        """Повторные запросы по дню берутся из кэша и учитываются в счётчиках."""
+        processor = ScheduleProcessor(schedule=mock_schedule)
+        for _ in range(3):
+            processor.get_free_timeslots("2024-01-01")
+
+        stats = processor.cache_stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+        assert stats["size"] == 2
+
+    def test_schedule_change_invalidates_only_changed_day(self, mock_schedule):
+        """Изменение слота сбрасывает кэш только своего дня."""
+        index = ScheduleIndex(mock_schedule)
+        processor = ScheduleProcessor(schedule=index)
+        processor.get_busy_timeslots("2024-01-01")
+        processor.get_busy_timeslots("2024-01-02")
+
+        index.add_timeslot(slot_id=4, day_id=1, start_minutes=960, end_minutes=1020)
+
+        assert processor.cache_stats()["size"] == 1
+        assert processor.get_busy_timeslots("2024-01-01")[-1] == {"start": "16:00", "end": "17:00"}
+        assert processor.is_interval_available("2024-01-01", "16:30", "17:30") is False
+        hits = processor.cache_stats()["hits"]
+        processor.get_busy_timeslots("2024-01-02")
+        assert processor.cache_stats()["hits"] == hits + 1
+
+    def test_cache_size_is_bounded(self, mock_schedule):
+        processor = ScheduleProcessor(schedule=mock_schedule, cache_size=1)
+        processor.get_busy_timeslots("2024-01-01")
+        processor.get_busy_timeslots("2024-01-02")
+        processor.get_busy_timeslots("2024-01-01")
+
+        assert processor.cache_stats() == {"hits": 0, "misses": 3, "size": 1, "max_size": 1}
@@ -0,0 +1,117 @@
+import pytest
+
+from src.dto import RecurringScheduleDTO
+from src.parsers import recurring_schedule_parser
+from src.processor import ScheduleProcessor
+from src.recurrence import RecurringSchedule
+
+RULES = {
+    "date_from": "2024-01-01",
+    "date_to": "2033-12-31",
+    "hours": [{"weekday": weekday, "start": "09:00", "end": "18:00"} for weekday in range(5)],
+    "blocks": [
+        {"weekdays": [0, 2, 4], "start": "13:00", "end": "14:00"},
+        {"weekdays": [0], "start": "10:00", "end": "11:00", "every_weeks": 2},
+        {"weekdays": [1], "start": "15:00", "end": "16:00", "date_from": "2024-01-09", "date_to": "2024-01-16"}
+    ],
+    "exceptions": [
+        {"date": "2024-01-03"},
+        {"date": "2024-01-05", "start": "09:00", "end": "13:00"}
+    ]
+}
+
+
+@pytest.fixture(scope="function")
+def schedule() -> RecurringScheduleDTO:
+    """Фикстура десятилетнего расписания из правил: будни, обед по пн/ср/пт, планёрка раз в две недели."""
+    return recurring_schedule_parser(RULES)
+
+
+class TestRecurringSchedule:
+    def test_expand_day(self, schedule):
+        store = RecurringSchedule(schedule)
+
+        day = store.get_day("2024-01-01")
+
+        assert (day.date, day.start, day.end) == ("2024-01-01", "09:00", "18:00")  # type: ignore[union-attr]
+        assert store.get_intervals(day.id) == [(600, 660), (780, 840)]  # type: ignore[union-attr]
+        assert store.get_day_by_id(day.id) == day  # type: ignore[union-attr]
+
+        slot_ids = [row.id for row in store.get_timeslots(day.id)]  # type: ignore[union-attr]
+        assert slot_ids == [day.id * 3, day.id * 3 + 1]  # type: ignore[union-attr]
+
+    def test_every_weeks_and_block_range(self, schedule):
+        """Блок раз в две недели пропускает нечётные недели, блок с диапазоном действует только в нём."""
+        store = RecurringSchedule(schedule)
+
+        def intervals(date):
+            return store.get_intervals(store.get_day(date).id)  # type: ignore[union-attr]
+
+        assert intervals("2024-01-08") == [(780, 840)]
+        assert intervals("2024-01-15") == [(600, 660), (780, 840)]
+        assert intervals("2024-01-02") == []
+        assert intervals("2024-01-16") == [(900, 960)]
+        assert intervals("2024-01-23") == []
+
+    def test_exceptions_and_days_off(self, schedule):
+        store = RecurringSchedule(schedule)
+
+        assert store.get_day("2024-01-03") is None
+        assert store.get_day("2024-01-06") is None
+        assert store.get_day("2034-01-02") is None
+        assert store.get_day("2024-01-05").end == "13:00"  # type: ignore[union-attr]
+
+    def test_range_is_lazy(self, schedule):
+        """Запрос по диапазону разворачивает только дни этого диапазона, а не весь горизонт."""
+        store = RecurringSchedule(schedule, cache_size=4)
+
+        days = store.get_days(date_from="2030-06-03", date_to="2030-06-09")
+
+        assert [day.date for day in days] == [f"2030-06-0{number}" for number in range(3, 8)]
+        assert store.cache_stats() == {"hits": 0, "misses": 7, "size": 4, "max_size": 4}
+
+    @pytest.mark.parametrize(
+        "changes, message",
+        [
+            ({"date_from": "2025-01-01", "date_to": "2024-01-01"}, "Начальная дата расписания не может быть больше"),
+            ({"hours": [{"weekday": 7, "start": "09:00", "end": "18:00"}]}, "Некорректный день недели 7"),
+            ({"blocks": [{"weekdays": [0], "start": "10:00", "end": "11:00", "every_weeks": 0}]}, "правило повторения"),
+            ({"date_to": "2024-02-30"}, "Некорректная дата 2024-02-30")
+        ]
+    )
+    def test_invalid_rules(self, changes, message):
+        with pytest.raises(ValueError, match=message):
+            RecurringSchedule(recurring_schedule_parser({**RULES, **changes}))
+
+
+class TestRecurringProcessor:
+    def test_queries(self, schedule):
+        """Процессор отвечает на запросы по правилам так же, как по явному расписанию."""
+        processor = ScheduleProcessor(schedule=schedule)
+
+        assert processor.get_busy_timeslots("2024-01-05") == [{"start": "13:00", "end": "14:00"}]
+        assert processor.get_free_timeslots("2024-01-05") == [{"start": "09:00", "end": "13:00"}]
+        assert processor.is_interval_available("2031-03-03", "10:00", "11:00") is False
+        assert processor.search_timeslots_for_duration("2024-01-01", 120) == [
+            {"start": "11:00", "end": "13:00"},
+            {"start": "14:00", "end": "18:00"}
+        ]
+
+    def test_range_queries(self, schedule):
+        processor = ScheduleProcessor(schedule=schedule)
+
+        assert processor.take(processor.iter_free_timeslots_range("2033-12-31", "2034-01-05")) == []
+        assert processor.take(processor.iter_busy_timeslots_range("2029-01-01", "2029-01-07"), limit=2) == [
+            {"date": "2029-01-01", "start": "13:00", "end": "14:00"},
+            {"date": "2029-01-03", "start": "13:00", "end": "14:00"}
+        ]
+        assert processor.take(processor.iter_timeslots_for_duration_range("2024-01-01", "2024-01-03", 300)) == [
+            {"date": "2024-01-02", "start": "09:00", "end": "18:00"}
+        ]
+        assert processor.find_earliest_timeslot_for_duration(300, date_from="2024-01-05") == {
+            "date": "2024-01-09", "start": "09:00", "end": "15:00"
+        }
+
+    def test_missing_date(self, schedule):
+        with pytest.raises(ValueError, match="Дата 2024-01-06 не найдена в расписании."):
+            ScheduleProcessor(schedule=schedule).get_free_timeslots("2024-01-06")
@@ -0,0 +1,167 @@
+import asyncio
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+from src.fetcher import ScheduleFetcher
+from src.parsers import employment_schedule_parser
+from src.server import ScheduleService, snapshot_loader
+from src.snapshot import save_snapshot
+
+SCHEDULE = {
+    "days": [{"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"}],
+    "timeslots": [
+        {"id": 1, "day_id": 1, "start": "10:00", "end": "12:00"},
+        {"id": 2, "day_id": 1, "start": "14:00", "end": "15:00"}
+    ]
+}
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    schedule = SCHEDULE
+
+    def do_GET(self):
+        payload = json.dumps(self.schedule).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="function")
+def upstream_url():
+    """Фикстура локальной заглушки эндпоинта с расписанием."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubUpstreamHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def make_loader(url: str):
+    fetcher = ScheduleFetcher(url=url, cache_dir=None)
+    return lambda: fetcher.fetch().result
+
+
+async def http_get(port: int, paths):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+
+    for path in paths:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = json.loads(await reader.readexactly(int(headers["content-length"])))
+        responses.append((status, body))
+
+    writer.close()
+    return responses
+
+
+async def query_service(service: ScheduleService, paths):
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host="127.0.0.1", port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    try:
+        return await http_get(port, paths)
+    finally:
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+
+
+class TestScheduleService:
+    def test_endpoints(self, upstream_url):
+        """Проверка всех четырёх эндпоинтов на одном keep-alive соединении."""
+        service = ScheduleService(loader=make_loader(upstream_url))
+
+        responses = asyncio.run(query_service(service, [
+            "/busy?date=2024-01-01",
+            "/free?date=2024-01-01",
+            "/interval?date=2024-01-01&start=12:00&end=13:00",
+            "/duration?date=2024-01-01&duration=150"
+        ]))
+
+        assert responses == [
+            (200, {"result": [{"start": "10:00", "end": "12:00"}, {"start": "14:00", "end": "15:00"}]}),
+            (200, {"result": [
+                {"start": "09:00", "end": "10:00"},
+                {"start": "12:00", "end": "14:00"},
+                {"start": "15:00", "end": "18:00"}
+            ]}),
+            (200, {"result": True}),
+            (200, {"result": [{"start": "15:00", "end": "18:00"}]})
+        ]
+
+    def test_errors(self, upstream_url):
+        """Проверка ответов на некорректные запросы."""
+        service = ScheduleService(loader=make_loader(upstream_url))
+
+        responses = asyncio.run(query_service(service, [
+            "/free?date=2024-02-01",
+            "/interval?date=2024-01-01",
+            "/unknown"
+        ]))
+
+        assert [status for status, _ in responses] == [400, 400, 404]
+        assert "не найдена в расписании" in responses[0][1]["error"]
+
+    def test_background_refresh(self, upstream_url, monkeypatch):
+        """Проверка фонового обновления расписания без остановки сервиса."""
+        service = ScheduleService(loader=make_loader(upstream_url), refresh_interval=0.01)
+
+        async def scenario():
+            await service.start()
+            monkeypatch.setattr(StubUpstreamHandler, "schedule", {**SCHEDULE, "timeslots": []})
+            await asyncio.sleep(0.3)
+            result = service.handle("GET", "/busy?date=2024-01-01")
+            await service.stop()
+            return result
+
+        assert asyncio.run(scenario()) == (200, {"result": []})
+
+    def test_refresh_closes_replaced_snapshots(self, tmp_path):
+        """Снимок, заменённый обновлением, закрывается, но не раньше завершения запроса, который его читает."""
+        snapshot_path = str(tmp_path / "schedule.snapshot")
+        save_snapshot(employment_schedule_parser(SCHEDULE), snapshot_path)
+        load = snapshot_loader(snapshot_path)
+        stores: list = []
+
+        def loader():
+            stores.append(load())
+            return stores[-1]
+
+        service = ScheduleService(loader=loader)
+
+        async def scenario():
+            await service.start()
+            for _ in range(20):
+                await service.refresh()
+            assert [store._file.closed for store in stores] == [True] * 20 + [False]
+
+            in_flight = service._acquire()
+            await service.refresh()
+            assert not stores[-2]._buffer.closed
+            service._release(in_flight)  # type: ignore[arg-type]
+            assert stores[-2]._buffer.closed
+
+            result = service.handle("GET", "/busy?date=2024-01-01")
+            await service.stop()
+            return result
+
+        assert asyncio.run(scenario())[0] == 200
+        assert len(stores) == 22
+        assert all(store._buffer.closed and store._file.closed for store in stores)
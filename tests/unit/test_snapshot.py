@@ -0,0 +1,98 @@
+import pytest
+
+from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot
+from src.processor import ScheduleProcessor
+from src.snapshot import load_snapshot, save_snapshot
+
+
+@pytest.fixture(scope="function")
+def mock_schedule() -> EmploymentScheduleDTO:
+    """Фикстура расписания с днями не по порядку дат."""
+    days = [
+        Day(id=7, date="2024-01-02", start="08:00", end="17:00"),
+        Day(id=3, date="2024-01-01", start="09:00", end="18:00"),
+        Day(id=9, date="2024-01-05", start="10:00", end="12:00")
+    ]
+    timeslots = [
+        Timeslot(id=1, day_id=3, start="14:00", end="15:00"),
+        Timeslot(id=2, day_id=7, start="09:00", end="11:00"),
+        Timeslot(id=3, day_id=3, start="10:00", end="12:00")
+    ]
+    return EmploymentScheduleDTO(days=days, timeslots=timeslots)
+
+
+class TestSnapshot:
+    def test_roundtrip(self, tmp_path, mock_schedule):
+        """Проверка, что снимок отвечает так же, как индекс в памяти."""
+        file_path = str(tmp_path / "schedule.snapshot")
+        index = ScheduleIndex(mock_schedule)
+        save_snapshot(mock_schedule, file_path)
+
+        with load_snapshot(file_path) as snapshot:
+            for date in ("2024-01-01", "2024-01-02", "2024-01-05", "2024-01-03", "2023-12-31", "2025-01-01"):
+                assert snapshot.get_day(date) == index.get_day(date)
+
+            assert snapshot.get_days() == index.get_days()
+            ranges = (("2024-01-02", "2024-01-05"), ("2024-01-03", "2024-01-04"), ("2023-01-01", "2024-01-01"))
+            for date_from, date_to in ranges:
+                assert snapshot.get_days(date_from, date_to) == index.get_days(date_from, date_to)
+            assert snapshot.get_day_by_id(9) == index.get_day_by_id(9)
+            assert snapshot.get_day_by_id(42) is None
+            for day_id in (3, 7, 9, 42):
+                assert snapshot.get_intervals(day_id) == index.get_intervals(day_id)
+            assert [row.id for row in snapshot.get_timeslots(3)] == [3, 1]
+
+    def test_processor_on_snapshot(self, tmp_path, mock_schedule):
+        """Проверка работы процессора напрямую поверх снимка."""
+        file_path = str(tmp_path / "schedule.snapshot")
+        save_snapshot(mock_schedule, file_path)
+
+        with load_snapshot(file_path) as snapshot:
+            processor = ScheduleProcessor(schedule=snapshot)
+            assert processor.get_free_timeslots("2024-01-01") == [
+                {"start": "09:00", "end": "10:00"},
+                {"start": "12:00", "end": "14:00"},
+                {"start": "15:00", "end": "18:00"}
+            ]
+
+    def test_lookup_by_id_reads_one_day(self, tmp_path, monkeypatch):
+        """Поиск слотов по id читает одну запись дня, а не всю таблицу дней."""
+        days = [
+            Day(id=1000 - number, date=f"{2000 + number}-01-01", start="09:00", end="18:00") for number in range(500)
+        ]
+        timeslots = [Timeslot(id=1, day_id=800, start="10:00", end="11:00")]
+        file_path = str(tmp_path / "schedule.snapshot")
+        save_snapshot(EmploymentScheduleDTO(days=days, timeslots=timeslots), file_path)
+
+        with load_snapshot(file_path) as snapshot:
+            read_day = snapshot._read_day
+            reads: list = []
+
+            def counting_read_day(position):
+                reads.append(position)
+                return read_day(position)
+
+            monkeypatch.setattr(snapshot, "_read_day", counting_read_day)
+
+            assert snapshot.get_intervals(800) == [(600, 660)]
+            assert snapshot.get_day_by_id(501).date == "2499-01-01"  # type: ignore[union-attr]
+            assert snapshot.get_intervals(1) == []
+            assert reads == [200, 499]
+
+    def test_truncated_file(self, tmp_path, mock_schedule):
+        file_path = tmp_path / "schedule.snapshot"
+        save_snapshot(mock_schedule, str(file_path))
+        file_path.write_bytes(file_path.read_bytes()[:-4])
+
+        with pytest.raises(ValueError, match="Некорректный снимок расписания"):
+            load_snapshot(str(file_path))
+
+    def test_invalid_file(self, tmp_path):
+        """Проверка ошибки для файла, не являющегося снимком."""
+        file_path = tmp_path / "broken.snapshot"
+        file_path.write_bytes(b"not a snapshot at all")
+
+        with pytest.raises(ValueError, match="Некорректный снимок расписания"):
+            load_snapshot(str(file_path))
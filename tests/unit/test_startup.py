@@ -0,0 +1,47 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Бюджет на импорт точки входа CLI; без сетевого стека он занимает около 60 мс, с requests — больше 200 мс
+IMPORT_TIME_BUDGET_MS = 150
+HEAVY_MODULES = ("requests", "urllib3", "asyncio", "concurrent.futures", "multiprocessing", "numpy")
+
+
+def measure_import(module: str) -> Dict[str, int]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    cumulative: Dict[str, int] = {}
+
+    # Строки вида "import time:   self [us] | cumulative | imported package"
+    for line in completed.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            cumulative[fields[2].strip()] = int(fields[1])
+
+    return cumulative
+
+
+@pytest.fixture(scope="module")
+def main_imports() -> Dict[str, int]:
+    """Фикстура замера импорта CLI: лучший из трёх прогонов, чтобы сгладить шум."""
+    runs = [measure_import("src.main") for _ in range(3)]
+    return min(runs, key=lambda imports: imports["src.main"])
+
+
+class TestStartup:
+    def test_heavy_modules_are_lazy(self, main_imports):
+        """Сетевой стек, asyncio и пул процессов не загружаются при старте CLI."""
+        assert [module for module in HEAVY_MODULES if module in main_imports] == []
+
+    def test_import_time_budget(self, main_imports):
+        assert main_imports["src.main"] / 1000 < IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,164 @@
+import json
+from typing import List
+
+import pytest
+
+from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot
+from src.processor import ScheduleProcessor
+from src.updates import apply_change, apply_change_stream, apply_diff
+
+
+@pytest.fixture(scope="function")
+def index() -> ScheduleIndex:
+    """Фикстура индекса расписания на два дня."""
+    days = [
+        Day(id=1, date="2024-01-01", start="09:00", end="18:00"),
+        Day(id=2, date="2024-01-02", start="08:00", end="17:00")
+    ]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+        Timeslot(id=2, day_id=1, start="14:00", end="15:00"),
+        Timeslot(id=3, day_id=2, start="09:00", end="11:00")
+    ]
+    return ScheduleIndex(EmploymentScheduleDTO(days=days, timeslots=timeslots))
+
+
+class TestApplyChange:
+    def test_timeslot_changes_touch_only_their_day(self, index):
+        """Изменение слота уведомляет подписчиков только о затронутых днях."""
+        changed: List[int] = []
+        index.add_listener(changed.append)
+
+        apply_change(index, {"op": "add", "entity": "timeslot", "record": {
+            "id": 4, "day_id": 2, "start": "12:00", "end": "13:00"
+        }})
+        apply_change(index, {"op": "modify", "entity": "timeslot", "record": {
+            "id": 1, "day_id": 1, "start": "10:30", "end": "11:00"
+        }})
+        apply_change(index, {"op": "remove", "entity": "timeslot", "record": {"id": 3}})
+
+        assert changed == [2, 1, 1, 2]
+        assert index.version == 4
+        assert index.get_intervals(1) == [(630, 660), (840, 900)]
+        assert index.get_intervals(2) == [(720, 780)]
+
+    def test_move_timeslot_between_days(self, index):
+        apply_change(index, {"op": "modify", "entity": "timeslot", "record": {
+            "id": 2, "day_id": 2, "start": "15:00", "end": "16:00"
+        }})
+        assert index.get_intervals(1) == [(600, 720)]
+        assert index.get_intervals(2) == [(540, 660), (900, 960)]
+
+    def test_day_changes(self, index):
+        apply_change(index, {"op": "add", "entity": "day", "record": {
+            "id": 3, "date": "2023-12-31", "start": "10:00", "end": "12:00"
+        }})
+        apply_change(index, {"op": "modify", "entity": "day", "record": {
+            "id": 1, "date": "2024-01-01", "start": "08:00", "end": "18:00"
+        }})
+        removed = index.remove_day(2)
+
+        assert removed.date == "2024-01-02"
+        assert [day.id for day in index.get_days()] == [3, 1]
+        assert index.get_day("2024-01-01").start_minutes == 480
+        assert index.get_intervals(2) == []
+
+    @pytest.mark.parametrize(
+        "event, error_msg",
+        [
+            ({"op": "add", "entity": "day", "record": {
+                "id": 9, "date": "2024-01-01", "start": "09:00", "end": "10:00"
+            }}, "Дата 2024-01-01 уже есть в расписании"),
+            ({"op": "remove", "entity": "day", "record": {"id": 9}}, "День 9 не найден"),
+            ({"op": "remove", "entity": "timeslot", "record": {"id": 99}}, "Слот 99 не найден"),
+            ({"op": "add", "entity": "timeslot", "record": {
+                "id": 1, "day_id": 2, "start": "12:00", "end": "13:00"
+            }}, "Слот 1 уже есть в расписании"),
+            ({"op": "add", "entity": "timeslot", "record": {
+                "id": 9, "day_id": 9, "start": "12:00", "end": "13:00"
+            }}, "День 9 не найден"),
+            ({"op": "modify", "entity": "timeslot", "record": {
+                "id": 1, "day_id": 9, "start": "12:00", "end": "13:00"
+            }}, "День 9 не найден"),
+            ({"op": "rename", "entity": "day", "record": {}}, "Неизвестная операция изменения"),
+            ({"op": "add", "entity": "week", "record": {}}, "Неизвестный тип изменяемой записи")
+        ]
+    )
+    def test_invalid_changes(self, index, event, error_msg):
+        with pytest.raises(ValueError, match=error_msg):
+            apply_change(index, event)
+
+
+class TestApplyDiff:
+    def test_diff_and_processor_consistency(self, index):
+        """Процессор видит изменения диффа без перестроения расписания."""
+        processor = ScheduleProcessor(schedule=index)
+        assert processor.get_free_timeslots("2024-01-02") == [
+            {"start": "08:00", "end": "09:00"}, {"start": "11:00", "end": "17:00"}
+        ]
+
+        applied = apply_diff(index, {
+            "days": {
+                "added": [{"id": 3, "date": "2024-01-03", "start": "09:00", "end": "12:00"}],
+                "removed": [{"id": 2}]
+            },
+            "timeslots": {
+                "added": [{"id": 5, "day_id": 3, "start": "09:00", "end": "10:00"}],
+                "removed": [{"id": 3, "day_id": 2}]
+            }
+        })
+
+        assert applied == 4
+        assert processor.get_free_timeslots("2024-01-03") == [{"start": "10:00", "end": "12:00"}]
+        assert processor.is_interval_available("2024-01-03", "09:30", "10:30") is False
+        assert processor.find_earliest_timeslot_for_duration(150) == {
+            "date": "2024-01-01", "start": "15:00", "end": "18:00"
+        }
+        with pytest.raises(ValueError, match="Дата 2024-01-02 не найдена"):
+            processor.get_free_timeslots("2024-01-02")
+
+    def test_failed_diff_is_rolled_back(self, index):
+        """Ошибка в середине диффа откатывает уже применённые изменения: индекс остаётся прежним."""
+        processor = ScheduleProcessor(schedule=index)
+        free_before = [processor.get_free_timeslots(date) for date in ("2024-01-01", "2024-01-02")]
+
+        with pytest.raises(ValueError, match="Слот 2 уже есть в расписании"):
+            apply_diff(index, {
+                "days": {
+                    "added": [{"id": 3, "date": "2024-01-03", "start": "09:00", "end": "12:00"}],
+                    "modified": [{"id": 1, "date": "2024-01-05", "start": "08:00", "end": "20:00"}],
+                    "removed": [{"id": 2}]
+                },
+                "timeslots": {
+                    "added": [
+                        {"id": 5, "day_id": 3, "start": "09:00", "end": "10:00"},
+                        {"id": 2, "day_id": 3, "start": "11:00", "end": "12:00"}
+                    ],
+                    "modified": [{"id": 1, "day_id": 2, "start": "12:00", "end": "13:00"}],
+                    "removed": [{"id": 3, "day_id": 2}]
+                }
+            })
+
+        assert [(day.id, day.date, day.start) for day in index.get_days()] == [
+            (1, "2024-01-01", "09:00"), (2, "2024-01-02", "08:00")
+        ]
+        assert index.get_intervals(1) == [(600, 720), (840, 900)]
+        assert index.get_intervals(2) == [(540, 660)]
+        assert index.get_intervals(3) == []
+        assert [index.find_timeslot_day(slot_id) for slot_id in (1, 2, 3)] == [1, 1, 2]
+        with pytest.raises(ValueError, match="Слот 5 не найден"):
+            index.find_timeslot_day(5)
+        assert [processor.get_free_timeslots(date) for date in ("2024-01-01", "2024-01-02")] == free_before
+
+    def test_change_stream(self, index):
+        lines = [
+            json.dumps({"op": "add", "entity": "timeslot", "record": {
+                "id": 6, "day_id": 1, "start": "16:00", "end": "17:00"
+            }}) + "\n",
+            "\n",
+            json.dumps({"op": "remove", "entity": "timeslot", "record": {"id": 2, "day_id": 1}}) + "\n"
+        ]
+        assert apply_change_stream(index, lines) == 2
+        assert index.get_intervals(1) == [(600, 720), (960, 1020)]
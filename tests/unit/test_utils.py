@@ -1,7 +1,8 @@
+from io import BytesIO
 from unittest.mock import patch, MagicMock
 from requests.exceptions import RequestException
 
-from src.utils import get_employment_schedule
+from src.utils import get_employment_schedule, stream_employment_schedule
 
 
 class TestAPIs:
@@ -49,3 +50,32 @@ class TestAPIs:
 
         assert result.result is None
         assert "JSON decode error" in result.error  # type: ignore[operator]
+
+    @patch('src.utils.requests_get')
+    def test_stream_employment_schedule_success(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.raw = BytesIO(
+            b'{"days": [{"id": 1, "date": "2024-01-01", "start": "09:00", "end": "18:00"}], '
+            b'"timeslots": [{"id": 1, "day_id": 1, "start": "10:00", "end": "12:00"}]}'
+        )
+        mock_get.return_value.__enter__.return_value = mock_response
+
+        result = stream_employment_schedule("http://test.url")
+
+        assert result.error is None
+        assert result.result.days[0].date == "2024-01-01"  # type: ignore[union-attr,index]
+        assert result.result.timeslots[0].end_minutes == 720  # type: ignore[union-attr,index]
+        mock_get.assert_called_once_with(url="http://test.url", stream=True)
+
+    @patch('src.utils.requests_get')
+    def test_stream_employment_schedule_failure(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.ok = False
+        mock_response.status_code = 500
+        mock_get.return_value.__enter__.return_value = mock_response
+
+        result = stream_employment_schedule("http://test.url")
+
+        assert result.result is None
+        assert "код ответа -> 500" in result.error  # type: ignore[operator]
@@ -100,3 +100,23 @@ class TestArgsValidator:
     def test_validate_duration_invalid(self, invalid_duration: str):
         with pytest.raises(ValueError, match="Некорректный формат продолжительности"):
             ArgsValidator.validate_available_timeslots_duration(invalid_duration)
+
+    @pytest.mark.parametrize(
+        "limit, expected_result",
+        [
+            ("1", 1),
+            ("30", 30)
+        ]
+    )
+    def test_validate_limit_valid(self, limit: str, expected_result: int):
+        assert ArgsValidator.validate_limit(limit) == expected_result
+
+    @pytest.mark.parametrize(
+        "invalid_limit",
+        [
+            "0", "-1", "01", "abc", ""
+        ]
+    )
+    def test_validate_limit_invalid(self, invalid_limit: str):
+        with pytest.raises(ValueError, match="Некорректное ограничение"):
+            ArgsValidator.validate_limit(invalid_limit)
@@ -0,0 +1,98 @@
+from random import Random
+from typing import List
+
+import pytest
+
+from src.common.converters import minutes_to_time
+from src.dto import EmploymentScheduleDTO
+from src.index import ScheduleIndex
+from src.models import Day, Timeslot
+from src.vectorized import HAS_NUMPY, ScheduleArrays
+
+
+@pytest.fixture(scope="function")
+def random_index() -> ScheduleIndex:
+    """Фикстура случайного расписания с пересекающимися слотами и слотами за границами дня."""
+    random: Random = Random(15)
+    days: List[Day] = []
+    timeslots: List[Timeslot] = []
+
+    for day_id in range(1, 61):
+        start = random.randrange(360, 720)
+        end = random.randrange(start, 1380)
+        days.append(Day(id=day_id, date=f"2024-{day_id // 28 + 1:02d}-{day_id % 28 + 1:02d}",
+                        start=minutes_to_time(start), end=minutes_to_time(end)))
+
+        for _ in range(random.randrange(0, 8)):
+            slot_start = random.randrange(300, 1400)
+            slot_end = min(slot_start + random.randrange(1, 180), 1439)
+            timeslots.append(Timeslot(id=len(timeslots) + 1, day_id=day_id,
+                                      start=minutes_to_time(slot_start), end=minutes_to_time(slot_end)))
+
+    return ScheduleIndex(EmploymentScheduleDTO(days=days, timeslots=timeslots))
+
+
+@pytest.fixture(scope="function")
+def small_index() -> ScheduleIndex:
+    """Фикстура расписания на два дня."""
+    days = [
+        Day(id=1, date="2024-01-01", start="09:00", end="18:00"),
+        Day(id=2, date="2024-01-02", start="08:00", end="17:00")
+    ]
+    timeslots = [
+        Timeslot(id=1, day_id=1, start="10:00", end="12:00"),
+        Timeslot(id=2, day_id=1, start="11:00", end="15:00"),
+        Timeslot(id=3, day_id=2, start="16:00", end="19:00")
+    ]
+    return ScheduleIndex(EmploymentScheduleDTO(days=days, timeslots=timeslots))
+
+
+class TestScheduleArrays:
+    def test_python_backend(self, small_index):
+        """Чистый Python считает слияние, свободное время и загрузку по всем дням."""
+        arrays = ScheduleArrays(small_index, use_numpy=False)
+
+        assert len(arrays) == 2
+        assert arrays.merged_busy_intervals() == {1: [(600, 900)], 2: [(960, 1140)]}
+        assert arrays.free_intervals() == {1: [(540, 600), (900, 1080)], 2: [(480, 960)]}
+        assert arrays.intervals_for_duration(120) == {1: [(900, 1080)], 2: [(480, 960)]}
+        assert arrays.utilization() == {1: 300 / 540, 2: 60 / 540}
+
+    def test_date_range(self, small_index):
+        arrays = ScheduleArrays(small_index, date_from="2024-01-02", use_numpy=False)
+
+        assert arrays.free_intervals() == {2: [(480, 960)]}
+
+    @pytest.mark.skipif(HAS_NUMPY, reason="numpy установлен")
+    def test_numpy_required(self, small_index):
+        with pytest.raises(ValueError, match="необходимо установить numpy"):
+            ScheduleArrays(small_index, use_numpy=True)
+
+
+class TestScheduleArraysNumpy:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        """Векторные тесты запускаются только при установленном numpy."""
+        pytest.importorskip("numpy")
+
+    def test_parity_with_python(self, random_index):
+        """Векторный и чистый Python расчёты дают одинаковые результаты."""
+        vectorized = ScheduleArrays(random_index, use_numpy=True)
+        python = ScheduleArrays(random_index, use_numpy=False)
+
+        assert vectorized.merged_busy_intervals() == python.merged_busy_intervals()
+        assert vectorized.free_intervals() == python.free_intervals()
+        assert vectorized.intervals_for_duration(45) == python.intervals_for_duration(45)
+        assert vectorized.utilization() == pytest.approx(python.utilization())
+
+    def test_free_intervals_match_processor_path(self, small_index):
+        arrays = ScheduleArrays(small_index, use_numpy=True)
+
+        assert arrays.free_intervals() == {1: [(540, 600), (900, 1080)], 2: [(480, 960)]}
+        assert arrays.utilization() == pytest.approx({1: 300 / 540, 2: 60 / 540})
+
+    def test_empty_schedule(self):
+        arrays = ScheduleArrays(ScheduleIndex(EmploymentScheduleDTO(days=[], timeslots=[])), use_numpy=True)
+
+        assert arrays.free_intervals() == {}
+        assert arrays.utilization() == {}